@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark reprodutível do pipeline de processamento GTD.
+
+Gera arquivos GTD sintéticos em vários tamanhos, mede parsing, merge, exportação
+Excel/JSON e a montagem do DataFrame de visualização, e salva os resultados em JSON
+para comparação entre versões.
+
+Uso:
+    python benchmarks/bench_pipeline.py --rows 1000 10000 100000 --channels 32
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.gtd_processor import GTDProcessor
+from models.gtd_generator import generate_gtd_directory
+
+# Limite de linhas de uma planilha Excel (descontando o cabeçalho)
+EXCEL_MAX_ROWS = 1048575
+
+
+def git_revision():
+    """Retorna o commit atual do repositório, ou None se não estiver disponível"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(work_dir, rows, channels, files, skip_excel):
+    """
+    Executa um caso do benchmark: gera os arquivos, processa e exporta.
+
+    Returns:
+        Lista de dicionários com os resultados de cada estágio
+    """
+    case_dir = os.path.join(work_dir, f"{rows}x{channels}")
+    rows_per_file = max(1, rows // files)
+    filepaths = generate_gtd_directory(case_dir, n_files=files, n_rows=rows_per_file,
+                                       n_channels=channels, tags=True, gaps=2,
+                                       over_range_rate=0.0001, seed=42)
+    input_bytes = sum(os.path.getsize(path) for path in filepaths)
+
+    processor = GTDProcessor()
+    # Silencia as mensagens de progresso do processador durante as medições
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        processor.process_multiple_files(filepaths)
+        parse_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        df = processor.to_dataframe()
+        dataframe_time = time.perf_counter() - start
+
+        if not skip_excel and len(df) <= EXCEL_MAX_ROWS:
+            processor.export_to_excel(os.path.join(case_dir, "bench.xlsx"))
+        processor.export_to_json(os.path.join(case_dir, "bench.json"))
+
+    total_rows = rows_per_file * files
+    results = [{
+        "stage": "parse_total",
+        "wall_time_s": parse_time,
+        "rows": total_rows,
+        "bytes": input_bytes,
+        "rows_per_s": total_rows / parse_time if parse_time > 0 else None,
+        "bytes_per_s": input_bytes / parse_time if parse_time > 0 else None,
+    }, {
+        "stage": "to_dataframe",
+        "wall_time_s": dataframe_time,
+        "rows": len(df),
+        "bytes": None,
+        "rows_per_s": len(df) / dataframe_time if dataframe_time > 0 else None,
+        "bytes_per_s": None,
+    }]
+    for stage, entry in processor.metrics.summary().items():
+        results.append({"stage": stage, **{key: entry[key] for key in
+                        ("wall_time_s", "rows", "bytes", "rows_per_s", "bytes_per_s")}})
+
+    for result in results:
+        result.update({"rows_requested": rows, "channels": channels, "files": files})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de processamento GTD")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="Quantidades totais de linhas de dados a testar")
+    parser.add_argument("--channels", type=int, default=32, help="Quantidade de canais")
+    parser.add_argument("--files", type=int, default=2, help="Arquivos por caso (testa o merge)")
+    parser.add_argument("--skip-excel", action="store_true", help="Não mede a exportação Excel")
+    parser.add_argument("--output", default=None,
+                        help="Arquivo JSON de resultados (padrão: benchmarks/results/pipeline_<data>.json)")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.join(
+        project_root, "benchmarks", "results",
+        f"pipeline_{datetime.now().strftime('%Y%m%d_%Hh%Mm%Ss')}.json")
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for rows in args.rows:
+            print(f"=== {rows} linhas x {args.channels} canais ===")
+            case_results = run_case(work_dir, rows, args.channels, args.files, args.skip_excel)
+            for result in case_results:
+                rate = f"{result['rows_per_s']:.0f} linhas/s" if result["rows_per_s"] else "-"
+                print(f"  {result['stage']:<14} {result['wall_time_s'] * 1000:10.1f} ms  {rate}")
+            results += case_results
+
+    report = {
+        "benchmark": "pipeline",
+        "created": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+    print(f"Resultados salvos em: {output}")
+
+
+if __name__ == "__main__":
+    main()
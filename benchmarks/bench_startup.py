@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização a frio dos workers de processamento GTD.
+
+Cada medição roda em um processo Python novo, como um worker de um pool de processos
+ou uma execução da CLI, e registra o tempo de importação e quais dependências pesadas
+foram carregadas.
+
+Uso:
+    python benchmarks/bench_startup.py --repeat 10
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+# Dependências cuja importação deve ser evitada no caminho de inicialização. Os cenários de
+# importação não devem carregar nenhuma; os de parsing carregam numpy (sentinelas de
+# over-range, estatísticas por canal), mas não pandas
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl", "streamlit", "plotly", "matplotlib", "seaborn", "PIL"]
+
+# Cenários medidos: nome -> código executado no processo novo
+SCENARIOS = {
+    "python": "pass",
+    "import models": "import models",
+    "import gtd_processor": "from models.gtd_processor import GTDProcessor",
+    "parse (reference)": ("from models.gtd_processor import GTDProcessor\n"
+                          "GTDProcessor().process_file({sample!r})"),
+    "parse (fast)": ("from models.gtd_processor import GTDProcessor\n"
+                     "GTDProcessor(engine='fast').process_file({sample!r})"),
+}
+
+# Código que mede o cenário e informa o resultado ao processo pai em JSON
+PROBE = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed_s": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(code):
+    """Executa o código em um interpretador novo e retorna (tempo total, tempo interno, módulos pesados)"""
+    body = "\n".join("    " + line for line in code.splitlines())
+    probe = PROBE.format(body=body, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", probe], cwd=project_root,
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return wall, data["elapsed_s"], data["loaded"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização a frio do núcleo GTD")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções por cenário")
+    parser.add_argument("--sample", default=os.path.join("temp_data", "002844_250207_110200.GTD"),
+                        help="Arquivo GTD usado nos cenários de parsing")
+    parser.add_argument("--output", default=None,
+                        help="Arquivo JSON de resultados (padrão: benchmarks/results/startup_<data>.json)")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.join(
+        project_root, "benchmarks", "results",
+        f"startup_{datetime.now().strftime('%Y%m%d_%Hh%Mm%Ss')}.json")
+
+    results = []
+    for name, template in SCENARIOS.items():
+        code = template.format(sample=args.sample)
+        walls, internals, loaded = [], [], []
+        for _ in range(args.repeat):
+            wall, internal, loaded = measure(code)
+            walls.append(wall)
+            internals.append(internal)
+        result = {
+            "scenario": name,
+            "process_wall_s_median": statistics.median(walls),
+            "import_and_run_s_median": statistics.median(internals),
+            "process_wall_s_min": min(walls),
+            "heavy_modules_loaded": loaded,
+        }
+        results.append(result)
+        print(f"{name:<22} processo {result['process_wall_s_median'] * 1000:8.1f} ms  "
+              f"código {result['import_and_run_s_median'] * 1000:8.1f} ms  "
+              f"carregados: {', '.join(loaded) or '-'}")
+
+    report = {
+        "benchmark": "startup",
+        "created": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+    print(f"Resultados salvos em: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Script de teste das regras de alarme: compara a avaliação vetorizada com uma avaliação
+amostra a amostra e a avaliação incremental (em blocos) com a avaliação completa
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from models.Channel import Channel
+from models.alarms import AlarmEngine, AlarmRule, evaluate_alarms
+from models.gtd_processor import GTDProcessor
+
+N_SAMPLES, N_CHANNELS = 3000, 6
+TIMES = [datetime(2025, 1, 1) + timedelta(seconds=10 * i) for i in range(N_SAMPLES)]
+RNG = np.random.default_rng(3)
+DATA = 115 + np.cumsum(RNG.normal(0, 0.5, (N_SAMPLES, N_CHANNELS)), axis=0) * 0.3
+DATA[RNG.random((N_SAMPLES, N_CHANNELS)) < 0.002] = np.nan
+
+RULES = [
+    AlarmRule("Mancal > 116", "*mancal*", 116, hysteresis=2, min_duration="5 min"),
+    AlarmRule("Baixa", [4, 5], 113, direction="below", hysteresis=1),
+    AlarmRule("Média", 5, 115, series="mid"),
+]
+
+
+def _fill(processor, start, end):
+    """Anexa as amostras [start, end) aos canais (os 4 primeiros com tag de mancal)"""
+    for col in range(N_CHANNELS):
+        channel_id = f"{col}_mancal_D{col}" if col < 4 else col
+        channel = processor.channels.setdefault(channel_id, Channel(channel_id, "°C"))
+        channel.extend_samples(TIMES[start:end], (DATA[start:end, col] - 0.3).tolist(),
+                               DATA[start:end, col].tolist())
+    return processor
+
+
+def _reference(processor, rule):
+    """Eventos da regra avaliando uma amostra por vez"""
+    events = []
+    for channel_id, channel in processor.channels.items():
+        if not rule.matches(channel_id):
+            continue
+        values = rule.values(np.array(channel.samples_min), np.array(channel.samples_max))
+        timestamps = channel.timestamps
+        active, start, peak = False, None, np.nan
+        for i, value in enumerate(values):
+            if rule.direction == "above":
+                trigger, release = value > rule.limit, value <= rule.limit - rule.hysteresis
+            else:
+                trigger, release = value < rule.limit, value >= rule.limit + rule.hysteresis
+            now = True if trigger else (False if release else active)
+            if now and not active:
+                start, peak = i, np.nan
+            if now and not np.isnan(value):
+                peak = value if np.isnan(peak) else (max(peak, value) if rule.direction == "above" else min(peak, value))
+            last = i == len(values) - 1
+            if (active and not now) or (now and last):
+                end = i if now else i - 1
+                duration = (timestamps[end] - timestamps[start]).total_seconds()
+                if rule.min_duration is None or duration >= rule.min_duration / np.timedelta64(1, 's'):
+                    events.append((rule.name, channel_id, timestamps[start], timestamps[end], peak,
+                                   end - start + 1, bool(now and last)))
+            active = now
+    return events
+
+
+def _rows(table):
+    """Eventos da tabela como tuplas comparáveis com _reference"""
+    return sorted(((row['Regra'], row['Canal'], row['Início'], row['Fim'], row['Pico'], row['Amostras'], row['Ativo'])
+                   for row in table.to_dict('records')), key=lambda event: (event[0], str(event[1]), event[2]))
+
+
+def test_matches_reference():
+    """A avaliação vetorizada encontra os mesmos eventos que a avaliação amostra a amostra"""
+    processor = _fill(GTDProcessor(), 0, N_SAMPLES)
+    got = _rows(evaluate_alarms(processor, RULES))
+    expected = sorted(sum((_reference(processor, rule) for rule in RULES), []),
+                      key=lambda event: (event[0], str(event[1]), event[2]))
+    assert len(got) == len(expected) and len(got) > 0, (len(got), len(expected))
+    for event, reference in zip(got, expected):
+        assert event[:4] == reference[:4] and event[5:] == reference[5:], (event, reference)
+        assert np.isclose(event[4], reference[4], equal_nan=True), (event, reference)
+    print(f"✓ {len(got)} eventos iguais à avaliação amostra a amostra")
+
+
+def test_incremental_matches_full():
+    """Avaliar os dados em blocos (arquivos anexados aos poucos) gera os mesmos eventos"""
+    full = _rows(evaluate_alarms(_fill(GTDProcessor(), 0, N_SAMPLES), RULES))
+    for cuts in ([0, 1, 2, N_SAMPLES], [0, 137, 138, 1500, 1501, 2200, N_SAMPLES]):
+        processor, engine = GTDProcessor(), AlarmEngine(RULES)
+        for start, end in zip(cuts[:-1], cuts[1:]):
+            engine.update(_fill(processor, start, end))
+        assert _rows(engine.events()) == full, cuts
+    print(f"✓ Avaliação incremental igual à completa ({len(full)} eventos)")
+
+
+def test_redefined_math_channel():
+    """Redefinir um canal derivado reavalia o canal sem repetir os eventos anteriores"""
+    processor = _fill(GTDProcessor(), 0, N_SAMPLES)
+    engine = AlarmEngine([AlarmRule("Diferença", "d", 0.5)])
+    processor.add_math_channel("d", "Ch4 - Ch5")
+    engine.update(processor)
+    engine.update(processor)
+    first = _rows(engine.events())
+    processor.remove_math_channel("d")
+    processor.add_math_channel("d", "Ch5 - Ch4")
+    engine.update(processor)
+    expected = _rows(evaluate_alarms(processor, engine.rules))
+    assert first != expected
+    assert _rows(engine.events()) == expected
+    print(f"✓ Canal derivado redefinido reavaliado ({len(first)} -> {len(expected)} eventos)")
+
+
+if __name__ == "__main__":
+    test_matches_reference()
+    test_incremental_matches_full()
+    test_redefined_math_channel()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Script de teste do formato de arquivamento: as transformações delta/XOR e os chunks
+comprimidos devem voltar exatamente aos timestamps e valores originais
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from models.archive import CODECS, _decode_chunk, _delta_decode, _delta_encode, _encode_chunk
+from models.conformance import compare_processors
+from models.gtd_generator import write_gtd_file
+from models.gtd_processor import GTDProcessor
+
+
+def _series():
+    """Séries de cada tipo gravado, com extremos (estouro nas diferenças), NaN e -0.0"""
+    rng = np.random.default_rng(2)
+    floats = np.round(rng.normal(25, 5, 500), 1)
+    floats[::13] = np.nan
+    floats[::29] = -0.0
+    return {
+        "int16": np.array([0, 32767, -32768, 32767, -1, 5], dtype=np.int16),
+        "int32": rng.integers(-2 ** 31, 2 ** 31, 500).astype(np.int32),
+        "float32": floats.astype(np.float32),
+        "float64": np.concatenate([floats, [np.inf, -np.inf, 1e-300, 5e-324]]),
+        "vazia": np.empty(0, dtype=np.float64),
+    }
+
+
+def test_delta_round_trip():
+    """_delta_decode inverte _delta_encode bit a bit em todos os tipos"""
+    for name, values in _series().items():
+        decoded = _delta_decode(_delta_encode(values), values.dtype)
+        assert decoded.dtype == values.dtype, name
+        assert decoded.tobytes() == values.tobytes(), name
+        print(f"✓ {name}: {len(values)} valores reconstruídos bit a bit")
+
+
+def test_chunk_round_trip():
+    """Chunks com amostragem irregular voltam aos mesmos timestamps e valores em cada codec"""
+    rng = np.random.default_rng(3)
+    ticks = np.cumsum(rng.choice([10_000_000, 10_000_000, 20_000_000, 0, 7], size=400)).astype(np.int64)
+    ticks += np.int64(1_738_926_120_000_000)
+    mins = np.round(rng.normal(25, 5, 400), 1)
+    mins[::11] = np.nan
+    maxs = mins + 0.3
+    for codec in CODECS:
+        for encoding in ("fixed", "float32", "float64"):
+            payload, min_params, max_params = _encode_chunk(ticks, mins, maxs, encoding, codec, None)
+            times, got_mins, got_maxs = _decode_chunk(payload, {"count": len(ticks), "min": min_params,
+                                                                "max": max_params}, codec)
+            assert np.array_equal(times.astype(np.int64), ticks), (codec, encoding)
+            assert np.array_equal(got_mins, mins, equal_nan=True), (codec, encoding)
+            assert np.array_equal(got_maxs, maxs, equal_nan=True), (codec, encoding)
+        print(f"✓ {codec}: chunks reconstruídos nos três modos de codificação")
+
+
+def test_archive_round_trip():
+    """Exportar e importar um arquivo .gtda preserva todos os canais"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = write_gtd_file(str(Path(temp_dir) / "ensaio.GTD"), n_channels=4, n_rows=3000,
+                                  gaps=3, duplicate_rows=2, over_range_rate=0.01)
+        processor = GTDProcessor()
+        processor.process_file(filepath)
+        archive = str(Path(temp_dir) / "ensaio.gtda")
+        processor.export_to_archive(archive, chunk="1 h")
+        differences = compare_processors(processor, GTDProcessor.import_from_archive(archive))
+    assert not differences, differences[:5]
+    print("✓ Arquivo .gtda reconstruído sem divergências")
+
+
+if __name__ == "__main__":
+    test_delta_round_trip()
+    test_chunk_round_trip()
+    test_archive_round_trip()
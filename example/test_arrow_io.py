@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Script de teste de ida e volta das exportações Parquet/Feather, inclusive com timestamps repetidos
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from models.arrow_io import ARROW_AVAILABLE
+from models.Channel import Channel
+from models.gtd_processor import GTDProcessor
+
+TEST_FILE = project_root / "temp_data" / "002843_250207_070200.GTD"
+
+def _time_sorted(channel):
+    """Amostras do canal em ordem de tempo (estável), como gravadas na tabela"""
+    timestamps = np.array(channel.timestamps, dtype='datetime64[us]')
+    order = np.argsort(timestamps, kind='stable')
+    return (timestamps[order].tolist(), np.array(channel.samples_min)[order].tolist(),
+            np.array(channel.samples_max)[order].tolist())
+
+def _assert_round_trip(processor, temp_dir):
+    """Exporta em Parquet e Feather, importa de volta e compara as amostras de cada canal"""
+    for extension, export, load in ((".parquet", processor.export_to_parquet, GTDProcessor.import_from_parquet),
+                                    (".feather", processor.export_to_feather, GTDProcessor.import_from_feather)):
+        path = str(Path(temp_dir) / f"dados{extension}")
+        export(path)
+        loaded = load(path)
+        assert list(loaded.channels) == list(processor.channels), extension
+        for channel_id, channel in processor.channels.items():
+            expected, actual = _time_sorted(channel), _time_sorted(loaded.channels[channel_id])
+            assert len(actual[0]) == len(expected[0]), f"{extension} canal {channel_id}: {len(actual[0])} != {len(expected[0])}"
+            np.testing.assert_array_equal(np.array(actual[0]), np.array(expected[0]))
+            np.testing.assert_array_equal(np.array(actual[1]), np.array(expected[1]))
+            np.testing.assert_array_equal(np.array(actual[2]), np.array(expected[2]))
+
+def test_round_trip_with_duplicates():
+    """O mesmo arquivo lido duas vezes: cada timestamp aparece duas vezes em todos os canais"""
+    if not ARROW_AVAILABLE:
+        print("pyarrow não instalado, teste ignorado")
+        return
+    processor = GTDProcessor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.process_file(str(TEST_FILE))
+        processor.process_file(str(TEST_FILE))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _assert_round_trip(processor, temp_dir)
+
+def test_round_trip_mixed_timelines():
+    """Canais com linhas do tempo diferentes e repetições em quantidades diferentes"""
+    if not ARROW_AVAILABLE:
+        print("pyarrow não instalado, teste ignorado")
+        return
+    start = datetime(2025, 2, 7, 23, 58)
+    times = [start + timedelta(minutes=minute) for minute in (0, 1, 1, 2, 3, 3, 3, 5)]
+    processor = GTDProcessor()
+    first = Channel(1, "°C")
+    first.extend_samples(times, [1.0, 2.0, 3.0, 4.0, float("nan"), 6.0, 7.0, 8.0], [1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5])
+    second = Channel(2, "°C")
+    second.extend_samples([times[2], times[4], times[1], times[7]], [10.0, 20.0, 30.0, 40.0], [11.0, 21.0, 31.0, 41.0])
+    processor.channels = {1: first, 2: second}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _assert_round_trip(processor, temp_dir)
+
+if __name__ == "__main__":
+    test_round_trip_with_duplicates()
+    test_round_trip_mixed_timelines()
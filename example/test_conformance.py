@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Script de teste de conformidade entre a engine de referência e as engines otimizadas
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from models.conformance import build_corpus, check_conformance
+
+def test_conformance():
+    """Compara canais, timestamps e valores de todas as engines sobre o corpus de casos-limite"""
+
+    print("=== Teste de Conformidade das Engines ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus = build_corpus(temp_dir)
+        print(f"Corpus: {len(corpus)} arquivos")
+        for filepath in corpus:
+            print(f"  - {Path(filepath).name}")
+        print()
+
+        report = check_conformance(corpus)
+
+    print(report)
+    assert report.ok, str(report)
+
+if __name__ == "__main__":
+    test_conformance()
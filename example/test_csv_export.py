@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Script de teste do formatador vetorizado de CSV: as linhas geradas por format_chunk
+devem ser idênticas às de DataFrame.to_csv (usado antes pela exportação)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from models.csv_export import TIMESTAMP_FORMAT, format_chunk
+
+
+def _values() -> np.ndarray:
+    """Colunas com casas decimais diferentes, NaN, -0.0, negativos e valores sem casas fixas"""
+    rng = np.random.default_rng(7)
+    rows = 500
+    columns = [
+        np.round(rng.normal(25, 5, rows), 1),  # Uma casa (temperatura)
+        np.round(rng.normal(0, 100, rows), 3),  # Três casas, com negativos
+        np.round(rng.normal(0, 1e6, rows)),  # Inteiros grandes
+        rng.normal(0, 1, rows),  # Sem casas fixas (repr completo)
+        rng.normal(0, 1, rows) * 10.0 ** rng.integers(-12, 18, rows),  # Notação científica
+    ]
+    values = np.column_stack(columns)
+    values[rng.random(values.shape) < 0.05] = np.nan
+    values[::37, 0] = -0.0
+    values[::41, 1] = 0.0
+    values[3, :] = np.nan
+    return values
+
+
+def _expected(times: np.ndarray, values: np.ndarray, delimiter: str, decimal: str) -> bytes:
+    """As mesmas linhas geradas pelo pandas"""
+    df = pd.DataFrame(values)
+    df.insert(0, "Timestamp", pd.DatetimeIndex(times))
+    text = df.to_csv(index=False, header=False, sep=delimiter, decimal=decimal,
+                     date_format=TIMESTAMP_FORMAT, lineterminator="\n")
+    return text.encode("utf-8")
+
+
+def test_format_chunk_matches_pandas():
+    """format_chunk gera os mesmos bytes que DataFrame.to_csv nos dois estilos de separador"""
+    values = _values()
+    times = np.datetime64("2025-02-07T11:02:00") + np.arange(len(values)) * np.timedelta64(10, "s")
+    for delimiter, decimal in ((",", "."), (";", ",")):
+        got = format_chunk(times, values, delimiter=delimiter, decimal=decimal)
+        expected = _expected(times, values, delimiter, decimal)
+        got_lines, expected_lines = got.split(b"\n"), expected.split(b"\n")
+        for row, (line, reference) in enumerate(zip(got_lines, expected_lines)):
+            assert line == reference, f"linha {row} ({delimiter!r}/{decimal!r}): {line!r} != {reference!r}"
+        assert got == expected, (len(got_lines), len(expected_lines))
+        print(f"✓ {len(values)} linhas iguais ao pandas (separador {delimiter!r}, decimal {decimal!r})")
+
+
+if __name__ == "__main__":
+    test_format_chunk_matches_pandas()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Script de teste da codificação compacta de valores: encode_values/decode_values devem
+voltar exatamente aos valores originais em todos os modos
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from models.encoding import ENCODINGS, decode_values, encode_values
+
+
+def _cases():
+    """Séries de valores com escalas, faixas e casos-limite diferentes"""
+    rng = np.random.default_rng(1)
+    temperatures = np.round(rng.normal(25, 5, 1000), 1)
+    temperatures[::17] = np.nan
+    return {
+        "uma casa": temperatures,
+        "três casas": np.round(rng.normal(0, 10, 1000), 3),
+        "inteiros int32": np.round(rng.normal(0, 1e6, 1000)),
+        "seis casas": np.round(rng.normal(0, 1, 1000), 6),
+        "sem escala": rng.normal(0, 1, 1000),
+        "sentinelas": np.array([999999999.0, -999999999.0, 0.1, np.nan]),
+        "zeros com sinal": np.array([0.0, -0.0, 1.5, -0.0]),
+        "só NaN": np.full(5, np.nan),
+        "vazia": np.empty(0),
+    }
+
+
+def test_round_trip():
+    """Todos os modos decodificam exatamente os valores codificados (inclusive NaN)"""
+    for name, values in _cases().items():
+        for mode in ENCODINGS:
+            encoded = encode_values(values, mode)
+            decoded = decode_values(encoded.data, encoded.params())
+            assert decoded.dtype == np.float64, (name, mode)
+            assert np.array_equal(decoded, values, equal_nan=True), (name, mode, encoded.dtype)
+            assert np.array_equal(np.signbit(decoded), np.signbit(values)), (name, mode, encoded.dtype)
+        print(f"✓ {name}: fixed={encode_values(values).dtype}, float32={encode_values(values, 'float32').dtype}")
+
+
+def test_compact_types():
+    """Leituras com poucas casas decimais usam inteiros escalados do menor tipo"""
+    assert encode_values(_cases()["uma casa"]).dtype == "int16"
+    assert encode_values(_cases()["inteiros int32"]).dtype == "int32"
+    assert encode_values(_cases()["sem escala"]).dtype == "float64"
+    print("✓ Tipos compactos escolhidos conforme a escala")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_compact_types()
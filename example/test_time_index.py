@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Script de teste do índice de tempo implícito: expansão, posições e janelas do TimeIndex
+comparadas com o array de timestamps e np.searchsorted
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona o diretório do projeto ao path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from models.time_index import TimeIndex
+
+START = np.datetime64("2025-02-07T11:02:00", "us")
+SECOND = np.timedelta64(1, "s")
+
+
+def _cases():
+    """Linhas do tempo: uniforme, com lacunas, passos variados, duplicatas, fora de ordem e vazia"""
+    rng = np.random.default_rng(0)
+    uniform = START + np.arange(500) * 10 * SECOND
+    with_gaps = np.delete(uniform, np.r_[100:130, 300:301])
+    mixed = START + np.cumsum(rng.choice([10, 10, 10, 20, 7, 1000], size=300)) * SECOND
+    duplicates = np.sort(np.concatenate([uniform[:200], uniform[50:53], uniform[199:200]]))
+    out_of_order = np.concatenate([uniform[100:150], uniform[:100]])
+    return {
+        "uniforme": uniform, "lacunas": with_gaps, "passos variados": mixed,
+        "duplicatas": duplicates, "fora de ordem": out_of_order,
+        "uma amostra": uniform[:1], "vazia": uniform[:0],
+    }
+
+
+def _queries(timestamps):
+    """Instantes procurados: as próprias amostras, entre amostras e fora da faixa"""
+    if not len(timestamps):
+        return [START]
+    return np.concatenate([timestamps[::7], timestamps[::11] + 3 * SECOND, timestamps[:1] - SECOND,
+                           timestamps[-1:] + SECOND])
+
+
+def test_round_trip():
+    """to_array, indexação e to_dict/from_dict reproduzem os timestamps originais"""
+    for name, timestamps in _cases().items():
+        index = TimeIndex.from_array(timestamps)
+        assert len(index) == len(timestamps), name
+        assert np.array_equal(index.to_array(), timestamps), name
+        assert all(index[i] == timestamps[i] for i in range(0, len(timestamps), 13)), name
+        assert TimeIndex.from_dict(index.to_dict()) == index, name
+        print(f"✓ {name}: {len(timestamps)} amostras em {index.runs} sequências")
+
+
+def test_position_and_window():
+    """position e window concordam com np.searchsorted sobre o array de timestamps"""
+    for name, timestamps in _cases().items():
+        if np.any(np.diff(timestamps) < np.timedelta64(0)):
+            continue  # position exige timestamps crescentes
+        index = TimeIndex.from_array(timestamps)
+        for query in _queries(timestamps):
+            for side in ("left", "right"):
+                assert index.position(query, side) == np.searchsorted(timestamps, query, side), (name, query, side)
+        queries = _queries(timestamps)
+        for start, end in zip(queries[:-1], queries[1:]):
+            low, high = np.searchsorted(timestamps, start, "left"), np.searchsorted(timestamps, end, "right")
+            assert index.window(start, end) == (low, max(low, high)), (name, start, end)
+        assert index.window() == (0, len(timestamps)), name
+        print(f"✓ {name}: posições e janelas iguais a np.searchsorted")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_position_and_window()
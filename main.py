@@ -1,14 +1,7 @@
 from pathlib import Path
 import sys
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
-import json
-from datetime import datetime
-from PIL import Image
 from utils.css_loader import load_css
 
 # Page configuration
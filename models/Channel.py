@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional, Union
 import json
+import math
+from .channel_stats import ChannelStats
 
 class Channel:
     """
@@ -20,6 +22,18 @@ class Channel:
         self.timestamps = []  # Lista para armazenar os timestamps
         self.samples_min = []  # Lista para armazenar os valores mínimos
         self.samples_max = []  # Lista para armazenar os valores máximos
+        self.stats = ChannelStats()  # Estatísticas atualizadas a cada amostra ingerida
+        self._arrays = None  # Cache de as_arrays(): (quantidade de amostras, arrays)
+        self._time_index = None  # Cache de time_index(): (quantidade de amostras, TimeIndex)
+    
+    @property
+    def over_range_count(self) -> int:
+        """Amostras com Min ou Max em over-range (gravadas como NaN)"""
+        return self.stats.over_range_count
+    
+    @over_range_count.setter
+    def over_range_count(self, value: int) -> None:
+        self.stats.over_range_count = value
     
     def add_sample(self, timestamp: datetime, min_value: float, max_value: float):
         """
@@ -33,6 +47,86 @@ class Channel:
         self.timestamps.append(timestamp)
         self.samples_min.append(min_value)
         self.samples_max.append(max_value)
+        self.stats.update(timestamp, min_value, max_value)
+    
+    def extend_samples(self, timestamps: List[datetime], min_values: List[float],
+                       max_values: List[float]) -> None:
+        """
+        Adiciona várias amostras de uma vez ao canal.
+        
+        Args:
+            timestamps: Datas e horas das amostras
+            min_values: Valores mínimos de cada amostra
+            max_values: Valores máximos de cada amostra
+        """
+        self.timestamps.extend(timestamps)
+        self.samples_min.extend(min_values)
+        self.samples_max.extend(max_values)
+        self.stats.update_batch(timestamps, min_values, max_values)
+    
+    def merge(self, other: 'Channel') -> None:
+        """
+        Adiciona ao fim deste canal as amostras de outro (ex: o mesmo canal lido de
+        outro arquivo), combinando as estatísticas sem reprocessar os valores.
+        
+        Args:
+            other: Canal com as amostras a adicionar
+        """
+        self.timestamps.extend(other.timestamps)
+        self.samples_min.extend(other.samples_min)
+        self.samples_max.extend(other.samples_max)
+        self.stats.merge(other.stats)
+    
+    def as_arrays(self, like: Optional['Channel'] = None) -> Tuple:
+        """
+        Retorna os dados do canal como arrays numpy, para operações vetorizadas.
+        O resultado fica em cache até que novas amostras sejam adicionadas.
+        
+        Args:
+            like: Outro canal já convertido; se os timestamps forem iguais, o array de
+                timestamps dele é reaproveitado (a conversão de datetime é a parte cara)
+        
+        Returns:
+            Tupla (timestamps datetime64[us], mínimos float64, máximos float64)
+        """
+        import numpy as np
+        
+        count = len(self.timestamps)
+        if self._arrays is None or self._arrays[0] != count:
+            if (like is not None and like._arrays is not None and like._arrays[0] == count
+                    and like.timestamps == self.timestamps):
+                timestamps = like._arrays[1][0]
+            else:
+                timestamps = np.array(self.timestamps, dtype='datetime64[us]')
+            self._arrays = (count, (timestamps,
+                                    np.array(self.samples_min, dtype=np.float64),
+                                    np.array(self.samples_max, dtype=np.float64)))
+        return self._arrays[1]
+    
+    def time_index(self, like: Optional['Channel'] = None) -> 'TimeIndex':
+        """
+        Retorna os timestamps do canal como índice de tempo implícito (ver
+        models.time_index), em cache até que novas amostras sejam adicionadas.
+        
+        Args:
+            like: Outro canal com a mesma linha do tempo (mesmo array de as_arrays);
+                se for o caso, o índice dele é compartilhado em vez de recalculado
+        
+        Returns:
+            O TimeIndex dos timestamps do canal
+        """
+        from .time_index import TimeIndex
+        
+        count = len(self.timestamps)
+        if self._time_index is None or self._time_index[0] != count:
+            timestamps = self.as_arrays()[0]
+            if (like is not None and like._time_index is not None and like._time_index[0] == count
+                    and like._arrays is not None and like._arrays[1][0] is timestamps):
+                index = like._time_index[1]
+            else:
+                index = TimeIndex.from_array(timestamps)
+            self._time_index = (count, index)
+        return self._time_index[1]
     
     def get_data_as_dict(self) -> Dict:
         """
@@ -62,12 +156,14 @@ class Channel:
         # Converte objetos datetime para strings ISO
         iso_timestamps = [ts.isoformat() for ts in self.timestamps]
         
+        # Valores em over-range (NaN) são gravados como null, que é JSON válido
         return {
             "channel_id": self.channel_id,
             "unit": self.unit,
             "timestamps": iso_timestamps,
-            "samples_min": self.samples_min,
-            "samples_max": self.samples_max
+            "samples_min": [None if math.isnan(v) else v for v in self.samples_min],
+            "samples_max": [None if math.isnan(v) else v for v in self.samples_max],
+            "over_range_count": self.over_range_count
         }
     
     @staticmethod
@@ -85,8 +181,10 @@ class Channel:
         
         # Converte strings ISO para objetos datetime
         channel.timestamps = [datetime.fromisoformat(ts) for ts in json_data["timestamps"]]
-        channel.samples_min = json_data["samples_min"]
-        channel.samples_max = json_data["samples_max"]
+        channel.samples_min = [math.nan if v is None else v for v in json_data["samples_min"]]
+        channel.samples_max = [math.nan if v is None else v for v in json_data["samples_max"]]
+        channel.stats.update_batch(channel.timestamps, channel.samples_min, channel.samples_max)
+        channel.over_range_count = json_data.get("over_range_count", 0)
         
         return channel
     
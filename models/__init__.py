@@ -0,0 +1,32 @@
+"""
+Núcleo de processamento de arquivos GTD, utilizável sem Streamlit.
+
+Os nomes públicos são carregados sob demanda (PEP 562): `import models` não importa
+pandas nem numpy, que só são carregados quando a funcionalidade que os usa é chamada.
+"""
+
+import importlib
+
+# Nome público -> módulo que o define
+_EXPORTS = {
+    "GTDProcessor": ".gtd_processor",
+    "process_gtd_directory": ".gtd_processor",
+    "Channel": ".Channel",
+    "ProcessingMetrics": ".metrics",
+    "StageMetrics": ".metrics",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Importa o módulo que define `name` no primeiro acesso"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,279 @@
+import fnmatch
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .sequences import find_runs, run_peak
+from .resample import parse_interval
+
+# Sentidos de violação: acima do limite (ex: temperatura de mancal) ou abaixo dele
+DIRECTIONS = ("above", "below")
+
+# Séries avaliadas: por padrão a série mais desfavorável (Max para 'above', Min para 'below')
+SERIES = ("min", "max", "mid")
+
+# Colunas da tabela de eventos
+EVENT_COLUMNS = ['Regra', 'Canal', 'Início', 'Fim', 'Duração (s)', 'Pico', 'Amostras', 'Ativo']
+
+
+class AlarmRule:
+    """
+    Regra de alarme por limite: o alarme dispara quando a série passa do limite e só é
+    liberado quando volta além da histerese (ex: dispara acima de 120 °C e libera abaixo
+    de 118 °C), evitando eventos repetidos com o sinal oscilando perto do limite. Eventos
+    mais curtos que a duração mínima são descartados.
+
+    Os canais são escolhidos pelo ID ou por padrões sobre o ID, que inclui a tag do
+    cabeçalho (ex: "5_mancal_D1" é selecionado por "*mancal*").
+    """
+    def __init__(self, name: str, channels: Union[str, int, Sequence], limit: float,
+                 direction: str = "above", hysteresis: float = 0.0, min_duration=None,
+                 series: Optional[str] = None):
+        """
+        Cria a regra
+
+        Args:
+            name: Nome da regra, exibido na tabela de eventos
+            channels: ID do canal, padrão glob sobre o ID (ex: "*mancal*") ou lista deles
+            limit: Limite de disparo, na unidade do canal
+            direction: 'above' (dispara acima do limite) ou 'below' (abaixo dele)
+            hysteresis: Margem (>= 0) que a série precisa recuar além do limite para liberar
+            min_duration: Duração mínima do evento (ex: "5 min"), ou None para qualquer duração
+            series: Série avaliada: 'min', 'max' ou 'mid' (padrão: 'max' para 'above', 'min' para 'below')
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Sentido desconhecido: {direction}. Use um de {DIRECTIONS}")
+        if series is not None and series not in SERIES:
+            raise ValueError(f"Série desconhecida: {series}. Use uma de {SERIES}")
+        if hysteresis < 0:
+            raise ValueError(f"A histerese não pode ser negativa: {hysteresis}")
+        self.name = name
+        self.channels = [channels] if isinstance(channels, (str, int)) else list(channels)
+        self.limit = float(limit)
+        self.direction = direction
+        self.hysteresis = float(hysteresis)
+        self.min_duration = None if min_duration in (None, "") else parse_interval(min_duration)
+        self.series = series or ("max" if direction == "above" else "min")
+
+    def matches(self, channel_id) -> bool:
+        """True se o canal é selecionado pela regra (ID igual ou padrão glob sobre o ID)"""
+        return any(channel_id == pattern or fnmatch.fnmatchcase(str(channel_id), str(pattern))
+                   for pattern in self.channels)
+
+    def values(self, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+        """Série avaliada a partir dos mínimos e máximos"""
+        if self.series == "mid":
+            return (mins + maxs) / 2
+        return mins if self.series == "min" else maxs
+
+    def state(self, values: np.ndarray, initial: np.ndarray) -> np.ndarray:
+        """
+        Estado do alarme em cada amostra, de forma vetorizada: as amostras que disparam
+        ou liberam decidem o estado e as demais (entre o limite e a histerese, ou NaN)
+        repetem a última decisão, propagada com np.maximum.accumulate.
+
+        Args:
+            values: Matriz da série avaliada (T x C)
+            initial: Estado de cada coluna antes da primeira amostra
+
+        Returns:
+            Matriz booleana (T x C) com True onde o alarme está ativo
+        """
+        with np.errstate(invalid='ignore'):
+            if self.direction == "above":
+                trigger, release = values > self.limit, values <= self.limit - self.hysteresis
+            else:
+                trigger, release = values < self.limit, values >= self.limit + self.hysteresis
+        rows = np.arange(values.shape[0])[:, None]
+        decided = np.maximum.accumulate(np.where(trigger | release, rows, -1), axis=0)
+        columns = np.arange(values.shape[1])[None, :]
+        return np.where(decided >= 0, trigger[np.maximum(decided, 0), columns], initial[None, :])
+
+    def peak(self, values: np.ndarray, cols: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Valor mais desfavorável de cada sequência (maior acima do limite, menor abaixo)"""
+        if self.direction == "above":
+            return run_peak(values, cols, starts, ends)
+        return -run_peak(-values, cols, starts, ends)
+
+    def worse(self, first: float, second: float) -> float:
+        """O mais desfavorável de dois picos (NaN é ignorado)"""
+        pick = np.fmax if self.direction == "above" else np.fmin
+        return float(pick(first, second))
+
+    @staticmethod
+    def from_dict(data: Dict) -> 'AlarmRule':
+        """
+        Cria a regra a partir de um dicionário (ex: linha de uma tabela ou JSON).
+
+        Args:
+            data: Chaves name, channels, limit e, opcionalmente, direction, hysteresis,
+                min_duration e series; channels pode ser uma lista ou texto separado por vírgulas
+
+        Returns:
+            Uma nova AlarmRule
+        """
+        channels = data["channels"]
+        if isinstance(channels, str):
+            channels = [int(item) if item.strip().isdigit() else item.strip()
+                        for item in channels.split(",") if item.strip()]
+        return AlarmRule(data["name"], channels, data["limit"], direction=data.get("direction") or "above",
+                         hysteresis=data.get("hysteresis") or 0.0, min_duration=data.get("min_duration"),
+                         series=data.get("series") or None)
+
+
+class AlarmEngine:
+    """
+    Avalia regras de alarme sobre os canais de um GTDProcessor. Cada chamada de update()
+    processa apenas as amostras adicionadas desde a chamada anterior: o estado do alarme
+    e o evento em aberto de cada par (regra, canal) continuam de onde pararam, de modo que
+    a avaliação em registros ao vivo (arquivos anexados aos poucos) custa proporcional às
+    amostras novas. Canais com a mesma linha do tempo são avaliados juntos, como uma
+    matriz amostras x canais.
+
+    As amostras novas devem ser posteriores às já avaliadas (arquivos anexados em ordem).
+    Canais recarregados (menos amostras que as já avaliadas) ou canais derivados
+    redefinidos são reavaliados do início.
+    """
+    def __init__(self, rules: Iterable[AlarmRule]):
+        """
+        Prepara o motor
+
+        Args:
+            rules: Regras avaliadas
+        """
+        self.rules = list(rules)
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta os eventos e o estado, para reavaliar os dados do início"""
+        self._closed: List[Dict] = []
+        self._progress: Dict = {}  # (regra, canal) -> amostras já avaliadas
+        self._active: Dict = {}  # (regra, canal) -> alarme ativo após a última amostra
+        self._open: Dict = {}  # (regra, canal) -> evento em aberto
+        self._sources: Dict = {}  # (regra, canal) -> canal (ou definição do canal derivado) avaliado
+
+    def update(self, processor) -> 'pandas.DataFrame':
+        """
+        Avalia as amostras novas do processor.
+
+        Args:
+            processor: GTDProcessor com os dados (o mesmo a cada chamada)
+
+        Returns:
+            DataFrame com os eventos encerrados nesta chamada e os eventos em aberto
+        """
+        pending = []
+        for position, rule in enumerate(self.rules):
+            ids = [channel_id for channel_id in processor.channels if rule.matches(channel_id)]
+            for channel_id, (timestamps, mins, maxs) in processor.channel_arrays(ids).items():
+                key = (position, channel_id)
+                source = processor.math_channels.get(channel_id, processor.channels[channel_id])
+                if self._progress.get(key, 0) > len(timestamps) or self._sources.get(key, source) is not source:
+                    self._forget(key)  # Dados recarregados ou canal derivado redefinido: recomeça o canal
+                self._sources[key] = source
+                pending.append((position, channel_id, timestamps, mins, maxs))
+        closed_before = len(self._closed)
+        groups: Dict = {}
+        for position, channel_id, timestamps, mins, maxs in pending:
+            done = self._progress.get((position, channel_id), 0)
+            if done < len(timestamps):
+                groups.setdefault((position, id(timestamps), done), []).append((channel_id, timestamps, mins, maxs))
+        for (position, _, done), members in groups.items():
+            rule = self.rules[position]
+            times = members[0][1][done:]
+            values = np.column_stack([rule.values(mins[done:], maxs[done:]) for _, _, mins, maxs in members])
+            self._evaluate(position, rule, [member[0] for member in members], times, values)
+            for channel_id, timestamps, _, _ in members:
+                self._progress[(position, channel_id)] = len(timestamps)
+        return self._table(self._closed[closed_before:] + self._open_events())
+
+    def events(self) -> 'pandas.DataFrame':
+        """
+        Todos os eventos avaliados até aqui: os encerrados e os em aberto (Ativo = True).
+
+        Returns:
+            DataFrame de eventos ordenado por início
+        """
+        return self._table(self._closed + self._open_events())
+
+    def _forget(self, key) -> None:
+        """Descarta o estado e os eventos encerrados de um par (regra, canal)"""
+        for state in (self._progress, self._active, self._open, self._sources):
+            state.pop(key, None)
+        rule = self.rules[key[0]]
+        self._closed = [event for event in self._closed
+                        if not (event["rule"] is rule and event["channel"] == key[1])]
+
+    def _evaluate(self, position: int, rule: AlarmRule, channel_ids: List, times: np.ndarray,
+                  values: np.ndarray) -> None:
+        """Avalia um bloco de amostras novas de canais com a mesma linha do tempo"""
+        initial = np.array([self._active.get((position, channel_id), False) for channel_id in channel_ids])
+        state = rule.state(values, initial)
+        for col, channel_id in enumerate(channel_ids):
+            key = (position, channel_id)
+            if not state[0, col] and key in self._open:
+                # O evento em aberto não continua neste bloco: terminou no bloco anterior
+                event = self._open.pop(key)
+                if self._long_enough(event):
+                    self._closed.append(event)
+        cols, starts, ends = find_runs(state)
+        peaks = rule.peak(values, cols, starts, ends)
+        for col, start, end, peak in zip(cols.tolist(), starts.tolist(), ends.tolist(), peaks.tolist()):
+            key = (position, channel_ids[col])
+            event = {"rule": rule, "channel": channel_ids[col], "start": times[start], "end": times[end - 1],
+                     "peak": peak, "samples": end - start}
+            if start == 0 and key in self._open:  # Continuação do evento do bloco anterior
+                previous = self._open.pop(key)
+                event.update(start=previous["start"], peak=rule.worse(previous["peak"], peak),
+                             samples=previous["samples"] + end - start)
+            if end == len(times):
+                self._open[key] = event
+            elif self._long_enough(event):
+                self._closed.append(event)
+        for col, channel_id in enumerate(channel_ids):
+            self._active[(position, channel_id)] = bool(state[-1, col])
+
+    @staticmethod
+    def _long_enough(event: Dict) -> bool:
+        """True se o evento dura ao menos a duração mínima da regra"""
+        minimum = event["rule"].min_duration
+        return minimum is None or event["end"] - event["start"] >= minimum
+
+    def _open_events(self) -> List[Dict]:
+        """Eventos em aberto que já atingiram a duração mínima"""
+        return [dict(event, active=True) for event in self._open.values() if self._long_enough(event)]
+
+    @staticmethod
+    def _table(events: List[Dict]) -> 'pandas.DataFrame':
+        """Monta a tabela de eventos"""
+        import pandas as pd
+
+        rows = [{
+            'Regra': event["rule"].name,
+            'Canal': event["channel"],
+            'Início': event["start"].item(),
+            'Fim': event["end"].item(),
+            'Duração (s)': (event["end"] - event["start"]) / np.timedelta64(1, 's'),
+            'Pico': event["peak"],
+            'Amostras': event["samples"],
+            'Ativo': event.get("active", False),
+        } for event in events]
+        table = pd.DataFrame(rows, columns=EVENT_COLUMNS)
+        return table.sort_values(['Início', 'Regra'], kind='stable').reset_index(drop=True)
+
+
+def evaluate_alarms(processor, rules: Iterable[AlarmRule]) -> 'pandas.DataFrame':
+    """
+    Avalia as regras sobre todos os dados de uma vez (ver AlarmEngine).
+
+    Args:
+        processor: GTDProcessor com os dados
+        rules: Regras avaliadas
+
+    Returns:
+        DataFrame de eventos com Regra, Canal, Início, Fim, Duração (s), Pico, Amostras e
+        Ativo (o alarme continua ativo na última amostra), ordenado por início
+    """
+    engine = AlarmEngine(rules)
+    engine.update(processor)
+    return engine.events()
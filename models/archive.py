@@ -0,0 +1,274 @@
+import json
+import lzma
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .encoding import EncodedValues, encode_values
+from .resample import bucket_ids, parse_interval
+
+# Assinatura no início e no fim do arquivo (o fim também guarda a posição do índice)
+MAGIC = b"GTDARC01"
+_TRAILER = struct.Struct("<Q8s")
+
+# Compressores da biblioteca padrão: nome -> (compressão(dados, nível), descompressão)
+CODECS = {
+    "zlib": (lambda data, level: zlib.compress(data, 6 if level is None else level), zlib.decompress),
+    "lzma": (lambda data, level: lzma.compress(data, preset=6 if level is None else level), lzma.decompress),
+}
+
+
+def _delta_encode(values: np.ndarray) -> np.ndarray:
+    """
+    Transforma uma série para compressão: inteiros viram diferenças entre vizinhos
+    (aritmética modular do próprio tipo, então é sempre reversível) e floats viram
+    o XOR dos bits com o valor anterior (leituras próximas têm bits quase iguais).
+    """
+    if values.dtype.kind == 'i':
+        return np.diff(values, prepend=values.dtype.type(0))
+    bits = values.view(np.uint64 if values.dtype.itemsize == 8 else np.uint32)
+    return bits ^ np.concatenate((np.zeros(1, dtype=bits.dtype), bits[:-1]))
+
+
+def _delta_decode(encoded: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Inverte _delta_encode"""
+    if dtype.kind == 'i':
+        return np.cumsum(encoded, dtype=dtype)
+    return np.bitwise_xor.accumulate(encoded).view(dtype)
+
+
+def _encode_chunk(ticks: np.ndarray, mins: np.ndarray, maxs: np.ndarray, encoding: str,
+                  codec: str, level: Optional[int]) -> Tuple[bytes, Dict, Dict]:
+    """
+    Codifica e comprime um chunk: timestamps (int64 em µs) como diferenças de segunda
+    ordem, que são zero em amostragem regular, seguidos das séries Min e Max.
+
+    Returns:
+        Tupla (bytes comprimidos, parâmetros da codificação de Min, de Max)
+    """
+    steps = np.diff(ticks, prepend=np.int64(0))
+    parts = [np.diff(steps, prepend=np.int64(0)).tobytes()]
+    params = []
+    for values in (mins, maxs):
+        encoded = encode_values(values, encoding)
+        parts.append(_delta_encode(encoded.data).tobytes())
+        params.append(encoded.params())
+    return CODECS[codec][0](b"".join(parts), level), params[0], params[1]
+
+
+def _decode_chunk(payload: bytes, entry: Dict, codec: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Descomprime e decodifica um chunk gravado por _encode_chunk.
+
+    Returns:
+        Tupla (timestamps datetime64[us], mínimos, máximos)
+    """
+    raw = CODECS[codec][1](payload)
+    count = entry["count"]
+    ticks = np.cumsum(np.cumsum(np.frombuffer(raw, dtype=np.int64, count=count)))
+    position = count * 8
+    values = []
+    for kind in ("min", "max"):
+        dtype = np.dtype(entry[kind]["dtype"])
+        stored = np.dtype(f"u{dtype.itemsize}") if dtype.kind == 'f' else dtype  # Floats: bits do XOR
+        encoded = np.frombuffer(raw, dtype=stored, count=count, offset=position)
+        position += count * dtype.itemsize
+        values.append(EncodedValues(_delta_decode(encoded, dtype), entry[kind]["decimals"]).decode())
+    return ticks.astype('datetime64[us]'), values[0], values[1]
+
+
+def write_archive(processor, output_filepath: str, chunk="1 d", codec: str = "zlib",
+                  level: Optional[int] = None, encoding: str = "fixed",
+                  max_workers: Optional[int] = None) -> Dict:
+    """
+    Grava os canais de um processador em um arquivo de arquivamento de longo prazo.
+
+    Cada canal é dividido em chunks de duração fixa (alinhados à época Unix), e cada
+    chunk é codificado (timestamps por diferenças, valores em ponto fixo com
+    diferenças ou floats com XOR) e comprimido de forma independente, em paralelo.
+    Um índice no fim do arquivo registra o intervalo de tempo, a posição e o tamanho
+    de cada chunk, de modo que a leitura de uma janela descomprime apenas os chunks
+    que a cruzam. As amostras são gravadas em ordem de tempo.
+
+    Args:
+        processor: GTDProcessor com os dados
+        output_filepath: Caminho do arquivo de saída
+        chunk: Duração de cada chunk (ver resample.parse_interval)
+        codec: Compressor: 'zlib' ou 'lzma'
+        level: Nível de compressão (padrão do compressor se None)
+        encoding: Codificação dos valores (ver encoding.encode_values)
+        max_workers: Threads de compressão (zlib e lzma liberam o GIL)
+
+    Returns:
+        O índice gravado
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Compressor desconhecido: {codec}. Use um de {list(CODECS)}")
+    step = parse_interval(chunk)
+
+    # Divide cada canal em chunks de tempo
+    tasks = []  # (posição do canal, início, fim, ticks, mínimos, máximos)
+    channels_info = []
+    arrays = processor.channel_arrays()
+    for channel_id, channel in processor.channels.items():
+        channels_info.append({"channel_id": channel_id, "unit": channel.unit,
+                              "over_range_count": channel.over_range_count,
+                              "samples": len(channel.timestamps), "chunks": []})
+        if channel_id not in arrays:
+            continue
+        timestamps, mins, maxs = arrays[channel_id]
+        if np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, mins, maxs = timestamps[order], mins[order], maxs[order]
+        buckets = bucket_ids(timestamps, step)
+        bounds = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1], [True])))
+        ticks = timestamps.astype(np.int64)
+        for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            tasks.append((len(channels_info) - 1, timestamps[start], timestamps[end - 1],
+                          ticks[start:end], mins[start:end], maxs[start:end]))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gtd-archive") as executor:
+        encoded = executor.map(lambda task: _encode_chunk(task[3], task[4], task[5], encoding, codec, level),
+                               tasks)
+        with open(output_filepath, 'wb') as f:
+            f.write(MAGIC)
+            for (position, first, last, ticks, _, _), (payload, min_params, max_params) in zip(tasks, encoded):
+                channels_info[position]["chunks"].append({
+                    "start": first.item().isoformat(), "end": last.item().isoformat(),
+                    "count": len(ticks), "offset": f.tell(), "length": len(payload),
+                    "min": min_params, "max": max_params,
+                })
+                f.write(payload)
+
+            index = {"format": "gtd-archive", "version": 1, "codec": codec,
+                     "chunk_us": int(step.astype(np.int64)), "metadata": processor.metadata,
+                     "trigger_time": processor.trigger_time.isoformat() if processor.trigger_time else None,
+                     "channels": channels_info}
+            index_offset = f.tell()
+            f.write(json.dumps(index).encode('utf-8'))
+            f.write(_TRAILER.pack(index_offset, MAGIC))
+    return index
+
+
+class ArchiveReader:
+    """
+    Leitura de um arquivo gravado por write_archive. Apenas o índice é lido ao abrir;
+    os chunks são lidos e descomprimidos sob demanda, somente os que cruzam a janela
+    de tempo pedida.
+    """
+    def __init__(self, filepath: str):
+        """
+        Abre o arquivo e carrega o índice de chunks
+
+        Args:
+            filepath: Caminho do arquivo
+        """
+        self.filepath = filepath
+        with open(filepath, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Arquivo de arquivamento GTD inválido: {filepath}")
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            index_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Arquivo de arquivamento GTD incompleto: {filepath}")
+            f.seek(index_offset)
+            self.index = json.loads(f.read(os.path.getsize(filepath) - _TRAILER.size - index_offset))
+        self.codec = self.index["codec"]
+        self.metadata = self.index.get("metadata", {})
+        trigger_time = self.index.get("trigger_time")
+        self.trigger_time = datetime.fromisoformat(trigger_time) if trigger_time else None
+        self._channels = {info["channel_id"]: info for info in self.index["channels"]}
+
+    @property
+    def channel_ids(self) -> List:
+        """IDs dos canais arquivados, na ordem original"""
+        return list(self._channels)
+
+    @property
+    def time_range(self) -> Optional[Tuple]:
+        """Primeiro e último timestamp arquivados (datetime), ou None se estiver vazio"""
+        chunks = [chunk for info in self._channels.values() for chunk in info["chunks"]]
+        if not chunks:
+            return None
+        return (min(np.datetime64(chunk["start"], 'us') for chunk in chunks).item(),
+                max(np.datetime64(chunk["end"], 'us') for chunk in chunks).item())
+
+    def chunks(self, channel_id, start=None, end=None) -> List[Dict]:
+        """
+        Entradas do índice dos chunks de um canal que cruzam a janela de tempo.
+
+        Args:
+            channel_id: ID do canal
+            start: Início da janela (inclusive), ou None
+            end: Fim da janela (inclusive), ou None
+
+        Returns:
+            Lista de entradas do índice (start, end, count, offset, length, min, max)
+        """
+        start = None if start is None else np.datetime64(start, 'us')
+        end = None if end is None else np.datetime64(end, 'us')
+        return [chunk for chunk in self._channels[channel_id]["chunks"]
+                if (start is None or np.datetime64(chunk["end"], 'us') >= start)
+                and (end is None or np.datetime64(chunk["start"], 'us') <= end)]
+
+    def read(self, channel_ids: Optional[Sequence] = None, start=None, end=None,
+             max_workers: Optional[int] = None) -> 'GTDProcessor':
+        """
+        Carrega em um GTDProcessor os canais pedidos na janela de tempo, lendo e
+        descomprimindo (em paralelo) apenas os chunks que a cruzam.
+
+        Args:
+            channel_ids: Canais a carregar (padrão: todos)
+            start: Início da janela (inclusive), ou None
+            end: Fim da janela (inclusive), ou None
+            max_workers: Threads de descompressão
+
+        Returns:
+            Um novo GTDProcessor com as amostras da janela
+        """
+        from .Channel import Channel
+        from .gtd_processor import GTDProcessor
+
+        ids = list(channel_ids) if channel_ids is not None else self.channel_ids
+        unknown = [channel_id for channel_id in ids if channel_id not in self._channels]
+        if unknown:
+            raise ValueError(f"Canais não encontrados no arquivo: {unknown}")
+
+        selected = [(channel_id, chunk) for channel_id in ids for chunk in self.chunks(channel_id, start, end)]
+        with open(self.filepath, 'rb') as f:
+            payloads = []
+            for _, chunk in selected:
+                f.seek(chunk["offset"])
+                payloads.append(f.read(chunk["length"]))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gtd-archive") as executor:
+            decoded = list(executor.map(lambda item: _decode_chunk(item[0], item[1][1], self.codec),
+                                        zip(payloads, selected)))
+
+        low = None if start is None else np.datetime64(start, 'us')
+        high = None if end is None else np.datetime64(end, 'us')
+        pieces = {channel_id: [] for channel_id in ids}
+        for (channel_id, _), (timestamps, mins, maxs) in zip(selected, decoded):
+            first = 0 if low is None else int(np.searchsorted(timestamps, low, 'left'))
+            last = len(timestamps) if high is None else int(np.searchsorted(timestamps, high, 'right'))
+            pieces[channel_id].append((timestamps[first:last], mins[first:last], maxs[first:last]))
+
+        processor = GTDProcessor()
+        processor.metadata = dict(self.metadata)
+        processor.trigger_time = self.trigger_time
+        for channel_id in ids:
+            info = self._channels[channel_id]
+            channel = Channel(channel_id, info["unit"])
+            if pieces[channel_id]:
+                timestamps, mins, maxs = (np.concatenate(part) for part in zip(*pieces[channel_id]))
+                channel.extend_samples(timestamps.tolist(), mins.tolist(), maxs.tolist())
+                if start is None and end is None:
+                    channel.over_range_count = info.get("over_range_count", 0)
+                else:
+                    channel.over_range_count = int(np.count_nonzero(np.isnan(mins) | np.isnan(maxs)))
+            processor.channels[channel_id] = channel
+        return processor
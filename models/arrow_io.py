@@ -0,0 +1,284 @@
+import importlib.util
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .table_view import TIME_COLUMN
+
+# pyarrow é opcional: as exportações Parquet/Feather só ficam disponíveis se ele estiver instalado
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Chave dos metadados do GTD no schema Arrow
+SCHEMA_KEY = b"gtd"
+
+
+def _require_arrow():
+    """Importa o pyarrow, com uma mensagem clara quando ele não está instalado"""
+    if not ARROW_AVAILABLE:
+        raise ImportError("O pyarrow não está instalado; instale-o (pip install pyarrow) "
+                          "para exportar e importar Parquet/Feather.")
+    import pyarrow
+    return pyarrow
+
+
+def _merge_timelines(arrays: Dict) -> Tuple[np.ndarray, Dict]:
+    """
+    Une as linhas do tempo dos canais sem descartar timestamps repetidos: cada instante
+    ocupa tantas linhas quanto o maior número de repetições dele em um canal, e a k-ésima
+    amostra de um canal naquele instante vai para a k-ésima dessas linhas.
+
+    Args:
+        arrays: {channel_id -> (timestamps, mínimos, máximos)} (ver GTDProcessor.channel_arrays)
+
+    Returns:
+        Tupla (timestamps ordenados das linhas, {channel_id -> linha de cada amostra})
+    """
+    timelines = [timestamps for timestamps, _, _ in arrays.values()]
+    if not timelines:
+        return np.empty(0, dtype='datetime64[us]'), {}
+    instants = np.unique(np.concatenate(timelines))
+    slots, ranks = {}, {}
+    rows_per_instant = np.zeros(len(instants), dtype=np.int64)
+    for channel_id, (timestamps, _, _) in arrays.items():
+        slot = np.searchsorted(instants, timestamps)
+        # Ordem de ocorrência de cada amostra entre as do mesmo instante (estável)
+        order = np.argsort(slot, kind='stable')
+        rank = np.empty(len(slot), dtype=np.int64)
+        sorted_slots = slot[order]
+        rank[order] = np.arange(len(slot)) - np.searchsorted(sorted_slots, sorted_slots, 'left')
+        np.maximum(rows_per_instant, np.bincount(slot, minlength=len(instants)), out=rows_per_instant)
+        slots[channel_id], ranks[channel_id] = slot, rank
+    first_row = np.concatenate(([0], np.cumsum(rows_per_instant)[:-1]))
+    positions = {channel_id: first_row[slots[channel_id]] + ranks[channel_id] for channel_id in arrays}
+    return np.repeat(instants, rows_per_instant), positions
+
+
+def build_table(processor, channel_ids: Optional[Sequence] = None) -> Tuple['pyarrow.Table', List[int]]:
+    """
+    Monta a tabela Arrow larga (Timestamp + Ch{id}_Min_{unidade} / Ch{id}_Max_{unidade})
+    sobre a união ordenada dos timestamps (timestamps repetidos em um canal ocupam linhas
+    próprias, ver _merge_timelines). Linhas em que o canal não tem amostra ficam nulas,
+    enquanto o over-range continua NaN, de modo que a importação reconstrói exatamente
+    as amostras de cada canal. O cabeçalho do GTD e as informações dos
+    canais são gravados nos metadados do schema.
+
+    Args:
+        processor: GTDProcessor com os dados
+        channel_ids: Canais a incluir (padrão: todos)
+
+    Returns:
+        Tupla (tabela ordenada por tempo, limites [início, fim) das linhas de cada dia)
+    """
+    pa = _require_arrow()
+
+    arrays = processor.channel_arrays(channel_ids)
+    timelines = [timestamps for timestamps, _, _ in arrays.values()]
+    first = timelines[0] if timelines else np.empty(0, dtype='datetime64[us]')
+    if all(timestamps is first for timestamps in timelines) and np.all(first[1:] > first[:-1]):
+        times, positions = first, None
+    else:
+        times, positions = _merge_timelines(arrays)
+
+    columns = {TIME_COLUMN: pa.array(times, type=pa.timestamp('us'))}
+    channels_info = []
+    for channel_id in (channel_ids if channel_ids is not None else list(processor.channels)):
+        channel = processor.channels[channel_id]
+        names = (f"Ch{channel_id}_Min_{channel.unit}", f"Ch{channel_id}_Max_{channel.unit}")
+        channels_info.append({"channel_id": channel_id, "unit": channel.unit,
+                              "over_range_count": channel.over_range_count,
+                              "min_column": names[0], "max_column": names[1]})
+        if channel_id not in arrays:
+            for name in names:
+                columns[name] = pa.nulls(len(times), type=pa.float64())
+            continue
+        timestamps, mins, maxs = arrays[channel_id]
+        if positions is None:
+            missing = None
+        else:
+            rows = positions[channel_id]
+            missing = np.ones(len(times), dtype=bool)
+            missing[rows] = False
+            full_mins, full_maxs = np.full(len(times), np.nan), np.full(len(times), np.nan)
+            full_mins[rows], full_maxs[rows] = mins, maxs
+            mins, maxs = full_mins, full_maxs
+        columns[names[0]] = pa.array(mins, mask=missing, type=pa.float64())
+        columns[names[1]] = pa.array(maxs, mask=missing, type=pa.float64())
+
+    trigger_time = processor.trigger_time.isoformat() if processor.trigger_time else None
+    metadata = {SCHEMA_KEY: json.dumps({"metadata": processor.metadata, "channels": channels_info,
+                                        "trigger_time": trigger_time}).encode('utf-8')}
+    table = pa.table(columns).replace_schema_metadata(metadata)
+
+    # Limites dos dias: cada dia vira um row group (Parquet) ou record batch (Feather)
+    days = times.astype('datetime64[D]')
+    bounds = np.flatnonzero(np.concatenate(([True], days[1:] != days[:-1], [True]))).tolist()
+    return table, bounds if len(times) else [0, 0]
+
+
+def write_parquet(processor, output_filepath: str, compression: str = 'zstd') -> int:
+    """
+    Grava os dados em Parquet, com um row group por dia.
+
+    Args:
+        processor: GTDProcessor com os dados
+        output_filepath: Caminho do arquivo .parquet
+        compression: Compressão das colunas (ex: 'zstd', 'snappy', 'none')
+
+    Returns:
+        Quantidade de linhas gravadas
+    """
+    _require_arrow()
+    import pyarrow.parquet as pq
+
+    table, bounds = build_table(processor)
+    with pq.ParquetWriter(output_filepath, table.schema, compression=compression) as writer:
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if end > start:
+                writer.write_table(table.slice(start, end - start), row_group_size=end - start)
+    return table.num_rows
+
+
+def write_feather(processor, output_filepath: str, compression: str = 'zstd') -> int:
+    """
+    Grava os dados em Feather (formato de arquivo Arrow IPC), com um record batch por dia.
+
+    Args:
+        processor: GTDProcessor com os dados
+        output_filepath: Caminho do arquivo .feather
+        compression: Compressão dos buffers ('zstd', 'lz4' ou None)
+
+    Returns:
+        Quantidade de linhas gravadas
+    """
+    pa = _require_arrow()
+
+    table, bounds = build_table(processor)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(output_filepath, 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if end > start:
+                writer.write_table(table.slice(start, end - start), max_chunksize=end - start)
+    return table.num_rows
+
+
+def _projection(info: Dict, channel_ids: Optional[Sequence]) -> List[Dict]:
+    """Canais pedidos, na ordem do arquivo"""
+    if channel_ids is None:
+        return info["channels"]
+    known = {channel["channel_id"] for channel in info["channels"]}
+    unknown = [channel_id for channel_id in channel_ids if channel_id not in known]
+    if unknown:
+        raise ValueError(f"Canais não encontrados no arquivo: {unknown}")
+    return [channel for channel in info["channels"] if channel["channel_id"] in channel_ids]
+
+
+def _overlaps(low, high, start, end) -> bool:
+    """True se o intervalo [low, high] de um row group cruza a janela [start, end]"""
+    return (start is None or high >= start) and (end is None or low <= end)
+
+
+def _to_processor(table, info: Dict, channels: List[Dict], start, end) -> 'GTDProcessor':
+    """Reconstrói um GTDProcessor a partir das linhas lidas, recortando a janela de tempo"""
+    from .Channel import Channel
+    from .gtd_processor import GTDProcessor
+
+    times = table.column(TIME_COLUMN).to_numpy().astype('datetime64[us]')
+    low = 0 if start is None else int(np.searchsorted(times, start, 'left'))
+    high = len(times) if end is None else int(np.searchsorted(times, end, 'right'))
+    times = times[low:high]
+    full_range = start is None and end is None
+
+    processor = GTDProcessor()
+    processor.metadata = dict(info.get("metadata", {}))
+    if info.get("trigger_time"):
+        processor.trigger_time = datetime.fromisoformat(info["trigger_time"])
+    for channel_info in channels:
+        channel = Channel(channel_info["channel_id"], channel_info["unit"])
+        values = []
+        for name in (channel_info["min_column"], channel_info["max_column"]):
+            column = table.column(name).slice(low, high - low)
+            values.append((column.to_numpy(zero_copy_only=False), column.is_valid().to_numpy(zero_copy_only=False)))
+        (mins, present), (maxs, _) = values
+        if present.any():
+            mins = mins[present].astype(np.float64)
+            maxs = maxs[present].astype(np.float64)
+            channel.extend_samples(times[present].tolist(), mins.tolist(), maxs.tolist())
+            channel.over_range_count = (channel_info.get("over_range_count", 0) if full_range
+                                        else int(np.count_nonzero(np.isnan(mins) | np.isnan(maxs))))
+        processor.channels[channel_info["channel_id"]] = channel
+    return processor
+
+
+def read_parquet(filepath: str, channel_ids: Optional[Sequence] = None, start=None, end=None) -> 'GTDProcessor':
+    """
+    Lê um arquivo gravado por write_parquet, carregando apenas as colunas dos canais
+    pedidos e apenas os row groups cujas estatísticas de tempo cruzam a janela.
+
+    Args:
+        filepath: Caminho do arquivo .parquet
+        channel_ids: Canais a carregar (padrão: todos)
+        start: Início da janela (inclusive), ou None
+        end: Fim da janela (inclusive), ou None
+
+    Returns:
+        Um novo GTDProcessor
+    """
+    _require_arrow()
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(filepath)
+    info = json.loads(parquet_file.schema_arrow.metadata[SCHEMA_KEY])
+    channels = _projection(info, channel_ids)
+    columns = [TIME_COLUMN] + [name for channel in channels for name in (channel["min_column"], channel["max_column"])]
+    start = None if start is None else np.datetime64(start, 'us')
+    end = None if end is None else np.datetime64(end, 'us')
+
+    time_position = parquet_file.schema_arrow.get_field_index(TIME_COLUMN)
+    groups = []
+    for group in range(parquet_file.num_row_groups):
+        statistics = parquet_file.metadata.row_group(group).column(time_position).statistics
+        if statistics is None or not statistics.has_min_max or _overlaps(
+                np.datetime64(statistics.min, 'us'), np.datetime64(statistics.max, 'us'), start, end):
+            groups.append(group)
+    if groups:
+        table = parquet_file.read_row_groups(groups, columns=columns)
+    else:
+        table = parquet_file.schema_arrow.empty_table().select(columns)
+    return _to_processor(table, info, channels, start, end)
+
+
+def read_feather(filepath: str, channel_ids: Optional[Sequence] = None, start=None, end=None) -> 'GTDProcessor':
+    """
+    Lê um arquivo gravado por write_feather (mapeado em memória), montando apenas as
+    colunas dos canais pedidos e apenas os record batches que cruzam a janela.
+
+    Args:
+        filepath: Caminho do arquivo .feather
+        channel_ids: Canais a carregar (padrão: todos)
+        start: Início da janela (inclusive), ou None
+        end: Fim da janela (inclusive), ou None
+
+    Returns:
+        Um novo GTDProcessor
+    """
+    pa = _require_arrow()
+
+    start = None if start is None else np.datetime64(start, 'us')
+    end = None if end is None else np.datetime64(end, 'us')
+    with pa.memory_map(filepath, 'r') as source:
+        reader = pa.ipc.open_file(source)
+        info = json.loads(reader.schema.metadata[SCHEMA_KEY])
+        channels = _projection(info, channel_ids)
+        columns = [TIME_COLUMN] + [name for channel in channels
+                                   for name in (channel["min_column"], channel["max_column"])]
+        batches = []
+        for position in range(reader.num_record_batches):
+            batch = reader.get_batch(position).select(columns)
+            times = batch.column(TIME_COLUMN)
+            if len(times) and _overlaps(np.datetime64(times[0].value, 'us'), np.datetime64(times[-1].value, 'us'),
+                                        start, end):
+                batches.append(batch)
+        table = pa.Table.from_batches(batches) if batches else reader.schema.empty_table().select(columns)
+        return _to_processor(table, info, channels, start, end)
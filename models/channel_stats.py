@@ -0,0 +1,223 @@
+import math
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class RunningStats:
+    """
+    Estatísticas de passada única de uma série de valores (algoritmo de Welford).
+    Valores NaN (over-range) são ignorados. Duas instâncias podem ser combinadas com
+    merge(), o que permite calcular as estatísticas por arquivo ou por bloco e juntá-las.
+    """
+    def __init__(self):
+        """Inicializa as estatísticas vazias"""
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self.m2 = 0.0  # Soma dos quadrados dos desvios em relação à média
+
+    def update(self, value: float) -> None:
+        """
+        Adiciona um valor às estatísticas.
+
+        Args:
+            value: Valor a adicionar (NaN é ignorado)
+        """
+        if value != value:  # NaN
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def update_batch(self, values) -> None:
+        """
+        Adiciona um bloco de valores de uma vez (vetorizado com numpy).
+
+        Args:
+            values: Lista ou array de valores (NaN é ignorado)
+        """
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        batch = RunningStats()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """
+        Combina outras estatísticas com estas (fórmula paralela de Chan et al.).
+
+        Args:
+            other: Estatísticas a combinar
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Variância amostral (ddof=1, como pandas), ou None com menos de dois valores"""
+        if self.count < 2:
+            return None
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> Optional[float]:
+        """Desvio padrão amostral, ou None com menos de dois valores"""
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def to_dict(self) -> Dict:
+        """
+        Converte as estatísticas em dicionário (min/max/mean são None se não houver valores).
+
+        Returns:
+            Dicionário com count, min, max, mean, variance e std
+        """
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "min": None if empty else self.min,
+            "max": None if empty else self.max,
+            "mean": None if empty else self.mean,
+            "variance": self.variance,
+            "std": self.std,
+        }
+
+
+class ChannelStats:
+    """
+    Estatísticas de um canal atualizadas à medida que as amostras são ingeridas:
+    estatísticas separadas das séries Min e Max, a distribuição de cada série
+    (percentis e histograma), primeiro e último timestamp e a contagem de amostras em
+    over-range. Combináveis entre arquivos e blocos.
+    """
+    def __init__(self):
+        """Inicializa as estatísticas vazias do canal"""
+        from .sketches import ValueDistribution  # Importado sob demanda: sketches carrega numpy
+
+        self.samples = 0  # Quantidade de amostras (pares Min/Max)
+        self.min_stats = RunningStats()  # Série samples_min
+        self.max_stats = RunningStats()  # Série samples_max
+        self.min_distribution = ValueDistribution()  # Percentis e histograma de samples_min
+        self.max_distribution = ValueDistribution()  # Percentis e histograma de samples_max
+        self.first_time: Optional[datetime] = None
+        self.last_time: Optional[datetime] = None
+        self.over_range_count = 0
+
+    def update(self, timestamp: datetime, min_value: float, max_value: float) -> None:
+        """
+        Adiciona uma amostra às estatísticas.
+
+        Args:
+            timestamp: Data e hora da amostra
+            min_value: Valor mínimo no intervalo
+            max_value: Valor máximo no intervalo
+        """
+        self.samples += 1
+        self.min_stats.update(min_value)
+        self.max_stats.update(max_value)
+        self.min_distribution.update_batch([min_value])
+        self.max_distribution.update_batch([max_value])
+        if self.first_time is None or timestamp < self.first_time:
+            self.first_time = timestamp
+        if self.last_time is None or timestamp > self.last_time:
+            self.last_time = timestamp
+
+    def update_batch(self, timestamps, min_values, max_values) -> None:
+        """
+        Adiciona um bloco de amostras às estatísticas.
+
+        Args:
+            timestamps: Datas e horas das amostras
+            min_values: Valores mínimos
+            max_values: Valores máximos
+        """
+        import numpy as np
+
+        if len(timestamps) == 0:
+            return
+        # Uma única conversão para as estatísticas e as distribuições
+        min_values = np.asarray(min_values, dtype=np.float64)
+        max_values = np.asarray(max_values, dtype=np.float64)
+        self.samples += len(timestamps)
+        self.min_stats.update_batch(min_values)
+        self.max_stats.update_batch(max_values)
+        self.min_distribution.update_batch(min_values)
+        self.max_distribution.update_batch(max_values)
+        first, last = min(timestamps), max(timestamps)
+        if self.first_time is None or first < self.first_time:
+            self.first_time = first
+        if self.last_time is None or last > self.last_time:
+            self.last_time = last
+
+    def merge(self, other: 'ChannelStats') -> None:
+        """
+        Combina as estatísticas de outro bloco ou arquivo do mesmo canal.
+
+        Args:
+            other: Estatísticas a combinar
+        """
+        self.samples += other.samples
+        self.min_stats.merge(other.min_stats)
+        self.max_stats.merge(other.max_stats)
+        self.min_distribution.merge(other.min_distribution)
+        self.max_distribution.merge(other.max_distribution)
+        self.over_range_count += other.over_range_count
+        for attr, pick in (("first_time", min), ("last_time", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            if theirs is not None:
+                setattr(self, attr, theirs if mine is None else pick(mine, theirs))
+
+    @property
+    def minimum(self) -> Optional[float]:
+        """Menor valor da série Min, ou None se não houver valores válidos"""
+        return self.min_stats.min if self.min_stats.count else None
+
+    @property
+    def maximum(self) -> Optional[float]:
+        """Maior valor da série Max, ou None se não houver valores válidos"""
+        return self.max_stats.max if self.max_stats.count else None
+
+    def to_dict(self) -> Dict:
+        """
+        Converte as estatísticas em dicionário para exibição ou exportação.
+
+        Returns:
+            Dicionário com amostras, extremos, médias, desvios, período e over-range
+        """
+        return {
+            "samples": self.samples,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean_min": self.min_stats.to_dict()["mean"],
+            "mean_max": self.max_stats.to_dict()["mean"],
+            "std_min": self.min_stats.std,
+            "std_max": self.max_stats.std,
+            "first_time": self.first_time,
+            "last_time": self.last_time,
+            "over_range_count": self.over_range_count,
+        }
@@ -0,0 +1,310 @@
+"""
+Conversão em lote de arquivos GTD pela linha de comando.
+
+Exemplos:
+    python -m models.cli Ensaios/ -o saida/ --recursive --format xlsx json
+    python -m models.cli "Ensaios/GHFM_*" -o saida/ --workers 4 --incremental
+    python -m models.cli dados/*.GTD -o saida/ --per-file --format columnar csv
+    python -m models.cli Ensaios/ -o saida/ --format csv --csv-delimiter ";" --csv-decimal ","
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional
+
+from .gtd_processor import OUTPUT_FORMATS, GTDProcessor, convert_gtd_files, find_gtd_files
+
+# Nome padrão do manifesto incremental, gravado no diretório de saída
+MANIFEST_NAME = ".gtd_manifest.json"
+
+
+def collect_inputs(inputs: List[str], recursive: bool = False) -> List[str]:
+    """
+    Expande globs, diretórios e arquivos informados na linha de comando.
+
+    Args:
+        inputs: Caminhos, diretórios ou padrões glob
+        recursive: Se True, percorre os subdiretórios (e habilita ** nos globs)
+
+    Returns:
+        Lista ordenada e sem repetições dos arquivos GTD encontrados
+    """
+    filepaths = set()
+    for pattern in inputs:
+        matches = glob.glob(pattern, recursive=recursive) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isdir(path):
+                filepaths.update(find_gtd_files(path, recursive=recursive))
+            elif os.path.isfile(path) and path.lower().endswith('.gtd'):
+                filepaths.add(path)
+    return sorted(os.path.abspath(path) for path in filepaths)
+
+
+def plan_jobs(filepaths: List[str], output_dir: str, per_file: bool = False) -> List[Tuple[str, List[str]]]:
+    """
+    Agrupa os arquivos em tarefas de conversão. Por padrão, os arquivos de um mesmo
+    diretório formam um único conjunto de dados (como process_gtd_directory); com
+    per_file, cada arquivo gera a sua própria saída. A estrutura de diretórios de
+    entrada é reproduzida no diretório de saída.
+
+    Args:
+        filepaths: Arquivos GTD (caminhos absolutos)
+        output_dir: Diretório de saída
+        per_file: Se True, converte cada arquivo separadamente
+
+    Returns:
+        Lista de (caminho de saída sem extensão, arquivos de entrada)
+    """
+    if not filepaths:
+        return []
+
+    groups = {}
+    for path in filepaths:
+        key = path if per_file else os.path.dirname(path)
+        groups.setdefault(key, []).append(path)
+
+    directories = [os.path.dirname(path) for path in filepaths]
+    root = os.path.commonpath(directories) if len(set(directories)) > 1 else os.path.dirname(directories[0])
+
+    jobs = []
+    for key, files in sorted(groups.items()):
+        if per_file:
+            relative = os.path.relpath(os.path.splitext(key)[0], root)
+        else:
+            relative = os.path.relpath(key, root)
+            relative = os.path.join(relative, os.path.basename(key)) if relative != '.' else os.path.basename(key)
+        jobs.append((os.path.join(output_dir, relative), files))
+    return jobs
+
+
+def _fingerprint(filepaths: List[str]) -> Dict[str, List[int]]:
+    """Tamanho e data de modificação de cada arquivo de entrada"""
+    fingerprint = {}
+    for path in filepaths:
+        stat = os.stat(path)
+        fingerprint[path] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprint
+
+
+def load_manifest(path: str) -> Dict:
+    """Carrega o manifesto incremental (vazio se não existir ou estiver corrompido)"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(f"Aviso: manifesto ilegível, ignorando: {path}")
+        return {}
+
+
+def save_manifest(path: str, manifest: Dict) -> None:
+    """Grava o manifesto incremental de forma atômica"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def is_up_to_date(manifest: Dict, output_base: str, filepaths: List[str], formats: List[str]) -> bool:
+    """
+    Verifica se uma tarefa já foi convertida com as mesmas entradas e formatos.
+
+    Args:
+        manifest: Manifesto incremental carregado
+        output_base: Caminho de saída da tarefa
+        filepaths: Arquivos de entrada da tarefa
+        formats: Formatos de saída pedidos
+
+    Returns:
+        True se a tarefa pode ser pulada
+    """
+    entry = manifest.get(output_base)
+    if not entry or entry.get("inputs") != _fingerprint(filepaths):
+        return False
+    if not set(formats) <= set(entry.get("formats", [])):
+        return False
+    return all(os.path.exists(output_base + OUTPUT_FORMATS[fmt][0]) for fmt in formats)
+
+
+def _run_job(job: Tuple[str, List[str], Tuple[str, ...], str, Optional[str], bool, Optional[Dict]]) -> Dict:
+    """
+    Executa uma tarefa de conversão (função de nível de módulo para o pool de processos).
+
+    Args:
+        job: (saída, arquivos, formatos, engine, intervalo de reamostragem, verbose, opções do CSV)
+
+    Returns:
+        Resumo da conversão, com tempo decorrido e erro (se houver)
+    """
+    output_base, filepaths, formats, engine, resample, verbose, csv_options = job
+    start = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(output_base) or '.', exist_ok=True)
+        if verbose:
+            summary = convert_gtd_files(filepaths, output_base, formats=formats, engine=engine,
+                                            resample=resample, csv_options=csv_options)
+        else:
+            with contextlib.redirect_stdout(io.StringIO()):
+                summary = convert_gtd_files(filepaths, output_base, formats=formats, engine=engine,
+                                            resample=resample, csv_options=csv_options)
+        summary["error"] = None
+    except Exception as e:
+        summary = {"inputs": filepaths, "outputs": [], "rows": 0,
+                   "bytes": sum(os.path.getsize(path) for path in filepaths), "error": repr(e)}
+    summary["output_base"] = output_base
+    summary["elapsed_s"] = time.perf_counter() - start
+    return summary
+
+
+def _format_rate(value: float, unit: str) -> str:
+    """Formata uma taxa com prefixo (k, M)"""
+    for prefix, scale in (("M", 1e6), ("k", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.1f} {prefix}{unit}/s"
+    return f"{value:.0f} {unit}/s"
+
+
+def run_batch(inputs: List[str], output_dir: str, formats: List[str], recursive: bool = False,
+              per_file: bool = False, workers: int = 1, chunk_size: int = 1,
+              engine: str = 'reference', resample: Optional[str] = None, incremental: bool = False,
+              manifest_path: Optional[str] = None, verbose: bool = False,
+              csv_options: Optional[Dict] = None) -> List[Dict]:
+    """
+    Converte em lote os arquivos GTD encontrados nas entradas.
+
+    Args:
+        inputs: Caminhos, diretórios ou padrões glob
+        output_dir: Diretório de saída
+        formats: Formatos de saída (chaves de OUTPUT_FORMATS)
+        recursive: Se True, percorre os subdiretórios
+        per_file: Se True, converte cada arquivo separadamente
+        workers: Quantidade de processos paralelos
+        chunk_size: Tarefas enviadas por vez a cada processo
+        engine: Engine de parsing ('reference' ou 'fast')
+        resample: Intervalo de reamostragem das saídas (ex: "1 min"), ou None para os dados brutos
+        incremental: Se True, pula tarefas cujas entradas não mudaram desde a última execução
+        manifest_path: Caminho do manifesto incremental (padrão: <saída>/.gtd_manifest.json)
+        verbose: Se True, mostra as mensagens do processador
+        csv_options: Opções da exportação CSV (ver GTDProcessor.export_to_csv)
+
+    Returns:
+        Lista com o resumo de cada tarefa executada
+    """
+    filepaths = collect_inputs(inputs, recursive=recursive)
+    if not filepaths:
+        print("Nenhum arquivo GTD encontrado nas entradas informadas.")
+        return []
+
+    output_dir = os.path.abspath(output_dir)
+    jobs = plan_jobs(filepaths, output_dir, per_file=per_file)
+
+    manifest_path = manifest_path or os.path.join(output_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path) if incremental else {}
+    pending = [job for job in jobs if not (incremental and is_up_to_date(manifest, job[0], job[1], formats))]
+    skipped = len(jobs) - len(pending)
+
+    print(f"{len(filepaths)} arquivos GTD em {len(jobs)} tarefas"
+          + (f" ({skipped} sem alterações, puladas)" if skipped else "")
+          + f" | formatos: {', '.join(formats)} | workers: {workers}")
+    if not pending:
+        return []
+
+    tasks = [(output_base, files, tuple(formats), engine, resample, verbose, csv_options)
+             for output_base, files in pending]
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results_iter = executor.map(_run_job, tasks, chunksize=max(1, chunk_size))
+    else:
+        executor = None
+        results_iter = map(_run_job, tasks)
+
+    results = []
+    start = time.perf_counter()
+    total_rows = 0
+    total_bytes = 0
+    try:
+        for done, summary in enumerate(results_iter, start=1):
+            results.append(summary)
+            elapsed = time.perf_counter() - start
+            total_rows += summary["rows"]
+            total_bytes += summary["bytes"]
+            name = os.path.relpath(summary["output_base"], output_dir)
+            if summary["error"]:
+                status = f"ERRO: {summary['error']}"
+            else:
+                status = f"{summary['rows']} amostras em {summary['elapsed_s']:.2f} s"
+                if incremental:
+                    manifest[summary["output_base"]] = {
+                        "inputs": _fingerprint(summary["inputs"]),
+                        "formats": sorted(set(formats) | set(manifest.get(summary["output_base"], {}).get("formats", []))),
+                        "outputs": summary["outputs"],
+                    }
+                    save_manifest(manifest_path, manifest)
+            rate = ""
+            if elapsed > 0:
+                rate = f" | {_format_rate(total_bytes / elapsed, 'B')}, {_format_rate(total_rows / elapsed, ' amostras')}"
+            print(f"[{done}/{len(tasks)}] {name}: {status}{rate}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    failures = sum(1 for summary in results if summary["error"])
+    elapsed = time.perf_counter() - start
+    print(f"Concluído em {elapsed:.2f} s: {len(results) - failures} tarefas convertidas, {failures} com erro.")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(
+        prog="python -m models.cli",
+        description="Converte arquivos GTD do Yokogawa em lote (Excel, JSON, colunar, CSV).")
+    parser.add_argument("inputs", nargs="+", help="Arquivos, diretórios ou padrões glob de entrada")
+    parser.add_argument("-o", "--output", default="temp_data", help="Diretório de saída (padrão: temp_data)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Percorre os subdiretórios")
+    parser.add_argument("-f", "--format", dest="formats", nargs="+", choices=list(OUTPUT_FORMATS),
+                        default=["xlsx", "json"], help="Formatos de saída (padrão: xlsx json)")
+    parser.add_argument("--per-file", action="store_true",
+                        help="Converte cada arquivo separadamente em vez de combinar por diretório")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Processos paralelos (padrão: 1)")
+    parser.add_argument("--chunk-size", type=int, default=1,
+                        help="Tarefas enviadas por vez a cada processo (padrão: 1)")
+    parser.add_argument("--engine", choices=list(GTDProcessor.ENGINES), default="reference",
+                        help="Engine de parsing (padrão: reference)")
+    parser.add_argument("--resample", default=None, metavar="INTERVALO",
+                        help="Reamostra as saídas preservando Min/Max (ex: '1 min', '1 h')")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Pula entradas sem alterações desde a última execução")
+    parser.add_argument("--manifest", default=None,
+                        help=f"Manifesto incremental (padrão: <saída>/{MANIFEST_NAME})")
+    parser.add_argument("--csv-delimiter", default=",", help="Separador de colunas do CSV (padrão: ',')")
+    parser.add_argument("--csv-decimal", default=".", help="Separador decimal do CSV (padrão: '.')")
+    parser.add_argument("--csv-timestamp-format", default="%Y-%m-%d %H:%M:%S",
+                        help="Formato dos timestamps do CSV, no padrão strftime (padrão: '%%Y-%%m-%%d %%H:%%M:%%S')")
+    parser.add_argument("--csv-bom", action="store_true",
+                        help="Grava o CSV com BOM UTF-8 (reconhecido pelo Excel)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostra as mensagens do processador")
+    args = parser.parse_args(argv)
+
+    results = run_batch(args.inputs, args.output, args.formats, recursive=args.recursive,
+                        per_file=args.per_file, workers=args.workers, chunk_size=args.chunk_size,
+                        engine=args.engine, resample=args.resample, incremental=args.incremental,
+                        manifest_path=args.manifest, verbose=args.verbose,
+                        csv_options={"delimiter": args.csv_delimiter, "decimal": args.csv_decimal,
+                                     "timestamp_format": args.csv_timestamp_format,
+                                     "encoding": "utf-8-sig" if args.csv_bom else "utf-8"})
+    return 1 if any(summary["error"] for summary in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+import contextlib
+import glob
+import io
+import math
+import os
+import sys
+import tempfile
+from typing import List, Optional, Sequence
+
+from .gtd_processor import GTDProcessor
+from .gtd_generator import write_gtd_file
+
+
+class ConformanceReport:
+    """
+    Resultado da comparação entre a engine de referência e as engines otimizadas.
+    Cada divergência é registrada como (engine, arquivo(s), descrição).
+    """
+    def __init__(self):
+        self.cases = 0  # Quantidade de comparações executadas
+        self.differences = []  # Lista de (engine, origem, descrição)
+
+    @property
+    def ok(self) -> bool:
+        """True se nenhuma divergência foi encontrada"""
+        return not self.differences
+
+    def __str__(self) -> str:
+        """Resumo legível do relatório"""
+        if self.ok:
+            return f"Conformidade OK: {self.cases} comparações sem divergências."
+        lines = [f"{len(self.differences)} divergências em {self.cases} comparações:"]
+        for engine, source, description in self.differences:
+            lines.append(f"  [{engine}] {source}: {description}")
+        return "\n".join(lines)
+
+
+def _same_value(a, b) -> bool:
+    """Compara dois valores exatamente, considerando NaN igual a NaN"""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b and type(a) is type(b)
+
+
+def _first_mismatch(expected: List, actual: List) -> Optional[int]:
+    """
+    Procura a primeira posição em que duas listas divergem.
+
+    Returns:
+        Índice da primeira divergência, ou None se as listas forem idênticas
+    """
+    for index, (a, b) in enumerate(zip(expected, actual)):
+        if not _same_value(a, b):
+            return index
+    if len(expected) != len(actual):
+        return min(len(expected), len(actual))
+    return None
+
+
+def compare_processors(reference: GTDProcessor, candidate: GTDProcessor) -> List[str]:
+    """
+    Compara exatamente canais, unidades, timestamps, valores, metadados e contagem
+    de linhas inválidas de dois processadores.
+
+    Args:
+        reference: Processador alimentado pela engine de referência
+        candidate: Processador alimentado pela engine a validar
+
+    Returns:
+        Lista de descrições das divergências (vazia se forem idênticos)
+    """
+    differences = []
+
+    if list(reference.channels) != list(candidate.channels):
+        differences.append(f"canais diferentes: {list(reference.channels)} != {list(candidate.channels)}")
+
+    if reference.metadata != candidate.metadata:
+        differences.append("metadados diferentes")
+
+    if reference.metrics.bad_rows != candidate.metrics.bad_rows:
+        differences.append(f"linhas inválidas: {reference.metrics.bad_rows} != {candidate.metrics.bad_rows}")
+    if reference.metrics.bad_values != candidate.metrics.bad_values:
+        differences.append(f"valores inválidos: {reference.metrics.bad_values} != {candidate.metrics.bad_values}")
+
+    for channel_id, expected in reference.channels.items():
+        actual = candidate.channels.get(channel_id)
+        if actual is None:
+            continue
+        if expected.unit != actual.unit:
+            differences.append(f"canal {channel_id!r}: unidade {expected.unit!r} != {actual.unit!r}")
+        if expected.over_range_count != actual.over_range_count:
+            differences.append(f"canal {channel_id!r}: over-range {expected.over_range_count} != {actual.over_range_count}")
+        for field in ("timestamps", "samples_min", "samples_max"):
+            expected_values = list(getattr(expected, field))
+            actual_values = list(getattr(actual, field))
+            index = _first_mismatch(expected_values, actual_values)
+            if index is None:
+                continue
+            if index >= min(len(expected_values), len(actual_values)):
+                detail = f"{len(expected_values)} != {len(actual_values)} amostras"
+            else:
+                detail = f"posição {index}: {expected_values[index]!r} != {actual_values[index]!r}"
+            differences.append(f"canal {channel_id!r} {field}: {detail}")
+
+    return differences
+
+
+def _run_engine(engine: str, filepaths: Sequence[str]) -> GTDProcessor:
+    """Processa os arquivos com uma engine, silenciando as mensagens de progresso"""
+    processor = GTDProcessor(engine=engine)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.process_multiple_files(list(filepaths))
+    return processor
+
+
+def _run_pipeline(filepaths: Sequence[str]) -> GTDProcessor:
+    """Processa os arquivos isoladamente pelo pipeline de upload e combina os resultados"""
+    from .upload_pipeline import UploadPipeline
+
+    files = []
+    for path in filepaths:
+        with open(path, 'rb') as f:
+            files.append((path, f.read()))
+    with contextlib.redirect_stdout(io.StringIO()):
+        return UploadPipeline(files, use_processes=False).run()
+
+
+def check_conformance(filepaths: Sequence[str],
+                      engines: Optional[Sequence[str]] = None,
+                      reference: str = 'reference',
+                      merged: bool = True) -> ConformanceReport:
+    """
+    Executa a engine de referência e as engines otimizadas sobre um corpus de arquivos
+    GTD e compara os resultados exatamente.
+
+    Args:
+        filepaths: Arquivos GTD do corpus
+        engines: Engines a validar (padrão: todas exceto a referência)
+        reference: Engine usada como referência
+        merged: Se True, também compara o processamento de todos os arquivos juntos,
+            inclusive pelo pipeline de upload (arquivos processados isoladamente e combinados)
+
+    Returns:
+        Um ConformanceReport com as divergências encontradas
+    """
+    if engines is None:
+        engines = [engine for engine in GTDProcessor.ENGINES if engine != reference]
+
+    groups = [[path] for path in filepaths]
+    if merged and len(filepaths) > 1:
+        groups.append(list(filepaths))
+
+    report = ConformanceReport()
+    for group in groups:
+        source = os.path.basename(group[0]) if len(group) == 1 else f"{len(group)} arquivos combinados"
+        expected = _run_engine(reference, group)
+        for engine in engines:
+            report.cases += 1
+            try:
+                actual = _run_engine(engine, group)
+            except Exception as e:
+                report.differences.append((engine, source, f"exceção: {e!r}"))
+                continue
+            for description in compare_processors(expected, actual):
+                report.differences.append((engine, source, description))
+        if len(group) > 1:
+            report.cases += 1
+            for description in compare_processors(expected, _run_pipeline(group)):
+                report.differences.append(("pipeline", source, description))
+    return report
+
+
+def build_corpus(directory: str, include_real: bool = True) -> List[str]:
+    """
+    Gera o corpus de casos-limite do formato GTD e o combina com os arquivos reais
+    de temp_data/.
+
+    Casos cobertos: tags com caracteres especiais (normalização do channel_id), linhas
+    "Ch Id" vazias, ausência da linha "Tag", arquivos só com Min ou só com Max, células
+    vazias, timestamps corrompidos, timestamps repetidos e sentinelas de over-range.
+
+    Args:
+        directory: Diretório onde os arquivos sintéticos serão gravados
+        include_real: Se True, inclui os arquivos .GTD de temp_data/
+
+    Returns:
+        Lista com os caminhos de todos os arquivos do corpus
+    """
+    cases = {
+        "tags_especiais": dict(n_channels=6, tags=["mancal D1", "mancal (D2)", "  ambiente  ",
+                                                   "T#1/A", "água", "___"]),
+        "sem_tag": dict(n_channels=12, tag_row=False),
+        "tag_vazia": dict(n_channels=14, tags=None),
+        "so_min": dict(n_channels=4, kinds=("Min",)),
+        "so_max": dict(n_channels=4, kinds=("Max",)),
+        "max_min_invertido": dict(n_channels=4, kinds=("Max", "Min")),
+        "celulas_vazias": dict(n_channels=8, blank_rate=0.1),
+        "linhas_invalidas": dict(n_channels=8, bad_rows=5),
+        "timestamps_repetidos": dict(n_channels=8, duplicate_rows=3),
+        "over_range": dict(n_channels=8, over_range_rate=0.01, gaps=3),
+        "intervalo_minutos": dict(n_channels=32, interval=(2, "min"), tags=True),
+    }
+    filepaths = []
+    for index, (name, options) in enumerate(cases.items()):
+        options.setdefault("n_rows", 200)
+        filepaths.append(write_gtd_file(os.path.join(directory, f"{name}.GTD"), seed=index, **options))
+
+    if include_real:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        filepaths += sorted(glob.glob(os.path.join(project_root, "temp_data", "*.GTD")))
+    return filepaths
+
+
+if __name__ == "__main__":
+    # Valida as engines otimizadas sobre o corpus padrão ou sobre os arquivos informados
+    if len(sys.argv) > 1:
+        result = check_conformance(sys.argv[1:])
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = check_conformance(build_corpus(temp_dir))
+    print(result)
+    sys.exit(0 if result.ok else 1)
@@ -0,0 +1,284 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .recorders import align_series, common_grid
+from .resample import parse_interval, resample_series
+
+# Séries analisadas: mínimos, máximos ou o ponto médio (Min + Max) / 2
+SERIES = ("min", "max", "mid")
+
+# Fração mínima de amostras sobrepostas para que um atraso seja considerado
+MIN_OVERLAP = 0.5
+
+
+def channel_matrix(processor, channel_ids: Optional[List] = None, interval=None, start=None, end=None,
+                   series: str = "mid") -> Tuple[np.ndarray, List, np.ndarray]:
+    """
+    Matriz alinhada instantes x canais em um eixo regular, base das análises entre canais.
+    Sem intervalo, os canais são interpolados no eixo do registrador mais lento; com
+    intervalo, cada canal é reamostrado pela média de cada bucket.
+
+    Args:
+        processor: GTDProcessor com os dados
+        channel_ids: Canais a incluir (padrão: todos com amostras)
+        interval: Passo do eixo (reamostragem por média), ou None
+        start: Início da janela de tempo, ou None
+        end: Fim da janela de tempo, ou None
+        series: Série analisada: 'min', 'max' ou 'mid'
+
+    Returns:
+        Tupla (eixo datetime64[us], IDs dos canais, matriz float64 instantes x canais com NaN)
+    """
+    if series not in SERIES:
+        raise ValueError(f"Série desconhecida: {series}. Use uma de {SERIES}")
+    low = None if start is None else np.datetime64(start, 'us')
+    high = None if end is None else np.datetime64(end, 'us')
+
+    arrays = {}
+    for channel_id, (timestamps, mins, maxs) in processor.channel_arrays(channel_ids).items():
+        keep = np.ones(len(timestamps), dtype=bool)
+        if low is not None:
+            keep &= timestamps >= low
+        if high is not None:
+            keep &= timestamps <= high
+        if keep.any():
+            arrays[channel_id] = (timestamps[keep], mins[keep], maxs[keep])
+    if not arrays:
+        return np.empty(0, dtype='datetime64[us]'), [], np.empty((0, 0))
+
+    if interval is not None:
+        step = parse_interval(interval)
+        buckets = {}
+        for channel_id, (timestamps, mins, maxs) in arrays.items():
+            result = resample_series(timestamps, mins, maxs, step, agg=("mean",))
+            buckets[channel_id] = (result["time"], result["mean_min"], result["mean_max"])
+        arrays = buckets
+    grid = common_grid(arrays, interval=interval, start=start, end=end)
+
+    ids = list(arrays)
+    matrix = np.full((len(grid), len(ids)), np.nan)
+    for column, channel_id in enumerate(ids):
+        timestamps, mins, maxs = arrays[channel_id]
+        if interval is not None:
+            # Buckets já estão no eixo (múltiplos do intervalo)
+            positions = np.searchsorted(grid, timestamps)
+            inside = (positions < len(grid))
+            inside[inside] &= grid[positions[inside]] == timestamps[inside]
+            aligned_mins = np.full(len(grid), np.nan)
+            aligned_maxs = np.full(len(grid), np.nan)
+            aligned_mins[positions[inside]] = mins[inside]
+            aligned_maxs[positions[inside]] = maxs[inside]
+        else:
+            aligned_mins, aligned_maxs = align_series(timestamps, mins, maxs, grid, method="linear")
+        matrix[:, column] = {"min": aligned_mins, "max": aligned_maxs,
+                             "mid": (aligned_mins + aligned_maxs) / 2}[series]
+    return grid, ids, matrix
+
+
+def correlation_matrix(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Correlação de Pearson entre todas as colunas, usando em cada par apenas os instantes
+    em que ambas têm dados (como DataFrame.corr), calculada com produtos de matrizes
+    sobre as colunas mascaradas em vez de um laço por par.
+
+    Args:
+        matrix: Matriz instantes x canais (NaN onde não há dados)
+
+    Returns:
+        Tupla (correlações C x C, amostras em comum C x C)
+    """
+    present = (~np.isnan(matrix)).astype(np.float64)
+    values = np.where(present > 0, matrix, 0.0)
+    # Centraliza cada coluna para reduzir o erro de arredondamento das somas
+    counts = present.sum(axis=0)
+    means = np.divide(values.sum(axis=0), counts, out=np.zeros(len(counts)), where=counts > 0)
+    values = (values - means) * present
+
+    pairs = present.T @ present  # Amostras em comum de cada par
+    sums = values.T @ present  # [i, j]: soma de i onde j também tem dados
+    squares = (values ** 2).T @ present
+    products = values.T @ values
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = products - sums * sums.T / pairs
+        variance_i = squares - sums ** 2 / pairs
+        variance_j = variance_i.T
+        correlation = covariance / np.sqrt(variance_i * variance_j)
+    correlation[(pairs < 2) | ~np.isfinite(correlation)] = np.nan
+    return np.clip(correlation, -1.0, 1.0), pairs.astype(np.int64)
+
+
+def _fft_length(minimum: int) -> int:
+    """Menor tamanho >= minimum da forma 2^a 3^b 5^c, rápido para a FFT"""
+    best = 1 << int(np.ceil(np.log2(max(minimum, 1))))
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            size = power35 * (1 << max(0, int(np.ceil(np.log2(minimum / power35)))))
+            best = min(best, size) if size >= minimum else best
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def lag_matrix(matrix: np.ndarray, max_lag: Optional[int] = None,
+               min_overlap: float = MIN_OVERLAP) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Atraso de maior correlação entre todas as colunas, pela correlação cruzada via FFT.
+    As colunas são padronizadas e os NaN viram zero; a correlação de cada atraso é
+    dividida pela quantidade de amostras sobrepostas (também obtida por FFT das
+    máscaras). As transformadas são calculadas uma única vez; cada canal de referência
+    é comparado a todos os demais em uma única operação sobre a matriz de espectros.
+
+    Um atraso positivo em [i, j] significa que o canal j responde depois do canal i.
+
+    Args:
+        matrix: Matriz instantes x canais em eixo regular (NaN onde não há dados)
+        max_lag: Maior atraso procurado, em amostras (padrão: um quarto do eixo)
+        min_overlap: Fração mínima de amostras sobrepostas para que um atraso valha
+
+    Returns:
+        Tupla (atrasos em amostras C x C, correlação no atraso C x C)
+    """
+    samples, count = matrix.shape
+    lags = np.zeros((count, count), dtype=np.int64)
+    peaks = np.full((count, count), np.nan)
+    if samples < 2 or not count:
+        return lags, peaks
+    max_lag = samples // 4 if max_lag is None else min(int(max_lag), samples - 1)
+
+    present = ~np.isnan(matrix)
+    counts = present.sum(axis=0)
+    means = np.divide(np.where(present, matrix, 0.0).sum(axis=0), counts, out=np.zeros(count), where=counts > 0)
+    centered = np.where(present, matrix - means, 0.0)
+    stds = np.sqrt(np.divide((centered ** 2).sum(axis=0), counts, out=np.zeros(count), where=counts > 0))
+    standardized = np.divide(centered, stds, out=np.zeros_like(centered), where=stds > 0)
+
+    size = _fft_length(samples + max_lag)  # Preenchimento evita a correlação circular nos atrasos pedidos
+    # Canais nas linhas: as transformadas percorrem memória contígua
+    spectra = np.fft.rfft(standardized.T, n=size, axis=1)
+    # Atrasos -max_lag..max_lag nas posições da correlação circular
+    shifts = np.arange(-max_lag, max_lag + 1)
+    positions = shifts % size
+
+    # Amostras sobrepostas em cada atraso: uma única conta quando todos os canais têm
+    # as mesmas posições com dados (caso comum), senão uma por canal de referência
+    shared_mask = bool(np.all(present == present[:, :1]))
+    masks = np.fft.rfft((present[:, :1] if shared_mask else present).T.astype(np.float64), n=size, axis=1)
+    if shared_mask:
+        shared_overlap = np.rint(np.fft.irfft(np.conj(masks[0]) * masks[0], n=size)[positions])[:, None]
+
+    # Cada par é calculado uma vez (j >= i); o par inverso tem o atraso com sinal trocado
+    for i in range(count):
+        if stds[i] == 0:
+            continue
+        others = slice(i, count)
+        products = np.fft.irfft(np.conj(spectra[i]) * spectra[others], n=size, axis=1)[:, positions].T
+        if shared_mask:
+            overlap = shared_overlap
+        else:
+            overlap = np.rint(np.fft.irfft(np.conj(masks[i]) * masks[others], n=size, axis=1)[:, positions].T)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = products / overlap
+        required = np.maximum(2, min_overlap * np.minimum(counts[i], counts[others]))
+        correlation[np.broadcast_to(overlap, correlation.shape) < required] = np.nan
+        correlation[:, stds[others] == 0] = np.nan
+        valid = ~np.all(np.isnan(correlation), axis=0)
+        best = np.argmax(np.where(np.isnan(correlation), -np.inf, correlation), axis=0)
+        columns = np.flatnonzero(valid) + i
+        lags[i, columns] = shifts[best[valid]]
+        lags[columns, i] = -shifts[best[valid]]
+        peaks[i, columns] = peaks[columns, i] = np.clip(correlation[best[valid], np.flatnonzero(valid)], -1.0, 1.0)
+    return lags, peaks
+
+
+class CorrelationResult:
+    """
+    Correlações e atrasos entre todos os pares de canais de uma análise (ver
+    GTDProcessor.correlation).
+    """
+    def __init__(self, channel_ids: List, step: np.timedelta64, samples: int, correlation: np.ndarray,
+                 overlap: np.ndarray, lags: np.ndarray, lag_correlation: np.ndarray):
+        self.channel_ids = channel_ids
+        self.step = step  # Passo do eixo analisado
+        self.samples = samples  # Instantes do eixo
+        self.correlation = correlation  # Pearson sem atraso (C x C)
+        self.overlap = overlap  # Amostras em comum de cada par (C x C)
+        self.lag_samples = lags  # Atraso de maior correlação, em amostras (C x C)
+        self.lag_correlation = lag_correlation  # Correlação no atraso (C x C)
+
+    @property
+    def lag_s(self) -> np.ndarray:
+        """Atrasos em segundos (positivo: o canal da coluna responde depois do da linha)"""
+        return self.lag_samples * (self.step / np.timedelta64(1, 's'))
+
+    @property
+    def labels(self) -> List[str]:
+        """Rótulos Ch{id} dos canais"""
+        return [f"Ch{channel_id}" for channel_id in self.channel_ids]
+
+    def correlation_frame(self) -> 'pandas.DataFrame':
+        """Matriz de correlação como DataFrame rotulado"""
+        import pandas as pd
+
+        return pd.DataFrame(self.correlation, index=self.labels, columns=self.labels)
+
+    def lag_frame(self) -> 'pandas.DataFrame':
+        """Matriz de atrasos (s) como DataFrame rotulado"""
+        import pandas as pd
+
+        return pd.DataFrame(self.lag_s, index=self.labels, columns=self.labels)
+
+    def pairs(self) -> 'pandas.DataFrame':
+        """
+        Um par de canais por linha (i < j), ordenado pela correlação absoluta.
+
+        Returns:
+            DataFrame com canais, correlação, atraso (s), correlação no atraso e amostras em comum
+        """
+        import pandas as pd
+
+        first, second = np.triu_indices(len(self.channel_ids), k=1)
+        labels = np.array(self.labels, dtype=object)
+        table = pd.DataFrame({
+            "Canal A": labels[first],
+            "Canal B": labels[second],
+            "Correlação": self.correlation[first, second],
+            "Atraso (s)": self.lag_s[first, second],
+            "Correlação no atraso": self.lag_correlation[first, second],
+            "Amostras": self.overlap[first, second],
+        })
+        order = np.argsort(-np.abs(table["Correlação"].to_numpy()), kind='stable')
+        return table.iloc[order].reset_index(drop=True)
+
+
+def analyze(processor, channel_ids: Optional[List] = None, interval=None, start=None, end=None,
+            series: str = "mid", max_lag=None) -> CorrelationResult:
+    """
+    Correlação e atraso entre todos os pares de canais em uma passada vetorizada sobre
+    a matriz alinhada (ver channel_matrix, correlation_matrix e lag_matrix).
+
+    Args:
+        processor: GTDProcessor com os dados
+        channel_ids: Canais a incluir (padrão: todos com amostras)
+        interval: Reamostragem por média antes da análise (ex: "1 min"), ou None
+        start: Início da janela de tempo, ou None
+        end: Fim da janela de tempo, ou None
+        series: Série analisada: 'min', 'max' ou 'mid'
+        max_lag: Maior atraso procurado (ex: "30 min"; padrão: um quarto da janela)
+
+    Returns:
+        Um CorrelationResult
+    """
+    grid, ids, matrix = channel_matrix(processor, channel_ids, interval=interval, start=start, end=end,
+                                       series=series)
+    step = grid[1] - grid[0] if len(grid) > 1 else (parse_interval(interval) if interval is not None
+                                                     else np.timedelta64(1, 's'))
+    step = step.astype('timedelta64[us]')
+    lag_samples = None
+    if max_lag is not None:
+        lag_samples = int(parse_interval(max_lag).astype(np.int64) // step.astype(np.int64))
+    correlation, overlap = correlation_matrix(matrix)
+    lags, peaks = lag_matrix(matrix, max_lag=lag_samples)
+    return CorrelationResult(ids, step, len(grid), correlation, overlap, lags, peaks)
@@ -0,0 +1,314 @@
+import csv
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .encoding import MAX_DECIMALS
+from .resample import bucket_ids, parse_interval
+
+# Formato padrão dos timestamps (o mesmo do DataFrame.to_csv anterior)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Códigos de strftime formatados de forma vetorizada: código -> largura
+_TIME_CODES = {"%Y": 4, "%m": 2, "%d": 2, "%H": 2, "%M": 2, "%S": 2, "%f": 6}
+
+# Byte de preenchimento das matrizes de texto (removido ao juntar as linhas)
+_PAD = 0
+
+# Maior quantidade de dígitos formatada por tabela (10^6 entradas)
+_TABLE_WIDTH = 6
+
+
+def csv_table(processor) -> Optional[Tuple[np.ndarray, List[str], np.ndarray]]:
+    """
+    Dados exportados em CSV, com as mesmas linhas e colunas de GTDProcessor.to_dataframe:
+    os timestamps do canal com mais amostras e as colunas Min/Max de todos os canais
+    com o mesmo número de amostras.
+
+    Args:
+        processor: GTDProcessor com os dados
+
+    Returns:
+        Tupla (timestamps datetime64[us], nomes das colunas de valores, matriz linhas x
+        colunas), ou None se não houver canais com amostras
+    """
+    counts = {channel_id: len(channel.timestamps) for channel_id, channel in processor.channels.items()}
+    if not counts or max(counts.values()) == 0:
+        return None
+    size = max(counts.values())
+    ids = [channel_id for channel_id, count in counts.items() if count == size]
+
+    arrays = processor.channel_arrays(ids)
+    names, columns = [], []
+    for channel_id in ids:
+        unit = processor.channels[channel_id].unit
+        _, mins, maxs = arrays[channel_id]
+        names += [f"Ch{channel_id}_Min_{unit}", f"Ch{channel_id}_Max_{unit}"]
+        columns += [mins, maxs]
+    return arrays[ids[0]][0], names, np.column_stack(columns)
+
+
+def _digits(values: np.ndarray, width: int) -> np.ndarray:
+    """Dígitos ASCII de inteiros não negativos, com largura fixa (zeros à esquerda)"""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return ((values[..., None] // powers) % 10 + ord('0')).astype(np.uint8)
+
+
+@lru_cache(maxsize=16)
+def _digit_table(width: int, leading: bool) -> np.ndarray:
+    """
+    Tabela com os dígitos de 0 a 10^width - 1, sem os zeros à esquerda (leading) ou à
+    direita, mantendo ao menos um dígito
+    """
+    table = _digits(np.arange(10 ** width, dtype=np.int64), width)
+    zeros = table == ord('0')
+    if leading:
+        padding = np.logical_and.accumulate(zeros, axis=1)
+        padding[:, -1] = False
+    else:
+        padding = np.logical_and.accumulate(zeros[:, ::-1], axis=1)[:, ::-1]
+        padding[:, 0] = False
+    table[padding] = _PAD
+    return table
+
+
+def _digit_cells(values: np.ndarray, width: int, leading: bool) -> np.ndarray:
+    """Dígitos de inteiros não negativos sem os zeros à esquerda ou à direita (ver _digit_table)"""
+    if width <= _TABLE_WIDTH:
+        return _digit_table(width, leading)[values]
+    digits = _digits(values, width)
+    zeros = digits == ord('0')
+    if leading:
+        padding = np.logical_and.accumulate(zeros, axis=-1)
+        padding[..., -1] = False
+    else:
+        padding = np.logical_and.accumulate(zeros[..., ::-1], axis=-1)[..., ::-1]
+        padding[..., 0] = False
+    digits[padding] = _PAD
+    return digits
+
+
+def _text_matrix(strings: np.ndarray) -> np.ndarray:
+    """Converte um array de textos em matriz de bytes (linhas x largura), preenchida com _PAD"""
+    encoded = np.char.encode(strings.astype(str), 'utf-8')
+    return encoded.view(np.uint8).reshape(len(encoded), encoded.dtype.itemsize)
+
+
+def format_timestamps(times: np.ndarray, timestamp_format: str = TIMESTAMP_FORMAT) -> np.ndarray:
+    """
+    Formata timestamps como matriz de bytes. Os códigos %Y %m %d %H %M %S %f e os
+    textos literais são montados de forma vetorizada; outros códigos usam strftime.
+
+    Args:
+        times: Timestamps datetime64
+        timestamp_format: Formato no padrão strftime
+
+    Returns:
+        Matriz uint8 (linhas x largura)
+    """
+    times = np.asarray(times, dtype='datetime64[us]')
+    tokens = re.findall(r"%.|[^%]+", timestamp_format)
+    if any(token.startswith('%') and token not in _TIME_CODES for token in tokens):
+        import pandas as pd
+        return _text_matrix(np.asarray(pd.DatetimeIndex(times).strftime(timestamp_format), dtype=str))
+
+    days = times.astype('datetime64[D]')
+    months = times.astype('datetime64[M]')
+    within_day = (times - days).astype(np.int64)
+    fields = {
+        "%Y": times.astype('datetime64[Y]').astype(np.int64) + 1970,
+        "%m": months.astype(np.int64) % 12 + 1,
+        "%d": (days - months.astype('datetime64[D]')).astype(np.int64) + 1,
+        "%H": within_day // 3_600_000_000,
+        "%M": within_day // 60_000_000 % 60,
+        "%S": within_day // 1_000_000 % 60,
+        "%f": within_day % 1_000_000,
+    }
+    parts = []
+    for token in tokens:
+        if token in _TIME_CODES:
+            parts.append(_digits(fields[token], _TIME_CODES[token]))
+        else:
+            literal = np.frombuffer(token.encode('utf-8'), dtype=np.uint8)
+            parts.append(np.broadcast_to(literal, (len(times), len(literal))))
+    return np.hstack(parts) if parts else np.zeros((len(times), 0), dtype=np.uint8)
+
+
+def _column_decimals(values: np.ndarray, max_decimals: int = MAX_DECIMALS) -> np.ndarray:
+    """
+    Menor quantidade de casas decimais exata de cada coluna (ver encoding.detect_decimals),
+    testada sobre a matriz inteira; -1 onde nenhuma escala é exata.
+    """
+    decimals = np.full(values.shape[1], -1)
+    missing = np.isnan(values)
+    for candidate in range(max_decimals + 1):
+        scale = 10.0 ** candidate
+        with np.errstate(invalid='ignore', over='ignore'):
+            exact = ((np.round(values * scale) / scale == values) | missing).all(axis=0)
+        decimals[(decimals < 0) & exact] = candidate
+    return decimals
+
+
+def _text_cells(values: np.ndarray, decimal: str) -> np.ndarray:
+    """Células de uma coluna pela representação padrão do float (colunas sem escala exata)"""
+    text = values.astype(str)
+    text[np.isnan(values)] = ''
+    if decimal != '.':
+        text = np.char.replace(text, '.', decimal)
+    return _text_matrix(text)
+
+
+def format_numbers(values: np.ndarray, decimal: str = ".", delimiter: str = ",") -> np.ndarray:
+    """
+    Formata uma matriz de valores como matriz de bytes, cada célula precedida pelo
+    separador de colunas, sem zeros à direita (33.1, 100.0, -0.5) e com NaN como célula
+    vazia. As colunas com casas decimais exatas (as leituras dos registradores) são
+    formatadas juntas como inteiros escalados, com os dígitos tirados de tabelas; as
+    demais usam a representação padrão do float.
+
+    Args:
+        values: Matriz de valores float64 (linhas x colunas)
+        decimal: Separador decimal
+        delimiter: Separador de colunas
+
+    Returns:
+        Matriz uint8 (linhas x largura)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rows, count = values.shape
+    decimals = _column_decimals(values)
+    with np.errstate(invalid='ignore'):
+        magnitude = np.nanmax(np.abs(np.where(np.isfinite(values), values, np.nan)), axis=0,
+                              initial=0.0) if rows else np.zeros(count)
+    fixed = (decimals >= 0) & (magnitude * 10.0 ** np.maximum(decimals, 1) < 1e15)
+    # Infinitos só são representados pela formatação padrão
+    fixed &= ~np.isinf(values).any(axis=0)
+
+    formatted = None
+    if fixed.any():
+        block = values if fixed.all() else values[:, fixed]
+        missing = np.isnan(block)
+        places = max(1, int(decimals[fixed].max()))
+        scale = 10 ** places
+        scaled = np.round(np.abs(np.where(missing, 0.0, block)) * scale).astype(np.int64)
+        integer, fraction = scaled // scale, scaled % scale
+
+        # Parte inteira sem zeros à esquerda e fracionária sem zeros à direita (ao menos um dígito cada)
+        width = len(str(int(integer.max()))) if integer.size else 1
+        integer_digits = _digit_cells(integer, width, leading=True)
+        fraction_digits = _digit_cells(fraction, places, leading=False)
+
+        sign = np.where(np.signbit(block) & ~missing, ord('-'), _PAD).astype(np.uint8)[..., None]
+        formatted = np.concatenate([np.full(block.shape + (1,), ord(delimiter), dtype=np.uint8), sign,
+                                    integer_digits, np.full(block.shape + (1,), ord(decimal), dtype=np.uint8),
+                                    fraction_digits], axis=-1)
+        formatted[missing, 1:] = _PAD
+        if fixed.all():
+            return formatted.reshape(rows, -1)
+
+    # Colunas mistas: junta as células na ordem original
+    separator = np.full((rows, 1), ord(delimiter), dtype=np.uint8)
+    positions = np.cumsum(fixed) - 1
+    parts = []
+    for column in range(count):
+        if fixed[column]:
+            parts.append(formatted[:, positions[column]])
+        else:
+            parts += [separator, _text_cells(values[:, column], decimal)]
+    return np.hstack(parts) if parts else np.zeros((rows, 0), dtype=np.uint8)
+
+
+def format_chunk(times: np.ndarray, values: np.ndarray, timestamp_format: str = TIMESTAMP_FORMAT,
+                 delimiter: str = ",", decimal: str = ".") -> bytes:
+    """
+    Formata um bloco de linhas do CSV (sem cabeçalho), montando todas as células como
+    matrizes de bytes e removendo o preenchimento de uma só vez.
+
+    Args:
+        times: Timestamps das linhas
+        values: Matriz de valores (linhas x colunas)
+        timestamp_format: Formato dos timestamps (strftime)
+        delimiter: Separador de colunas (um caractere)
+        decimal: Separador decimal
+
+    Returns:
+        As linhas em UTF-8, cada uma terminada por '\\n'
+    """
+    matrix = np.hstack([format_timestamps(times, timestamp_format), format_numbers(values, decimal, delimiter),
+                        np.full((len(times), 1), ord('\n'), dtype=np.uint8)])
+    return matrix[matrix != _PAD].tobytes()
+
+
+def _format_job(job: Tuple) -> bytes:
+    """Formata um bloco (função de nível de módulo para o pool de processos)"""
+    return format_chunk(*job)
+
+
+def write_csv(processor, output_filepath: str, timestamp_format: str = TIMESTAMP_FORMAT,
+              delimiter: str = ",", decimal: str = ".", chunk_rows: int = 20000,
+              workers: Optional[int] = None, partition=None, encoding: str = "utf-8") -> List[str]:
+    """
+    Exporta os dados em CSV formatando as linhas em blocos vetorizados, opcionalmente
+    em processos paralelos; os blocos são gravados em ordem.
+
+    Args:
+        processor: GTDProcessor com os dados
+        output_filepath: Caminho do arquivo .csv
+        timestamp_format: Formato dos timestamps (strftime)
+        delimiter: Separador de colunas (ex: ';' para o Excel em português)
+        decimal: Separador decimal (ex: ',')
+        chunk_rows: Linhas por bloco
+        workers: Processos de formatação (None ou 1 formata no processo atual)
+        partition: Se informado (ex: "1 d"), grava um arquivo por intervalo de tempo,
+            com o início do intervalo no nome (arquivo_AAAAMMDD_HHMMSS.csv)
+        encoding: 'utf-8' ou 'utf-8-sig' (com BOM, reconhecido pelo Excel)
+
+    Returns:
+        Lista dos arquivos gravados
+    """
+    if len(delimiter) != 1 or len(decimal) != 1 or not (delimiter + decimal).isascii():
+        raise ValueError("O separador de colunas e o separador decimal devem ter um caractere ASCII")
+    if delimiter == decimal:
+        raise ValueError(f"O separador de colunas e o decimal não podem ser iguais: {delimiter!r}")
+    if encoding.lower().replace('_', '-') not in ("utf-8", "utf8", "utf-8-sig"):
+        raise ValueError(f"Codificação não suportada no CSV: {encoding} (use 'utf-8' ou 'utf-8-sig')")
+
+    table = csv_table(processor)
+    if table is None:
+        return []
+    times, names, values = table
+
+    header = io.StringIO()
+    csv.writer(header, delimiter=delimiter, lineterminator='\n').writerow(['Timestamp'] + names)
+    header = header.getvalue().encode(encoding)
+
+    # Arquivos de saída: um único, ou um por intervalo de tempo
+    if partition is None:
+        targets = [(output_filepath, 0, len(times))]
+    else:
+        buckets = bucket_ids(times, parse_interval(partition))
+        bounds = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1], [True]))).tolist()
+        root, extension = os.path.splitext(output_filepath)
+        targets = [(f"{root}_{times[start].item():%Y%m%d_%H%M%S}{extension}", start, end)
+                   for start, end in zip(bounds[:-1], bounds[1:])]
+
+    jobs = [(times[low:min(low + chunk_rows, end)], values[low:min(low + chunk_rows, end)],
+             timestamp_format, delimiter, decimal)
+            for _, start, end in targets for low in range(start, end, chunk_rows)]
+    executor = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        chunks = executor.map(_format_job, jobs) if executor else map(_format_job, jobs)
+        for path, start, end in targets:
+            with open(path, 'wb') as f:
+                f.write(header)
+                for _ in range(start, end, chunk_rows):
+                    f.write(next(chunks))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return [path for path, _, _ in targets]
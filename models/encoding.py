@@ -0,0 +1,148 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+# Modos de codificação aceitos por encode_values
+ENCODINGS = ("fixed", "float32", "float64")
+
+# Maior quantidade de casas decimais testada na detecção da escala
+MAX_DECIMALS = 6
+
+
+def detect_decimals(values: np.ndarray, max_decimals: int = MAX_DECIMALS) -> Optional[int]:
+    """
+    Detecta a menor quantidade de casas decimais que representa exatamente todos os
+    valores finitos (ex: 1 para leituras como 33.1 e 139.9), testando cada escala de
+    forma vetorizada.
+
+    Args:
+        values: Valores float64 (NaN é ignorado)
+        max_decimals: Maior quantidade de casas testada
+
+    Returns:
+        A quantidade de casas decimais, ou None se nenhuma escala for exata
+    """
+    finite = values[np.isfinite(values)]
+    for decimals in range(max_decimals + 1):
+        scale = 10.0 ** decimals
+        if np.array_equal(np.round(finite * scale) / scale, finite):
+            return decimals
+    return None
+
+
+class EncodedValues:
+    """
+    Série de valores em representação compacta:
+
+        int16/int32: inteiros escalados (valor * 10^decimals), com NaN gravado como o
+            menor inteiro do tipo (séries com -0.0 não usam inteiros, que perderiam o sinal)
+        float32: valores em precisão simples, arredondados de volta para `decimals`
+            casas na decodificação
+        float64: os valores originais, sem compactação (fallback)
+
+    Todas as representações voltam exatamente aos valores originais em decode().
+    """
+    def __init__(self, data: np.ndarray, decimals: Optional[int] = None):
+        """
+        Args:
+            data: Array codificado (int16, int32, float32 ou float64)
+            decimals: Casas decimais da escala (None para float64)
+        """
+        self.data = data
+        self.decimals = decimals
+
+    @property
+    def dtype(self) -> str:
+        """Nome do tipo da representação"""
+        return self.data.dtype.name
+
+    @property
+    def nbytes(self) -> int:
+        """Tamanho dos dados codificados em bytes"""
+        return self.data.nbytes
+
+    def decode(self) -> np.ndarray:
+        """
+        Reconstrói os valores originais (float64), de forma vetorizada.
+
+        Returns:
+            Array float64 idêntico ao codificado
+        """
+        if self.data.dtype.kind == 'i':
+            missing = self.data == np.iinfo(self.data.dtype).min
+            values = self.data / 10.0 ** self.decimals
+            values[missing] = np.nan
+            return values
+        values = self.data.astype(np.float64)
+        if self.data.dtype == np.float32:
+            values = np.round(values, self.decimals)
+        return values
+
+    def params(self) -> Dict:
+        """Parâmetros da codificação (sem os dados), para manifestos"""
+        return {"dtype": self.dtype, "decimals": self.decimals}
+
+
+def _fixed_point(values: np.ndarray, decimals: int) -> Optional[np.ndarray]:
+    """Converte para o menor tipo inteiro que comporta os valores escalados, ou None"""
+    finite = np.isfinite(values)
+    if not finite.all() and not np.isnan(values[~finite]).all():
+        return None  # Infinitos não têm representação
+    if np.any(np.signbit(values) & (values == 0)):
+        return None  # Inteiros não distinguem -0.0 de 0.0 (o CSV escreve "-0.0")
+    scaled = np.round(np.where(finite, values, 0.0) * 10.0 ** decimals)
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        # O menor inteiro do tipo fica reservado para NaN
+        if not scaled.size or (scaled.min() > info.min and scaled.max() <= info.max):
+            data = scaled.astype(dtype)
+            data[~finite] = info.min
+            return data
+    return None
+
+
+def encode_values(values, mode: str = "fixed") -> EncodedValues:
+    """
+    Codifica uma série de valores na representação mais compacta do modo pedido que
+    volte exatamente aos valores originais; quando a verificação de precisão falha,
+    os valores são mantidos em float64.
+
+    Args:
+        values: Valores (lista ou array, NaN permitido)
+        mode: 'fixed' (inteiros escalados, int16 ou int32), 'float32' ou 'float64'
+
+    Returns:
+        Um EncodedValues
+    """
+    if mode not in ENCODINGS:
+        raise ValueError(f"Codificação desconhecida: {mode}. Use uma de {ENCODINGS}")
+    values = np.asarray(values, dtype=np.float64)
+    if mode == "float64":
+        return EncodedValues(values)
+
+    decimals = detect_decimals(values)
+    if decimals is not None:
+        if mode == "fixed":
+            data = _fixed_point(values, decimals)
+            if data is not None:
+                return EncodedValues(data, decimals)
+        else:
+            data = values.astype(np.float32)
+            encoded = EncodedValues(data, decimals)
+            if np.array_equal(encoded.decode(), values, equal_nan=True):
+                return encoded
+    return EncodedValues(values)
+
+
+def decode_values(data: np.ndarray, params: Dict) -> np.ndarray:
+    """
+    Decodifica valores gravados com os parâmetros de EncodedValues.params().
+
+    Args:
+        data: Array codificado
+        params: Parâmetros da codificação
+
+    Returns:
+        Array float64 com os valores originais
+    """
+    return EncodedValues(np.asarray(data, dtype=params["dtype"]), params.get("decimals")).decode()
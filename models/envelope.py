@@ -0,0 +1,109 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .gaps import check_sampling
+from .resample import parse_interval, resample_series
+
+
+def decimate_envelope(timestamps: np.ndarray, mins: np.ndarray, maxs: np.ndarray,
+                      max_points: int = 2000, interval=None) -> Tuple:
+    """
+    Reduz uma série Min/Max preservando o envelope: cada bucket de tempo guarda o
+    mínimo dos mínimos e o máximo dos máximos, de modo que nenhum extremo se perde.
+
+    Args:
+        timestamps: Timestamps datetime64
+        mins: Valores mínimos
+        maxs: Valores máximos
+        max_points: Quantidade máxima de buckets, usada quando interval não é informado
+        interval: Largura fixa dos buckets (ver resample.parse_interval)
+
+    Returns:
+        Tupla (timestamps, limite inferior, limite superior, largura do bucket ou None
+        se a série já cabia em max_points e não foi reduzida)
+    """
+    timestamps = np.asarray(timestamps).astype('datetime64[us]')
+    if interval is None:
+        if len(timestamps) <= max_points:
+            order = np.argsort(timestamps, kind='stable')
+            return (timestamps[order], np.asarray(mins, dtype=np.float64)[order],
+                    np.asarray(maxs, dtype=np.float64)[order], None)
+        span = (timestamps.max() - timestamps.min()).astype(np.int64)
+        step = np.timedelta64(max(1, -(-span // max_points)), 'us')
+    else:
+        step = parse_interval(interval)
+    buckets = resample_series(timestamps, mins, maxs, step, agg=("min", "max"))
+    return buckets["time"], buckets["min"], buckets["max"], step
+
+
+def band_polygon(timestamps: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                 interval=None, gap_factor: float = 1.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Monta o contorno de uma faixa preenchida (trace único com fill='toself'): o limite
+    superior no sentido do tempo e o inferior no sentido inverso. A faixa é dividida em
+    polígonos separados por NaN nas lacunas de amostragem e nas amostras em over-range.
+
+    Args:
+        timestamps: Timestamps datetime64 (ordenados)
+        lower: Limite inferior da faixa
+        upper: Limite superior da faixa
+        interval: Intervalo esperado entre pontos, para a detecção de lacunas (se None, inferido)
+        gap_factor: Ver gaps.check_sampling
+
+    Returns:
+        Tupla (x, y) com os vértices dos polígonos, separados por NaT/NaN
+    """
+    timestamps = np.asarray(timestamps).astype('datetime64[us]')
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    if len(timestamps) == 0:
+        return timestamps, lower
+
+    # Quebras: início/fim de trechos válidos e lacunas de amostragem
+    valid = ~(np.isnan(lower) | np.isnan(upper))
+    breaks = np.zeros(len(timestamps) + 1, dtype=bool)
+    breaks[0] = breaks[-1] = True
+    breaks[1:-1] = valid[1:] != valid[:-1]
+    if len(timestamps) > 1:
+        breaks[check_sampling(timestamps, interval=interval, gap_factor=gap_factor).gap_indices + 1] = True
+    bounds = np.flatnonzero(breaks)
+
+    xs, ys = [], []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if not valid[start]:
+            continue
+        x = timestamps[start:end]
+        xs += [x, x[::-1], np.array(['NaT'], dtype='datetime64[us]')]
+        ys += [upper[start:end], lower[start:end][::-1], np.array([np.nan])]
+    if not xs:
+        return np.empty(0, dtype='datetime64[us]'), np.empty(0)
+    return np.concatenate(xs[:-1]), np.concatenate(ys[:-1])
+
+
+def envelope_trace_data(timestamps: np.ndarray, mins: np.ndarray, maxs: np.ndarray,
+                        max_points: int = 2000, interval=None,
+                        sampling_interval: Optional[np.timedelta64] = None) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Decima a série preservando o envelope e monta o polígono da faixa, pronto para
+    um trace do Plotly (as separações entre polígonos viram None em x).
+
+    Args:
+        timestamps: Timestamps datetime64
+        mins: Valores mínimos
+        maxs: Valores máximos
+        max_points: Quantidade máxima de buckets
+        interval: Largura fixa dos buckets (opcional)
+        sampling_interval: Intervalo de amostragem dos dados brutos (para as lacunas)
+
+    Returns:
+        Tupla (x como array de datetime, y, quantidade de pontos da faixa após a decimação)
+    """
+    times, lower, upper, step = decimate_envelope(timestamps, mins, maxs, max_points=max_points,
+                                                  interval=interval)
+    x, y = band_polygon(times, lower, upper, interval=step if step is not None else sampling_interval)
+    # NaT seria serializado como texto; None é tratado como lacuna pelo Plotly
+    separators = np.isnat(x)
+    x = x.astype(object)
+    x[separators] = None
+    return x, y, len(times)
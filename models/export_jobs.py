@@ -0,0 +1,154 @@
+import os
+import tempfile
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .gtd_processor import OUTPUT_FORMATS
+
+# Estados de uma exportação
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "error"
+
+
+class ExportJob:
+    """
+    Uma exportação em memória de um formato (ver OUTPUT_FORMATS), com o estado e o
+    tempo de execução atualizados pela thread que a executa.
+    """
+    def __init__(self, fmt: str, filename: str):
+        self.fmt = fmt
+        self.filename = filename
+        self.state = QUEUED
+        self.data: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Tempo de execução em segundos (até agora, se ainda estiver rodando)"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def ready(self) -> bool:
+        """True quando a exportação terminou, com sucesso ou erro"""
+        return self.state in (DONE, FAILED)
+
+
+class ExportOrchestrator:
+    """
+    Executa as exportações de vários formatos em paralelo, em um pool de threads.
+
+    Todas as exportações leem o mesmo snapshot do processador (GTDProcessor.snapshot):
+    os canais são compartilhados sem cópia e os arrays numpy são preparados antes do
+    início, de modo que as threads apenas leem os dados. Cada formato grava em um
+    arquivo temporário próprio, lido para memória ao terminar.
+    """
+    def __init__(self, processor, formats: Sequence[str], base_filename: str,
+                 max_workers: Optional[int] = None):
+        """
+        Inicializa o orquestrador
+
+        Args:
+            processor: GTDProcessor com os dados a exportar
+            formats: Formatos (chaves de OUTPUT_FORMATS)
+            base_filename: Nome base dos arquivos gerados (sem extensão)
+            max_workers: Threads do pool (padrão: uma por formato)
+        """
+        unknown = [fmt for fmt in formats if fmt not in OUTPUT_FORMATS]
+        if unknown:
+            raise ValueError(f"Formatos desconhecidos: {unknown}. Use {list(OUTPUT_FORMATS)}")
+        self.processor = processor
+        self.jobs: Dict[str, ExportJob] = {
+            fmt: ExportJob(fmt, base_filename + OUTPUT_FORMATS[fmt][0]) for fmt in formats
+        }
+        self.max_workers = max_workers or max(1, len(formats))
+        self._futures: Dict[Future, ExportJob] = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _run(self, snapshot, job: ExportJob) -> ExportJob:
+        """Executa uma exportação em um arquivo temporário e carrega o resultado em memória"""
+        extension, method = OUTPUT_FORMATS[job.fmt]
+        with self._lock:
+            job.state, job.started = RUNNING, time.perf_counter()
+        handle, temp_path = tempfile.mkstemp(suffix=extension)
+        os.close(handle)
+        try:
+            getattr(snapshot, method)(temp_path)
+            with open(temp_path, 'rb') as f:
+                data = f.read()
+            with self._lock:
+                job.data, job.state = data, DONE
+        except Exception as e:
+            with self._lock:
+                job.error, job.state = repr(e), FAILED
+        finally:
+            job.finished = time.perf_counter()
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        return job
+
+    def start(self) -> 'ExportOrchestrator':
+        """
+        Cria o snapshot e submete todas as exportações ao pool.
+
+        Returns:
+            O próprio orquestrador
+        """
+        snapshot = self.processor.snapshot()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gtd-export")
+        for job in self.jobs.values():
+            self._futures[self._executor.submit(self._run, snapshot, job)] = job
+        return self
+
+    def as_completed(self, poll_interval: Optional[float] = None) -> Iterator[Optional[ExportJob]]:
+        """
+        Produz cada exportação assim que termina. Com poll_interval, também produz None
+        periodicamente enquanto espera, para que a interface atualize o progresso.
+
+        Args:
+            poll_interval: Intervalo máximo de espera entre atualizações (segundos)
+
+        Yields:
+            O ExportJob concluído, ou None a cada poll_interval sem conclusões
+        """
+        if self._executor is None:
+            self.start()
+        pending = set(self._futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                if not done:
+                    yield None
+                for future in done:
+                    yield self._futures[future]
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def run(self) -> Dict[str, ExportJob]:
+        """
+        Executa todas as exportações e espera o término.
+
+        Returns:
+            Dicionário {formato -> ExportJob}
+        """
+        for _ in self.as_completed():
+            pass
+        return self.jobs
+
+    @property
+    def progress(self) -> float:
+        """Fração das exportações concluídas (0 a 1)"""
+        return sum(job.ready for job in self.jobs.values()) / max(1, len(self.jobs))
+
+    def statuses(self) -> List[Dict]:
+        """Estado de cada formato, para exibição"""
+        with self._lock:
+            return [{"format": job.fmt, "state": job.state, "elapsed_s": job.elapsed, "error": job.error}
+                    for job in self.jobs.values()]
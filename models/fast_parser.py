@@ -0,0 +1,192 @@
+import numpy as np
+from datetime import datetime
+from typing import List, Dict, Tuple
+
+# Formato dos timestamps nas linhas de dados do GTD
+TIMESTAMP_FORMAT = "%Y/%m/%d %H:%M:%S"
+
+
+def _parse_timestamps(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte os timestamps das linhas de dados para datetime64 de forma vetorizada.
+    Strings fora do formato fixo AAAA/MM/DD HH:MM:SS são convertidas com strptime,
+    preservando exatamente a tolerância do parser de referência.
+
+    Args:
+        strings: Lista de strings de timestamp (já sem espaços nas bordas)
+
+    Returns:
+        Tupla (timestamps datetime64[us], máscara de linhas válidas)
+    """
+    count = len(strings)
+    times = np.empty(count, dtype='datetime64[us]')
+    valid = np.ones(count, dtype=bool)
+    if count == 0:
+        return times, valid
+
+    arr = np.array(strings, dtype='U')
+    # Linhas no formato fixo podem ser convertidas diretamente pelo numpy
+    fixed = (np.char.str_len(arr) == 19) if arr.dtype.itemsize // 4 >= 19 else np.zeros(count, dtype=bool)
+    if fixed.any():
+        candidates = arr[fixed].astype('U19')
+        chars = candidates.view('U1').reshape(-1, 19)
+        fixed_idx = np.flatnonzero(fixed)
+        layout_ok = ((chars[:, 4] == '/') & (chars[:, 7] == '/') & (chars[:, 10] == ' ')
+                     & (chars[:, 13] == ':') & (chars[:, 16] == ':'))
+        digits = np.delete(chars, [4, 7, 10, 13, 16], axis=1)
+        layout_ok &= np.all((digits >= '0') & (digits <= '9'), axis=1)
+        layout_ok &= ~np.all(chars[:, :4] == '0', axis=1)  # strptime não aceita o ano 0000
+        chars = chars[layout_ok].copy()
+        chars[:, [4, 7]] = '-'
+        chars[:, 10] = 'T'
+        iso = chars.reshape(-1).view('U19')
+        try:
+            times[fixed_idx[layout_ok]] = iso.astype('datetime64[s]')
+            fixed[fixed_idx[~layout_ok]] = False
+        except ValueError:
+            # Alguma data impossível (ex: 2025/02/30); deixa o strptime decidir linha a linha
+            fixed[:] = False
+
+    for index in np.flatnonzero(~fixed):
+        try:
+            times[index] = np.datetime64(datetime.strptime(strings[index], TIMESTAMP_FORMAT), 'us')
+        except ValueError:
+            valid[index] = False
+
+    return times, valid
+
+
+def _parse_column(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Converte uma coluna de valores em float64 com a mesma tolerância do parser de
+    referência (células vazias são ignoradas, valores não numéricos contados).
+
+    Args:
+        cells: Array (dtype object) com as strings da coluna
+
+    Returns:
+        Tupla (valores, máscara de valores presentes, quantidade de valores inválidos)
+    """
+    values = np.full(len(cells), np.nan)
+    present = np.zeros(len(cells), dtype=bool)
+    bad = 0
+    for index, cell in enumerate(cells.tolist()):
+        cell = cell.strip()
+        if not cell:
+            continue
+        try:
+            values[index] = float(cell)
+            present[index] = True
+        except ValueError:
+            bad += 1
+    return values, present, bad
+
+
+def _split_rows(data_lines: List[str]) -> np.ndarray:
+    """
+    Divide as linhas de dados em uma matriz (dtype object) de células.
+    Linhas com menos de duas colunas são descartadas, como na referência, e
+    linhas curtas são completadas com células vazias.
+
+    Args:
+        data_lines: Lista de linhas contendo os dados de amostragem
+
+    Returns:
+        Matriz de strings com uma linha por linha de dados válida
+    """
+    stripped = [line.strip() for line in data_lines]
+    stripped = [line for line in stripped if '\t' in line]
+    if not stripped:
+        return np.empty((0, 0), dtype=object)
+
+    widths = np.fromiter((line.count('\t') for line in stripped), dtype=np.int64,
+                         count=len(stripped)) + 1
+    width = int(widths.max())
+    if widths.min() == width:
+        # Caso comum: todas as linhas têm o mesmo número de colunas
+        cells = np.array('\t'.join(stripped).split('\t'), dtype=object)
+        return cells.reshape(len(stripped), width)
+
+    matrix = np.full((len(stripped), width), '', dtype=object)
+    for index, line in enumerate(stripped):
+        parts = line.split('\t')
+        matrix[index, :len(parts)] = parts
+    return matrix
+
+
+def collect_samples_fast(data_lines: List[str], channel_map: Dict[int, Tuple]) -> Tuple[Dict, int, int]:
+    """
+    Versão vetorizada de GTDProcessor._collect_samples. Produz exatamente as mesmas
+    amostras que o parser de referência, mas agrupadas por canal em arrays.
+
+    Quando um arquivo repete timestamps, a referência mantém uma única amostra por
+    (timestamp, canal) na posição da primeira ocorrência; nesse caso raro a função
+    retorna None para que o chamador use o parser de referência.
+
+    Args:
+        data_lines: Lista de linhas contendo os dados de amostragem
+        channel_map: Mapa {coluna -> (channel_id, kind, unit)} de GTDProcessor
+
+    Returns:
+        Tupla (amostras, linhas inválidas, valores inválidos), onde amostras é
+        {channel_id -> (timestamps datetime64[us], mins, maxs)} ou None
+    """
+    matrix = _split_rows(data_lines)
+    if len(matrix) == 0:
+        return {}, 0, 0
+
+    times, valid = _parse_timestamps([cell.strip() for cell in matrix[:, 0].tolist()])
+    bad_rows = int((~valid).sum())
+    if bad_rows:
+        matrix = matrix[valid]
+        times = times[valid]
+    if len(matrix) == 0:
+        return {}, bad_rows, 0
+
+    if len(np.unique(times)) != len(times):
+        return None, bad_rows, 0
+
+    width = matrix.shape[1]
+    columns = [column for column in sorted(channel_map) if column < width]
+
+    # Converte todas as colunas mapeadas de uma vez; se houver células vazias ou
+    # inválidas, converte coluna a coluna com a semântica completa da referência
+    parsed = {}
+    bad_values = 0
+    try:
+        block = np.array(list(map(float, matrix[:, columns].ravel().tolist())), dtype=np.float64)
+        block = block.reshape(len(matrix), len(columns))
+        all_present = np.ones(len(matrix), dtype=bool)
+        for position, column in enumerate(columns):
+            parsed[column] = (block[:, position], all_present)
+    except ValueError:
+        for column in columns:
+            values, present, bad = _parse_column(matrix[:, column])
+            bad_values += bad
+            parsed[column] = (values, present)
+
+    # Combina as colunas de cada canal: a última coluna com valor presente prevalece
+    combined = {}
+    for column in columns:
+        channel_id, kind, _ = channel_map[column]
+        kind = kind.lower()
+        if kind not in ("min", "max"):
+            continue
+        values, present = parsed[column]
+        slots = combined.setdefault(channel_id, {})
+        if kind in slots:
+            previous, previous_present = slots[kind]
+            values = np.where(present, values, previous)
+            present = present | previous_present
+        slots[kind] = (values, present)
+
+    samples = {}
+    for channel_id, slots in combined.items():
+        if "min" not in slots or "max" not in slots:
+            continue
+        mins, min_present = slots["min"]
+        maxs, max_present = slots["max"]
+        complete = min_present & max_present
+        samples[channel_id] = (times[complete], mins[complete], maxs[complete])
+
+    return samples, bad_rows, bad_values
@@ -0,0 +1,173 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .resample import parse_interval
+
+
+class SamplingReport:
+    """
+    Resultado da verificação de regularidade de uma série de timestamps em relação ao
+    intervalo de amostragem declarado no cabeçalho (ou inferido, se não houver).
+    Cada lacuna é um dicionário com start, end, duration_s e missing (amostras faltantes).
+    """
+    def __init__(self, interval: np.timedelta64, interval_source: str, samples: int):
+        self.interval = interval  # Intervalo esperado (timedelta64[us])
+        self.interval_source = interval_source  # "header", "informado" ou "inferido"
+        self.samples = samples
+        self.gaps: List[Dict] = []
+        self.gap_indices = np.empty(0, dtype=np.int64)  # Amostra (ordenada) que antecede cada lacuna
+        self.duplicates = 0  # Timestamps repetidos
+        self.out_of_order = 0  # Timestamps anteriores ao da linha anterior
+        self.irregular = 0  # Intervalos fora da tolerância, sem chegar a lacuna
+        self.jitter_max_s = 0.0  # Maior desvio absoluto em relação ao intervalo (s)
+        self.jitter_std_s = 0.0  # Desvio padrão dos intervalos regulares (s)
+
+    @property
+    def interval_s(self) -> float:
+        """Intervalo esperado em segundos"""
+        return self.interval / np.timedelta64(1, 's')
+
+    @property
+    def regular(self) -> bool:
+        """True se não houver lacunas, duplicatas, inversões nem intervalos irregulares"""
+        return not (self.gaps or self.duplicates or self.out_of_order or self.irregular)
+
+    def to_dict(self) -> Dict:
+        """
+        Converte o relatório em dicionário serializável (datas em ISO 8601).
+
+        Returns:
+            Dicionário com intervalo, contagens, jitter e a lista de lacunas
+        """
+        return {
+            "interval_s": self.interval_s,
+            "interval_source": self.interval_source,
+            "samples": self.samples,
+            "duplicates": self.duplicates,
+            "out_of_order": self.out_of_order,
+            "irregular": self.irregular,
+            "jitter_max_s": self.jitter_max_s,
+            "jitter_std_s": self.jitter_std_s,
+            "gaps": [dict(gap, start=gap["start"].isoformat(), end=gap["end"].isoformat())
+                     for gap in self.gaps],
+        }
+
+    def __str__(self) -> str:
+        """Resumo legível do relatório"""
+        return (f"{self.samples} amostras, intervalo {self.interval_s:g} s ({self.interval_source}): "
+                f"{len(self.gaps)} lacunas, {self.duplicates} duplicatas, {self.out_of_order} fora de ordem, "
+                f"{self.irregular} irregulares, jitter máximo {self.jitter_max_s:g} s")
+
+
+def check_sampling(timestamps, interval=None, gap_factor: float = 1.5,
+                   jitter_tolerance: float = 0.01) -> SamplingReport:
+    """
+    Verifica lacunas, duplicatas e jitter de uma série de timestamps em uma única
+    passada vetorizada sobre as diferenças entre amostras consecutivas.
+
+    Args:
+        timestamps: Timestamps (lista de datetime ou array datetime64)
+        interval: Intervalo esperado (ver resample.parse_interval); se None, usa a mediana
+            das diferenças positivas
+        gap_factor: Uma diferença maior ou igual a gap_factor * intervalo é uma lacuna
+        jitter_tolerance: Desvio relativo ao intervalo a partir do qual uma diferença é irregular
+
+    Returns:
+        Um SamplingReport
+    """
+    times = np.asarray(timestamps, dtype='datetime64[us]')
+    deltas = np.diff(times).astype(np.int64)
+
+    out_of_order = int(np.count_nonzero(deltas < 0))
+    if out_of_order:
+        times = np.sort(times, kind='stable')
+        deltas = np.diff(times).astype(np.int64)
+
+    if interval is not None:
+        step, source = parse_interval(interval), "informado"
+    else:
+        positive = deltas[deltas > 0]
+        step = np.timedelta64(int(np.median(positive)) if len(positive) else 1, 'us')
+        source = "inferido"
+
+    report = SamplingReport(step, source, len(times))
+    report.out_of_order = out_of_order
+    if len(deltas) == 0:
+        return report
+
+    step_us = step.astype(np.int64)
+    report.duplicates = int(np.count_nonzero(deltas == 0))
+
+    is_gap = deltas >= gap_factor * step_us
+    report.gap_indices = np.flatnonzero(is_gap)
+    gap_deltas = deltas[is_gap]
+    report.gaps = [
+        {"start": start, "end": end, "duration_s": duration / 1e6,
+         "missing": int(round(duration / step_us)) - 1}
+        for start, end, duration in zip(times[report.gap_indices].tolist(),
+                                        times[report.gap_indices + 1].tolist(),
+                                        gap_deltas.tolist())
+    ]
+
+    regular = deltas[(deltas > 0) & ~is_gap]
+    if len(regular):
+        jitter = (regular - step_us) / 1e6
+        report.irregular = int(np.count_nonzero(np.abs(jitter) > jitter_tolerance * step_us / 1e6))
+        report.jitter_max_s = float(np.abs(jitter).max())
+        report.jitter_std_s = float(jitter.std())
+    return report
+
+
+def break_at_gaps(df: 'pandas.DataFrame', interval=None, gap_factor: float = 1.5,
+                  column: str = 'Timestamp') -> 'pandas.DataFrame':
+    """
+    Insere uma linha vazia (NaN) logo após o início de cada lacuna, para que os gráficos
+    de linha sejam interrompidos nas lacunas em vez de ligar as gravações com uma reta.
+
+    Args:
+        df: DataFrame com a coluna de timestamps
+        interval: Intervalo esperado (se None, inferido)
+        gap_factor: Ver check_sampling
+        column: Nome da coluna de timestamps
+
+    Returns:
+        O DataFrame ordenado pelo tempo, com as linhas de quebra inseridas
+    """
+    import pandas as pd
+
+    if len(df) < 2:
+        return df
+    report = check_sampling(df[column].values, interval=interval, gap_factor=gap_factor)
+    if report.out_of_order:
+        df = df.sort_values(column, kind='stable')
+    df = df.reset_index(drop=True)
+    if not report.gaps:
+        return df
+
+    positions = report.gap_indices
+    breaks = pd.DataFrame(np.nan, index=positions + 0.5, columns=df.columns)
+    breaks[column] = df[column].values[positions] + report.interval
+    return pd.concat([df, breaks]).sort_index(kind='stable').reset_index(drop=True)
+
+
+def gaps_table(report: SamplingReport) -> Optional['pandas.DataFrame']:
+    """
+    Monta a tabela de lacunas para exibição ou exportação.
+
+    Args:
+        report: Relatório de check_sampling
+
+    Returns:
+        DataFrame com Início, Fim, Duração (s) e Amostras Faltantes, ou None sem lacunas
+    """
+    import pandas as pd
+
+    if not report.gaps:
+        return None
+    return pd.DataFrame([{
+        'Início': gap["start"],
+        'Fim': gap["end"],
+        'Duração (s)': gap["duration_s"],
+        'Amostras Faltantes': gap["missing"],
+    } for gap in report.gaps])
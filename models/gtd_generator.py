@@ -0,0 +1,253 @@
+import os
+import numpy as np
+from datetime import datetime
+from typing import List, Sequence, Tuple, Union
+
+# Sentinelas de over-range declaradas nas linhas "Extra Data" do GP10
+PLUS_OVER = 999999999
+MINUS_OVER = -999999999
+
+# Unidades de intervalo de amostragem aceitas no cabeçalho
+_INTERVAL_UNITS = {"s": 1, "min": 60, "h": 3600}
+
+
+def _channel_numbers(n_channels: int) -> List[str]:
+    """
+    Gera os números de canal no padrão do GP10 (módulo + canal): 0001..0010, 0101..0110, ...
+
+    Args:
+        n_channels: Quantidade de canais
+
+    Returns:
+        Lista com os números de canal formatados
+    """
+    return [f"{i // 10:02d}{i % 10 + 1:02d}" for i in range(n_channels)]
+
+
+def _tag_names(tags: Union[bool, Sequence[str], None], n_channels: int) -> List[str]:
+    """
+    Resolve as tags de cada canal a partir do parâmetro do gerador.
+
+    Args:
+        tags: True para tags automáticas, lista de tags, ou False/None para tags vazias
+        n_channels: Quantidade de canais
+
+    Returns:
+        Lista com uma tag (possivelmente vazia) por canal
+    """
+    if tags is True:
+        return [f"sensor {i + 1}" for i in range(n_channels)]
+    if not tags:
+        return [""] * n_channels
+    tags = list(tags)
+    return [tags[i] if i < len(tags) else "" for i in range(n_channels)]
+
+
+def _format_timestamps(start: datetime, offsets_s: np.ndarray) -> np.ndarray:
+    """
+    Formata timestamps no padrão das linhas de dados do GTD (AAAA/MM/DD HH:MM:SS).
+
+    Args:
+        start: Data e hora da primeira amostra
+        offsets_s: Deslocamentos em segundos de cada linha em relação a start
+
+    Returns:
+        Array de strings com os timestamps formatados
+    """
+    times = np.datetime64(start, 's') + offsets_s.astype('timedelta64[s]')
+    iso = np.datetime_as_string(times, unit='s')
+    return np.char.replace(np.char.replace(iso, '-', '/'), 'T', ' ')
+
+
+def generate_gtd_lines(n_channels: int = 32,
+                       n_rows: int = 1000,
+                       start: datetime = datetime(2025, 2, 7, 11, 2, 0),
+                       interval: Tuple[int, str] = (10, "s"),
+                       tags: Union[bool, Sequence[str], None] = None,
+                       tag_row: bool = True,
+                       gaps: int = 0,
+                       gap_length: int = 30,
+                       over_range_rate: float = 0.0,
+                       kinds: Sequence[str] = ("Min", "Max"),
+                       blank_rate: float = 0.0,
+                       bad_rows: int = 0,
+                       duplicate_rows: int = 0,
+                       serial: str = "S5XC10563",
+                       unit: str = "°C",
+                       seed: int = 0) -> List[str]:
+    """
+    Gera as linhas de um arquivo GTD sintético com o layout de cabeçalho do GP10.
+    Os valores são passeios aleatórios com resolução de 0.1, com Min <= Max.
+
+    Args:
+        n_channels: Quantidade de canais (cada canal ocupa uma coluna Min e uma Max)
+        n_rows: Quantidade de linhas de dados
+        start: Data e hora da primeira amostra
+        interval: Intervalo de amostragem como (valor, unidade), ex: (10, "s") ou (2, "min")
+        tags: True para tags automáticas, lista de tags, ou None para tags vazias
+        tag_row: Se False, omite a linha "Tag" do cabeçalho
+        gaps: Quantidade de lacunas inseridas na série temporal
+        gap_length: Quantidade de intervalos de amostragem pulados em cada lacuna
+        over_range_rate: Fração de valores substituídos pelas sentinelas de over-range
+        kinds: Tipos de coluna gravados por canal; ("Min",) ou ("Max",) simulam
+            arquivos em que só um dos lados está presente
+        blank_rate: Fração de células deixadas vazias
+        bad_rows: Quantidade de linhas com timestamp corrompido
+        duplicate_rows: Quantidade de linhas repetidas com o mesmo timestamp
+        serial: Número de série do registrador
+        unit: Unidade de medida dos canais
+        seed: Semente do gerador aleatório (torna o arquivo reprodutível)
+
+    Returns:
+        Lista de linhas (sem quebra de linha) do arquivo GTD
+    """
+    value, unit_name = interval
+    if unit_name not in _INTERVAL_UNITS:
+        raise ValueError(f"Unidade de intervalo não suportada: {unit_name}")
+    step_s = value * _INTERVAL_UNITS[unit_name]
+    rng = np.random.default_rng(seed)
+
+    numbers = _channel_numbers(n_channels)
+    tag_names = _tag_names(tags, n_channels)
+
+    # Cabeçalho no mesmo formato dos arquivos reais do GP10
+    lines = [
+        "YREC",
+        "Measure Data\tVersion 1.01.03",
+        "Model\tGP10",
+        "Language Code\tUTF-8",
+        f"Serial No.\t{serial}",
+        "Time Correction\tNone",
+        f"Sampling Interval\t{value}\t{unit_name}",
+        f"Trigger Point\t{max(n_rows - 1, 0)}",
+        "Equip Tag\t",
+        "Equip TagNo.\t",
+        "File Header\t",
+        "File ID\t62d80642d0600c8f000064ab11b0\t1",
+        "Start Info\tAuto\tKey\t",
+        "End Info\tAuto\tNone\t",
+    ]
+    for kind_type in ("Meas", "Math", "Ext"):
+        for kind in ("Max", "Min"):
+            lines.append(f"Extra Data\t{kind_type}\t{kind}\tPlusOver\t{PLUS_OVER}\tMinusOver\t{MINUS_OVER}")
+    lines += ["Time Zone\t540", "DST\tOff"]
+
+    kinds = list(kinds)
+    per_channel = len(kinds)
+
+    def header_row(label, per_channel_values, last):
+        cells = []
+        for item in per_channel_values:
+            cells += [item] * per_channel
+        return "\t".join([label] + cells + [last])
+
+    lines.append(header_row("Ch", numbers, "Message"))
+    lines.append(header_row("Ch Id", [str(i + 1) if i < 10 else "" for i in range(n_channels)], " "))
+    if tag_row:
+        lines.append(header_row("Tag", tag_names, " "))
+    lines.append(header_row("Unit", [unit] * n_channels, " "))
+    lines.append(header_row("Type", ["Meas"] * n_channels, "Message"))
+    lines.append("\t".join(["Kind"] + kinds * n_channels + ["Count"]))
+    lines.append("Sampling Data")
+
+    if n_rows <= 0:
+        return lines
+
+    # Eixo de tempo com lacunas opcionais
+    steps = np.ones(n_rows, dtype=np.int64)
+    steps[0] = 0
+    if gaps and n_rows > 1:
+        gap_rows = rng.choice(np.arange(1, n_rows), size=min(gaps, n_rows - 1), replace=False)
+        steps[gap_rows] += gap_length
+    offsets = np.cumsum(steps) * step_s
+    timestamps = _format_timestamps(start, offsets)
+
+    # Valores em décimos (inteiros) para garantir resolução exata de 0.1
+    base = rng.integers(200, 1400, size=n_channels)
+    walk = np.cumsum(rng.integers(-2, 3, size=(n_rows, n_channels)), axis=0)
+    center = base + walk
+    spread = rng.integers(0, 6, size=(n_rows, n_channels))
+    mins = center - spread // 2
+    maxs = mins + spread
+
+    by_kind = {"Min": mins, "Max": maxs}
+    values = np.empty((n_rows, per_channel * n_channels), dtype=np.int64)
+    for offset, kind in enumerate(kinds):
+        values[:, offset::per_channel] = by_kind.get(kind, mins)
+
+    # Converte décimos em texto com uma tabela de consulta (muito mais rápido que formatar cada valor)
+    low = int(values.min())
+    table = np.array([f"{v / 10:.1f}" for v in range(low, int(values.max()) + 1)], dtype=object)
+    cells = table[values - low]
+
+    if over_range_rate > 0:
+        mask = rng.random(cells.shape) < over_range_rate
+        sentinels = np.where(rng.random(cells.shape) < 0.5, str(PLUS_OVER), str(MINUS_OVER))
+        cells[mask] = sentinels[mask]
+
+    if blank_rate > 0:
+        cells[rng.random(cells.shape) < blank_rate] = ""
+
+    timestamps = timestamps.tolist()
+    for index in rng.choice(n_rows, size=min(bad_rows, n_rows), replace=False):
+        timestamps[index] = timestamps[index].replace("/", "-", 1) + "x"
+
+    data = [ts + "\t" + "\t".join(row) + "\t0" for ts, row in zip(timestamps, cells.tolist())]
+    for index in sorted(rng.choice(n_rows, size=min(duplicate_rows, n_rows), replace=False), reverse=True):
+        data.insert(index + 1, data[index])
+    lines += data
+
+    return lines
+
+
+def write_gtd_file(filepath: str, **kwargs) -> str:
+    """
+    Gera um arquivo GTD sintético e o grava em disco (UTF-8).
+
+    Args:
+        filepath: Caminho do arquivo de saída
+        **kwargs: Parâmetros repassados para generate_gtd_lines
+
+    Returns:
+        O caminho do arquivo gravado
+    """
+    directory = os.path.dirname(filepath)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    lines = generate_gtd_lines(**kwargs)
+    with open(filepath, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("\n".join(lines))
+        f.write("\n")
+    return filepath
+
+
+def generate_gtd_directory(directory: str, n_files: int = 2, n_rows: int = 1000,
+                           interval: Tuple[int, str] = (10, "s"),
+                           start: datetime = datetime(2025, 2, 7, 11, 2, 0),
+                           seed: int = 0, **kwargs) -> List[str]:
+    """
+    Gera uma sequência de arquivos GTD consecutivos no tempo, como uma gravação
+    longa dividida em vários arquivos pelo registrador.
+
+    Args:
+        directory: Diretório de saída
+        n_files: Quantidade de arquivos
+        n_rows: Linhas de dados por arquivo
+        interval: Intervalo de amostragem como (valor, unidade)
+        start: Data e hora da primeira amostra do primeiro arquivo
+        seed: Semente base (cada arquivo usa seed + índice)
+        **kwargs: Demais parâmetros repassados para generate_gtd_lines
+
+    Returns:
+        Lista ordenada com os caminhos dos arquivos gerados
+    """
+    step_s = interval[0] * _INTERVAL_UNITS[interval[1]]
+    filepaths = []
+    for index in range(n_files):
+        file_start = start + (np.timedelta64(index * n_rows * step_s, 's')).item()
+        name = f"{index + 1:06d}_{file_start.strftime('%y%m%d_%H%M%S')}.GTD"
+        filepaths.append(write_gtd_file(os.path.join(directory, name), n_rows=n_rows,
+                                        interval=interval, start=file_start,
+                                        seed=seed + index, **kwargs))
+    return filepaths
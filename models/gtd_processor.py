@@ -1,10 +1,13 @@
 import os
 import re
-import pandas as pd
 import json
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional, Union
 from .Channel import Channel  # Importa a classe Channel do módulo Channel
+from .metrics import ProcessingMetrics
+
+# pandas e numpy são importados sob demanda (exportação, DataFrame e engine 'fast'),
+# para que workers em lote e a CLI iniciem rapidamente
 
 
 
@@ -14,10 +17,52 @@ class GTDProcessor:
     Classe para processar arquivos GTD e convertê-los em formato Excel.
     Pode processar múltiplos arquivos GTD e combiná-los em uma única saída.
     """
-    def __init__(self):
-        """Inicializa o processador GTD"""
+    # Codificações testadas, em ordem, na leitura dos arquivos
+    ENCODINGS = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
+    
+    # Engines de parsing de dados disponíveis
+    ENGINES = ('reference', 'fast')
+
+    def __init__(self, track_memory: bool = False, engine: str = 'reference',
+                 recorder_namespace: bool = False, utc: bool = False):
+        """
+        Inicializa o processador GTD
+        
+        Args:
+            track_memory: Se True, as métricas registram o pico de memória de cada estágio
+            engine: Engine de parsing das linhas de dados: 'reference' (laço Python original)
+                ou 'fast' (vetorizado com numpy, validado pelo harness de conformidade)
+            recorder_namespace: Se True, os IDs dos canais recebem o número de série do
+                registrador (ex: S5XC10563_1), para combinar arquivos de vários registradores
+            utc: Se True, os timestamps são convertidos para UTC com o Time Zone e o DST
+                do cabeçalho de cada arquivo
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Engine desconhecida: {engine}. Use uma de {self.ENGINES}")
+        self.engine = engine
+        self.recorder_namespace = recorder_namespace
+        self.utc = utc
         self.channels = {}  # Dicionário para armazenar objetos Channel por ID
         self.metadata = {}  # Dicionário para armazenar metadados
+        self.metrics = ProcessingMetrics(track_memory=track_memory)  # Métricas por estágio
+        # Sentinelas de over-range do arquivo atual: {(tipo, kind) -> (PlusOver, MinusOver)}
+        self.over_range_limits = {}
+        # Sentinelas aplicáveis a cada canal: {channel_id -> {"min": (plus, minus), "max": (plus, minus)}}
+        self.channel_limits = {}
+        # Canais derivados por expressão, na ordem de definição: {channel_id -> MathChannel}
+        self.math_channels = {}
+        # Registradores lidos: {número de série -> cabeçalho resumido, arquivos e canais}
+        self.recorders = {}
+        # Registrador e deslocamento para UTC do arquivo atual
+        self._recorder = ""
+        self._time_offset = None
+        # Instante do Trigger Point do primeiro arquivo que o declara (origem dos ensaios)
+        self.trigger_time = None
+        self._trigger_point = None
+        # Resultados de análises por parâmetros: {parâmetros -> (versão dos dados, resultado)}
+        self._analysis_cache = {}
+        # Contador de alterações dos dados (amostras, merges e canais derivados), ver data_version
+        self._mutations = 0
     
     def _parse_header(self, lines: List[str]) -> int:
         """
@@ -31,6 +76,8 @@ class GTDProcessor:
         """
         sampling_data_line_index = 0
         header_section = True
+        self.over_range_limits = {}
+        header = {}  # Cabeçalho deste arquivo (self.metadata acumula os anteriores)
         
         for i, line in enumerate(lines):
             if line.strip() == "Sampling Data":
@@ -43,10 +90,64 @@ class GTDProcessor:
                 if len(parts) >= 2:
                     key = parts[0].strip()
                     value = parts[1].strip()
+                    # O intervalo de amostragem traz a unidade em um campo separado ("2", "min")
+                    if key == "Sampling Interval" and len(parts) >= 3 and parts[2].strip():
+                        value = f"{value} {parts[2].strip()}"
                     self.metadata[key] = value
+                    header[key] = value
+                
+                # Linhas "Extra Data": sentinelas de over-range por tipo (Meas/Math/Ext) e kind (Min/Max)
+                if parts[0].strip() == "Extra Data" and len(parts) >= 3:
+                    self._parse_over_range(parts)
         
+        self._register_recorder(header)
         return sampling_data_line_index
     
+    def _register_recorder(self, header: Dict) -> None:
+        """
+        Registra o registrador do arquivo atual (número de série, fuso e intervalo) e
+        prepara o deslocamento para UTC dos seus timestamps.
+        
+        Args:
+            header: Cabeçalho do arquivo atual
+        """
+        from .recorders import recorder_id, utc_offset
+        
+        self._recorder = recorder_id(header)
+        self._time_offset = None
+        self._trigger_point = header.get("Trigger Point")
+        if self.utc:
+            self._time_offset = utc_offset(header)
+            if self._time_offset is None:
+                print("Aviso: Time Zone ausente ou ilegível no cabeçalho; timestamps mantidos no horário local.")
+            else:
+                self.metadata["Time Base"] = "UTC"
+        
+        recorder = self.recorders.setdefault(self._recorder, {"files": 0, "channels": []})
+        for key in ("Model", "Time Zone", "DST", "Sampling Interval"):
+            if key in header:
+                recorder[key] = header[key]
+        recorder["files"] += 1
+    
+    def _parse_over_range(self, parts: List[str]) -> None:
+        """
+        Registra as sentinelas de over-range de uma linha "Extra Data" do cabeçalho.
+        Exemplo: Extra Data, Meas, Max, PlusOver, 999999999, MinusOver, -999999999
+        
+        Args:
+            parts: Campos da linha "Extra Data"
+        """
+        key = (parts[1].strip(), parts[2].strip().lower())
+        fields = {}
+        for j in range(3, len(parts) - 1, 2):
+            try:
+                fields[parts[j].strip()] = float(parts[j + 1].strip())
+            except ValueError:
+                continue
+        
+        if "PlusOver" in fields and "MinusOver" in fields:
+            self.over_range_limits[key] = (fields["PlusOver"], fields["MinusOver"])
+    
     def _parse_channels(self, lines: List[str], sampling_data_line_index: int) -> None:
         """
         Processa as definições de canais do arquivo GTD e cria objetos Channel.
@@ -59,6 +160,7 @@ class GTDProcessor:
         ch_line_idx = None
         unit_line_idx = None
         kind_line_idx = None
+        type_line_idx = None
         tag_line_idx = None  # Inicializa a variável tag_line_idx
         
         # Procura as linhas de definição olhando algumas linhas antes de "Sampling Data"
@@ -75,6 +177,8 @@ class GTDProcessor:
                 unit_line_idx = i
             elif parts and parts[0].strip() == "Kind":
                 kind_line_idx = i
+            elif parts and parts[0].strip() == "Type":
+                type_line_idx = i
             elif parts and parts[0].strip() == "Tag":
                 tag_line_idx = i  # Opcional, se precisar de tags
             
@@ -96,6 +200,8 @@ class GTDProcessor:
         else:
             print("Tag: Linha não encontrada")
         
+        type_parts = lines[type_line_idx].strip().split('\t') if type_line_idx is not None else []
+        
         # Mapeia canais para suas posições
         # Dicionário: {posição -> (channel_id, kind, unit)}
         channel_map = {}
@@ -134,26 +240,76 @@ class GTDProcessor:
                     
                     if tag:  # Se ainda tiver conteúdo após a limpeza
                         channel_id = f"{channel_id}_{tag}"  # Adiciona a tag ao ID do canal
+                
+                # Canais de registradores diferentes não colidem: prefixo com o número de série
+                if self.recorder_namespace and self._recorder:
+                    channel_id = f"{self._recorder}_{channel_id}"
 
                 # Cria o canal se ainda não existir
                 if channel_id not in self.channels:
                     self.channels[channel_id] = Channel(channel_id, unit)
-                
+                recorder_channels = self.recorders[self._recorder]["channels"]
+                if channel_id not in recorder_channels:
+                    recorder_channels.append(channel_id)
                 
                 channel_map[i] = (channel_id, kind, unit)
                 
+                # Associa ao canal as sentinelas de over-range do seu tipo (Meas/Math/Ext)
+                channel_type = type_parts[i].strip() if i < len(type_parts) else "Meas"
+                limits = self.over_range_limits.get((channel_type, kind.lower()))
+                if limits is not None:
+                    self.channel_limits.setdefault(channel_id, {})[kind.lower()] = limits
+                
             except (ValueError, IndexError) as e:
                 print(f"Aviso: Erro ao processar canal na coluna {i}: {e}")
         
         self.channel_map = channel_map
         print(f"Processados {len(set([ch_id for ch_id, _, _ in channel_map.values()]))} canais únicos.")
     
-    def _parse_data(self, data_lines: List[str]) -> None:
+    def _parse_data(self, data_lines: List[str], source: Optional[str] = None) -> None:
         """
         Processa as linhas de dados e adiciona as amostras aos canais correspondentes.
         
         Args:
             data_lines: Lista de linhas contendo os dados de amostragem
+            source: Arquivo de origem (usado apenas nas métricas)
+        """
+        if self.engine == 'fast':
+            from .fast_parser import collect_samples_fast
+            
+            with self.metrics.stage("data_parse", source=source, rows=len(data_lines),
+                                    nbytes=sum(map(len, data_lines))) as fast_stage:
+                samples, bad_rows, bad_values = collect_samples_fast(data_lines, self.channel_map)
+                self.metrics.bad_rows += bad_rows
+                self.metrics.bad_values += bad_values
+            
+            # Timestamps repetidos no arquivo: usa a semântica exata da referência
+            if samples is not None:
+                with self.metrics.stage("merge", source=source) as stage:
+                    stage.rows = self._merge_channel_arrays(samples)
+                return
+            # A tentativa descartada não conta como parsing (o estágio da referência é registrado abaixo)
+            fast_stage.name = "data_parse_fast_fallback"
+            self.metrics.bad_rows -= bad_rows
+        
+        with self.metrics.stage("data_parse", source=source, rows=len(data_lines),
+                                nbytes=sum(map(len, data_lines))):
+            temp_values = self._collect_samples(data_lines)
+        
+        with self.metrics.stage("merge", source=source) as stage:
+            stage.rows = self._merge_samples(temp_values)
+    
+    def _collect_samples(self, data_lines: List[str]) -> Dict:
+        """
+        Lê as linhas de dados e agrupa os valores Min/Max por timestamp e canal.
+        Linhas com timestamp inválido e valores não numéricos são contabilizados
+        em self.metrics em vez de interromper o processamento.
+        
+        Args:
+            data_lines: Lista de linhas contendo os dados de amostragem
+            
+        Returns:
+            Dicionário {(timestamp, channel_id) -> {"min": valor, "max": valor}}
         """
         # Cria um dicionário para armazenar valores Min/Max temporários
         # Formato: {(timestamp, channel_id) -> {"min": valor, "max": valor}}
@@ -170,49 +326,161 @@ class GTDProcessor:
                 # Converte a string de timestamp para datetime
                 timestamp_str = parts[0].strip()
                 timestamp = datetime.strptime(timestamp_str, "%Y/%m/%d %H:%M:%S")
+            except ValueError:
+                self.metrics.bad_rows += 1
+                continue
+            
+            # Itera através das colunas de dados
+            for i in range(1, len(parts)):
+                if i not in self.channel_map:
+                    continue
                 
-                # Itera através das colunas de dados
-                for i in range(1, len(parts)):
-                    if i not in self.channel_map:
-                        continue
-                    
-                    channel_id, kind, _ = self.channel_map[i]
-                    
-                    # Pula se não houver valor
-                    if not parts[i].strip():
-                        continue
-                    
-                    # Converte para float
-                    try:
-                        value = float(parts[i].strip())
-                    except ValueError:
-                        continue
-                    
-                    key = (timestamp, channel_id)
-                    
-                    # Inicializa o dicionário para este par timestamp/canal se necessário
-                    if key not in temp_values:
-                        temp_values[key] = {"min": None, "max": None}
-                    
-                    # Armazena o valor de acordo com o tipo (Min/Max)
-                    if kind.lower() == "min":
-                        temp_values[key]["min"] = value
-                    elif kind.lower() == "max":
-                        temp_values[key]["max"] = value
+                channel_id, kind, _ = self.channel_map[i]
                 
-            except ValueError as e:
-                print(f"Erro ao processar linha: {line.strip()} - {e}")
-        # Adiciona pares completos de Min/Max aos canais
-        samples_added = 0
+                # Pula se não houver valor
+                if not parts[i].strip():
+                    continue
+                
+                # Converte para float
+                try:
+                    value = float(parts[i].strip())
+                except ValueError:
+                    self.metrics.bad_values += 1
+                    continue
+                
+                key = (timestamp, channel_id)
+                
+                # Inicializa o dicionário para este par timestamp/canal se necessário
+                if key not in temp_values:
+                    temp_values[key] = {"min": None, "max": None}
+                
+                # Armazena o valor de acordo com o tipo (Min/Max)
+                if kind.lower() == "min":
+                    temp_values[key]["min"] = value
+                elif kind.lower() == "max":
+                    temp_values[key]["max"] = value
+        
+        return temp_values
+    
+    def _merge_samples(self, temp_values: Dict) -> int:
+        """
+        Adiciona aos canais os pares completos de Min/Max coletados.
+        
+        Args:
+            temp_values: Dicionário retornado por _collect_samples
+            
+        Returns:
+            Número de amostras adicionadas
+        """
+        # Agrupa os pares completos por canal, preservando a ordem de chegada
+        grouped = {}
         for (timestamp, channel_id), values in temp_values.items():
             min_value = values.get("min")
             max_value = values.get("max")
             
             if channel_id in self.channels and min_value is not None and max_value is not None:
-                self.channels[channel_id].add_sample(timestamp, min_value, max_value)
-                samples_added += 1
+                timestamps, mins, maxs = grouped.setdefault(channel_id, ([], [], []))
+                timestamps.append(timestamp)
+                mins.append(min_value)
+                maxs.append(max_value)
+        
+        samples_added = 0
+        for channel_id, (timestamps, mins, maxs) in grouped.items():
+            if self._time_offset is not None:
+                timestamps = [timestamp - self._time_offset for timestamp in timestamps]
+            self._append_samples(channel_id, timestamps, mins, maxs)
+            samples_added += len(timestamps)
+        
+        print(f"Adicionadas {samples_added} amostras aos canais.")
+        return samples_added
+    
+    def _merge_channel_arrays(self, samples: Dict) -> int:
+        """
+        Adiciona aos canais as amostras agrupadas por canal pela engine 'fast'.
+        
+        Args:
+            samples: Dicionário {channel_id -> (timestamps, mins, maxs)} de collect_samples_fast
+            
+        Returns:
+            Número de amostras adicionadas
+        """
+        samples_added = 0
+        for channel_id, (timestamps, mins, maxs) in samples.items():
+            if channel_id not in self.channels or len(timestamps) == 0:
+                continue
+            if self._time_offset is not None:
+                import numpy as np
+                timestamps = timestamps - np.timedelta64(self._time_offset)
+            self._append_samples(channel_id, timestamps.tolist(), mins, maxs)
+            samples_added += len(timestamps)
         
         print(f"Adicionadas {samples_added} amostras aos canais.")
+        return samples_added
+    
+    def _append_samples(self, channel_id: Union[int, str], timestamps: List[datetime],
+                        mins, maxs, limits: Optional[Dict] = None) -> None:
+        """
+        Adiciona amostras a um canal, marcando como NaN (com uma máscara vetorizada)
+        os valores iguais ou além das sentinelas de over-range declaradas no cabeçalho.
+        
+        Args:
+            channel_id: ID do canal
+            timestamps: Timestamps das amostras
+            mins: Valores mínimos (lista ou array)
+            maxs: Valores máximos (lista ou array)
+            limits: Sentinelas a aplicar (padrão: as do canal em self.channel_limits)
+        """
+        channel = self.channels[channel_id]
+        self._mutations += 1
+        if limits is None:
+            limits = self.channel_limits.get(channel_id)
+        
+        if limits:
+            import numpy as np
+            
+            mins = np.asarray(mins, dtype=np.float64)
+            maxs = np.asarray(maxs, dtype=np.float64)
+            over = np.zeros(len(mins), dtype=bool)
+            masked = {}
+            for kind, values in (("min", mins), ("max", maxs)):
+                if kind not in limits:
+                    masked[kind] = values
+                    continue
+                plus_over, minus_over = limits[kind]
+                over_kind = (values >= plus_over) | (values <= minus_over)
+                masked[kind] = np.where(over_kind, np.nan, values)
+                over |= over_kind
+            mins, maxs = masked["min"], masked["max"]
+            channel.over_range_count += int(over.sum())
+        
+        if not isinstance(mins, list):
+            mins = mins.tolist()
+        if not isinstance(maxs, list):
+            maxs = maxs.tolist()
+        channel.extend_samples(timestamps, mins, maxs)
+    
+    def _decode(self, raw: bytes, filepath: str) -> List[str]:
+        """
+        Decodifica o conteúdo bruto do arquivo testando as codificações suportadas.
+        
+        Args:
+            raw: Conteúdo do arquivo em bytes
+            filepath: Caminho do arquivo (usado apenas nas mensagens)
+            
+        Returns:
+            Lista de linhas do arquivo
+        """
+        # Tenta diferentes codificações para garantir compatibilidade
+        for encoding in self.ENCODINGS:
+            try:
+                text = raw.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+            print(f"Arquivo lido com codificação: {encoding}")
+            return text.splitlines()
+        
+        raise ValueError(f"Não foi possível ler o arquivo {filepath} com nenhuma codificação suportada")
+    
     def process_file(self, filepath: str) -> None:
         """
         Processa um único arquivo GTD.
@@ -222,31 +490,37 @@ class GTDProcessor:
         """
         print(f"Processando arquivo: {filepath}")
         
-        # Tenta diferentes codificações para garantir compatibilidade
-        encodings = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
-        lines = None
+        with self.metrics.stage("read", source=filepath) as stage:
+            with open(filepath, 'rb') as file:
+                raw = file.read()
+            stage.bytes = len(raw)
         
-        for encoding in encodings:
-            try:
-                with open(filepath, 'r', encoding=encoding) as file:
-                    lines = file.readlines()
-                print(f"Arquivo lido com codificação: {encoding}")
-                break
-            except UnicodeDecodeError:
-                continue
+        self.process_bytes(raw, filepath)
+    
+    def process_bytes(self, raw: bytes, filepath: str) -> None:
+        """
+        Processa o conteúdo de um arquivo GTD já carregado em memória (ex: upload).
         
-        if lines is None:
-            raise ValueError(f"Não foi possível ler o arquivo {filepath} com nenhuma codificação suportada")
+        Args:
+            raw: Conteúdo do arquivo em bytes
+            filepath: Nome ou caminho do arquivo (usado nas métricas e mensagens)
+        """
+        with self.metrics.stage("decode", source=filepath, nbytes=len(raw)) as stage:
+            lines = self._decode(raw, filepath)
+            stage.rows = len(lines)
         
         # Encontra a linha de início dos dados de amostragem
-        sampling_data_line_index = self._parse_header(lines)
+        with self.metrics.stage("header", source=filepath) as stage:
+            sampling_data_line_index = self._parse_header(lines)
+            stage.rows = sampling_data_line_index
         
         # Verifica se encontramos a seção "Sampling Data"
         if sampling_data_line_index == 0:
             raise ValueError("Formato de arquivo GTD inválido. 'Sampling Data' não encontrado.")
         
         # Processa as definições de canais
-        self._parse_channels(lines, sampling_data_line_index)
+        with self.metrics.stage("channel_map", source=filepath):
+            self._parse_channels(lines, sampling_data_line_index)
         
         # Verifica se temos canais definidos
         if not hasattr(self, 'channel_map') or not self.channel_map:
@@ -254,7 +528,80 @@ class GTDProcessor:
         
         # Processa os dados de amostragem
         data_lines = lines[sampling_data_line_index + 1:]
-        self._parse_data(data_lines)
+        self._parse_data(data_lines, source=filepath)
+        self.metrics.files += 1
+        if self.trigger_time is None:
+            self.trigger_time = self._trigger_timestamp(data_lines)
+        
+        # Recalcula os canais derivados cujas entradas receberam novas amostras
+        if self.math_channels:
+            self.refresh_math_channels()
+    
+    def _trigger_timestamp(self, data_lines: List[str]) -> Optional[datetime]:
+        """
+        Instante do Trigger Point do arquivo atual: o timestamp da linha de dados de
+        índice "Trigger Point" (a partir de 0), no mesmo fuso das amostras.
+        
+        Args:
+            data_lines: Linhas de dados do arquivo
+            
+        Returns:
+            O instante, ou None se o Trigger Point estiver ausente ou fora dos dados
+        """
+        try:
+            index = int(self._trigger_point)
+            timestamp = datetime.strptime(data_lines[index].split('\t', 1)[0].strip(), "%Y/%m/%d %H:%M:%S")
+        except (TypeError, ValueError, IndexError):
+            return None
+        return timestamp - self._time_offset if self._time_offset is not None else timestamp
+    
+    def merge(self, other: 'GTDProcessor') -> None:
+        """
+        Incorpora os dados de outro processador, como se os arquivos dele tivessem sido
+        processados em seguida por este (ver upload_pipeline): as amostras são
+        adicionadas ao fim dos canais existentes, canais novos entram no fim e os
+        metadados do outro prevalecem.
+        
+        Args:
+            other: Processador com os arquivos a incorporar (sem canais derivados próprios)
+        """
+        self._mutations += 1
+        for channel_id, channel in other.channels.items():
+            if channel_id in other.math_channels:
+                continue
+            if channel_id not in self.channels:
+                self.channels[channel_id] = Channel(channel_id, channel.unit)
+            
+            # Sentinelas herdadas de arquivos anteriores que o outro não declarou
+            # também se aplicam às amostras dele, como no processamento sequencial
+            declared = other.channel_limits.get(channel_id, {})
+            inherited = {kind: limits for kind, limits in self.channel_limits.get(channel_id, {}).items()
+                         if kind not in declared}
+            if inherited and channel.timestamps:
+                self.channels[channel_id].over_range_count += channel.over_range_count
+                self._append_samples(channel_id, channel.timestamps, channel.samples_min,
+                                     channel.samples_max, limits=inherited)
+            else:
+                self.channels[channel_id].merge(channel)
+        
+        for channel_id, limits in other.channel_limits.items():
+            self.channel_limits.setdefault(channel_id, {}).update(limits)
+        for serial, info in other.recorders.items():
+            recorder = self.recorders.setdefault(serial, {"files": 0, "channels": []})
+            recorder.update({key: value for key, value in info.items() if key not in ("files", "channels")})
+            recorder["files"] += info["files"]
+            recorder["channels"] += [channel_id for channel_id in info["channels"]
+                                     if channel_id not in recorder["channels"]]
+        self.over_range_limits = dict(other.over_range_limits)
+        if hasattr(other, 'channel_map'):
+            self.channel_map = other.channel_map
+        self.metadata.update(other.metadata)
+        self.metrics.merge(other.metrics)
+        if self.trigger_time is None:
+            self.trigger_time = other.trigger_time
+        
+        if self.math_channels:
+            self.refresh_math_channels()
     
     def process_multiple_files(self, filepaths: List[str]) -> None:
         """
@@ -277,122 +624,964 @@ class GTDProcessor:
         if not output_filepath.lower().endswith('.xlsx'):
             output_filepath += '.xlsx'
         
-        # Cria um DataFrame vazio
-        df = pd.DataFrame()
-        
-        # Função auxiliar para ordenação dos canais
-        def channel_sort_key(item):
-            # O item é um tuple (channel_id, channel_object)
-            channel_id = item[0]
-            # Se for string, tentamos converter para inteiro para comparação
-            if isinstance(channel_id, str) and channel_id.isdigit():
-                return (0, int(channel_id))  # Tupla com prioridade 0 para números
-            if isinstance(channel_id, int):
-                return (0, channel_id)  # Tupla com prioridade 0 para números
-            # Para strings não-numéricas, retorna com prioridade 1
-            return (1, str(channel_id))  # Garante comparação apenas entre strings
-        
-        # Primeiro, identifique o canal com mais amostras para inicializar o DataFrame
-        max_samples = 0
-        init_channel_id = None
-        init_channel = None
+        import pandas as pd
         
-        for channel_id, channel in self.channels.items():
-            if len(channel.timestamps) > max_samples:
-                max_samples = len(channel.timestamps)
-                init_channel_id = channel_id
-                init_channel = channel
+        with self.metrics.stage("export_excel", source=output_filepath) as stage:
+            # Cria um DataFrame vazio
+            df = pd.DataFrame()
         
-        if init_channel is None:
-            print("Aviso: Nenhum canal com dados foi encontrado.")
-            return
+            # Função auxiliar para ordenação dos canais
+            def channel_sort_key(item):
+                # O item é um tuple (channel_id, channel_object)
+                channel_id = item[0]
+                # Se for string, tentamos converter para inteiro para comparação
+                if isinstance(channel_id, str) and channel_id.isdigit():
+                    return (0, int(channel_id))  # Tupla com prioridade 0 para números
+                if isinstance(channel_id, int):
+                    return (0, channel_id)  # Tupla com prioridade 0 para números
+                # Para strings não-numéricas, retorna com prioridade 1
+                return (1, str(channel_id))  # Garante comparação apenas entre strings
+        
+            # Primeiro, identifique o canal com mais amostras para inicializar o DataFrame
+            max_samples = 0
+            init_channel_id = None
+            init_channel = None
+        
+            for channel_id, channel in self.channels.items():
+                if len(channel.timestamps) > max_samples:
+                    max_samples = len(channel.timestamps)
+                    init_channel_id = channel_id
+                    init_channel = channel
+        
+            if init_channel is None:
+                print("Aviso: Nenhum canal com dados foi encontrado.")
+                return
             
-        # Inicializa o DataFrame com o canal que tem mais amostras
-        channel_data = init_channel.get_data_as_dict()
-        df['Timestamp'] = channel_data['Timestamp']
+            # Inicializa o DataFrame com o canal que tem mais amostras
+            channel_data = init_channel.get_data_as_dict()
+            df['Timestamp'] = channel_data['Timestamp']
         
-        min_col = f"Ch{init_channel_id}_Min_{init_channel.unit}"
-        max_col = f"Ch{init_channel_id}_Max_{init_channel.unit}"
-        df[min_col] = channel_data[min_col]
-        df[max_col] = channel_data[max_col]
+            min_col = f"Ch{init_channel_id}_Min_{init_channel.unit}"
+            max_col = f"Ch{init_channel_id}_Max_{init_channel.unit}"
+            df[min_col] = channel_data[min_col]
+            df[max_col] = channel_data[max_col]
         
-        # Adiciona os demais canais ao DataFrame
-        for channel_id, channel in sorted(self.channels.items(), key=channel_sort_key):
-            # Pula o canal inicializador
-            if channel_id == init_channel_id:
-                continue
+            # Adiciona os demais canais ao DataFrame
+            for channel_id, channel in sorted(self.channels.items(), key=channel_sort_key):
+                # Pula o canal inicializador
+                if channel_id == init_channel_id:
+                    continue
                 
-            # Verifica se o canal tem dados
-            if len(channel.timestamps) == 0:
-                print(f"Aviso: Canal {channel_id} não possui amostras, ignorando.")
-                continue
+                # Verifica se o canal tem dados
+                if len(channel.timestamps) == 0:
+                    print(f"Aviso: Canal {channel_id} não possui amostras, ignorando.")
+                    continue
                 
-            # Obtém dicionário de dados do canal
-            channel_data = channel.get_data_as_dict()
+                # Obtém dicionário de dados do canal
+                channel_data = channel.get_data_as_dict()
             
-            # Adiciona colunas de min e max, verificando comprimento
-            min_col = f"Ch{channel_id}_Min_{channel.unit}"
-            max_col = f"Ch{channel_id}_Max_{channel.unit}"
+                # Adiciona colunas de min e max, verificando comprimento
+                min_col = f"Ch{channel_id}_Min_{channel.unit}"
+                max_col = f"Ch{channel_id}_Max_{channel.unit}"
             
-            # Se o tamanho dos dados do canal for diferente do DataFrame, avisa mas não adiciona
-            if len(channel_data[min_col]) != len(df):
-                print(f"Aviso: Canal {channel_id} tem um número diferente de amostras ({len(channel_data[min_col])}) em relação ao DataFrame ({len(df)}). Este canal será ignorado.")
-                continue
+                # Se o tamanho dos dados do canal for diferente do DataFrame, avisa mas não adiciona
+                if len(channel_data[min_col]) != len(df):
+                    print(f"Aviso: Canal {channel_id} tem um número diferente de amostras ({len(channel_data[min_col])}) em relação ao DataFrame ({len(df)}). Este canal será ignorado.")
+                    continue
                 
-            df[min_col] = channel_data[min_col]
-            df[max_col] = channel_data[max_col]
+                df[min_col] = channel_data[min_col]
+                df[max_col] = channel_data[max_col]
         
-        # Cria a planilha Excel e salva
-        with pd.ExcelWriter(output_filepath, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Dados GTD')
+            # Cria a planilha Excel e salva
+            with pd.ExcelWriter(output_filepath, engine='openpyxl') as writer:
+                df.to_excel(writer, index=False, sheet_name='Dados GTD')
             
-            # Adiciona uma aba de metadados
-            metadata_df = pd.DataFrame(list(self.metadata.items()), columns=['Chave', 'Valor'])
-            metadata_df.to_excel(writer, index=False, sheet_name='Metadados')
+                # Adiciona uma aba de metadados
+                metadata_df = pd.DataFrame(list(self.metadata.items()), columns=['Chave', 'Valor'])
+                metadata_df.to_excel(writer, index=False, sheet_name='Metadados')
             
-            # Adiciona uma aba de informações dos canais
-            channel_info = []
-            for channel_id, channel in sorted(self.channels.items(), key=channel_sort_key):
-                channel_info.append({
-                    'Canal ID': channel.channel_id,
-                    'Unidade': channel.unit,
-                    'Amostras': len(channel.timestamps)
-                })
+                # Adiciona uma aba de informações dos canais
+                channel_info = []
+                for channel_id, channel in sorted(self.channels.items(), key=channel_sort_key):
+                    stats = channel.stats
+                    channel_info.append({
+                        'Canal ID': channel.channel_id,
+                        'Unidade': channel.unit,
+                        'Amostras': len(channel.timestamps),
+                        'Over-range': channel.over_range_count,
+                        'Mínimo': stats.minimum,
+                        'Máximo': stats.maximum,
+                        'Média Min': stats.min_stats.to_dict()['mean'],
+                        'Média Max': stats.max_stats.to_dict()['mean'],
+                        'Desvio Padrão Max': stats.max_stats.std,
+                        'Primeira Amostra': stats.first_time,
+                        'Última Amostra': stats.last_time
+                    })
             
-            if channel_info:
-                channel_df = pd.DataFrame(channel_info)
-                channel_df.to_excel(writer, index=False, sheet_name='Informações dos Canais')
+                if channel_info:
+                    channel_df = pd.DataFrame(channel_info)
+                    channel_df.to_excel(writer, index=False, sheet_name='Informações dos Canais')
+                
+                # Adiciona uma aba com as lacunas de amostragem, se houver
+                sampling = self.check_sampling()
+                if sampling is not None and sampling.gaps:
+                    from .gaps import gaps_table
+                    gaps_table(sampling).to_excel(writer, index=False, sheet_name='Lacunas')
+        
+            stage.rows = len(df)
+        stage.bytes = os.path.getsize(output_filepath)
         
         print(f"Arquivo Excel gerado com sucesso: {output_filepath}")
 
-    def export_to_json(self, output_filepath: str) -> None:
+    def column_channels(self) -> Dict[str, Channel]:
         """
-        Exporta os dados processados para um arquivo JSON.
+        Mapeia os nomes de coluna usados nas exportações e no DataFrame
+        (Ch{id}_Min_{unidade} / Ch{id}_Max_{unidade}) para os objetos Channel.
+        
+        Returns:
+            Dicionário {nome da coluna -> Channel}
+        """
+        columns = {}
+        for channel_id, channel in self.channels.items():
+            columns[f"Ch{channel_id}_Min_{channel.unit}"] = channel
+            columns[f"Ch{channel_id}_Max_{channel.unit}"] = channel
+        return columns
+    
+    def column_stats(self) -> Dict[str, 'RunningStats']:
+        """
+        Retorna as estatísticas de ingestão de cada coluna Min/Max, sem reler os dados.
+        
+        Returns:
+            Dicionário {nome da coluna -> RunningStats}
+        """
+        columns = {}
+        for channel_id, channel in self.channels.items():
+            columns[f"Ch{channel_id}_Min_{channel.unit}"] = channel.stats.min_stats
+            columns[f"Ch{channel_id}_Max_{channel.unit}"] = channel.stats.max_stats
+        return columns
+    
+    def column_distributions(self) -> Dict[str, 'ValueDistribution']:
+        """
+        Retorna as distribuições de ingestão (percentis e histograma) de cada coluna
+        Min/Max, sem reler os dados.
+        
+        Returns:
+            Dicionário {nome da coluna -> ValueDistribution}
+        """
+        columns = {}
+        for channel_id, channel in self.channels.items():
+            columns[f"Ch{channel_id}_Min_{channel.unit}"] = channel.stats.min_distribution
+            columns[f"Ch{channel_id}_Max_{channel.unit}"] = channel.stats.max_distribution
+        return columns
+    
+    def axis_range(self, columns: Optional[List[str]] = None, low: float = 1, high: float = 99,
+                   margin: float = 0.05) -> Optional[Tuple[float, float]]:
+        """
+        Faixa robusta do eixo Y para as colunas exibidas, a partir dos percentis
+        mantidos na ingestão (ver sketches.robust_range): picos isolados não achatam o
+        gráfico e nenhuma coluna precisa ser relida.
         
         Args:
-            output_filepath: Caminho para o arquivo JSON de saída
+            columns: Colunas Min/Max exibidas (padrão: todas)
+            low: Percentil inferior (0 a 100)
+            high: Percentil superior (0 a 100)
+            margin: Margem de cada lado, como fração da faixa
+        
+        Returns:
+            Tupla (mínimo, máximo), ou None se as colunas não tiverem valores
         """
-        # Se não tiver extensão .json, adiciona
-        if not output_filepath.lower().endswith('.json'):
-            output_filepath += '.json'
+        from .sketches import robust_range
+        
+        distributions = self.column_distributions()
+        if columns is None:
+            columns = list(distributions)
+        return robust_range([distributions[column] for column in columns if column in distributions],
+                            low=low, high=high, margin=margin)
+    
+    def snapshot(self) -> 'GTDProcessor':
+        """
+        Cria uma visão somente leitura do estado atual para exportações concorrentes:
+        compartilha os objetos Channel (sem copiar amostras) e as métricas, com
+        dicionários próprios de canais e metadados. Os arrays numpy dos canais são
+        preparados antes, para que as threads de exportação apenas leiam os dados.
         
+        Returns:
+            Um novo GTDProcessor que compartilha os dados deste
+        """
+        snapshot = GTDProcessor(engine=self.engine)
+        snapshot.metrics = self.metrics
+        snapshot.metadata = dict(self.metadata)
+        snapshot.recorders = dict(self.recorders)
+        snapshot.trigger_time = self.trigger_time
+        snapshot.channels = dict(self.channels)
+        snapshot.math_channels = dict(self.math_channels)
+        snapshot.channel_arrays()
+        return snapshot
+    
+    def add_math_channel(self, channel_id: str, expression: str, unit: Optional[str] = None) -> Channel:
+        """
+        Define um canal derivado por uma expressão sobre os canais existentes (ex:
+        "Ch1 - Ch10" ou "mean(Ch1, Ch2, Ch3)"; ver models.math_channels). O canal é
+        calculado de forma vetorizada e adicionado a self.channels, participando de
+        gráficos, estatísticas e exportações como um canal real.
+        
+        Args:
+            channel_id: ID do canal derivado
+            expression: Expressão sobre os canais (referências Ch<id>)
+            unit: Unidade do resultado (padrão: a do primeiro canal referenciado)
+            
+        Returns:
+            O Channel calculado
+        """
+        from .math_channels import MathChannel
+        
+        math_channel = MathChannel(channel_id, expression, list(self.channels), unit=unit)
+        self._mutations += 1
+        self.math_channels[channel_id] = math_channel
+        self.channels[channel_id] = math_channel.evaluate(self)
+        return self.channels[channel_id]
+    
+    def remove_math_channel(self, channel_id: str) -> None:
+        """
+        Remove um canal derivado (e os que dependem dele).
+        
+        Args:
+            channel_id: ID do canal derivado
+        """
+        self._mutations += 1
+        removed = {channel_id}
+        for other_id, math_channel in list(self.math_channels.items()):
+            if other_id in removed or removed & set(math_channel.dependencies):
+                removed.add(other_id)
+                del self.math_channels[other_id]
+                self.channels.pop(other_id, None)
+    
+    def refresh_math_channels(self) -> None:
+        """Recalcula os canais derivados, na ordem de definição (usa o cache quando nada mudou)"""
+        self._mutations += 1
+        for channel_id, math_channel in self.math_channels.items():
+            self.channels[channel_id] = math_channel.evaluate(self)
+    
+    def channel_arrays(self, channel_ids: Optional[List] = None) -> Dict:
+        """
+        Converte os canais com amostras em arrays numpy (ver Channel.as_arrays),
+        reaproveitando o array de timestamps entre canais com a mesma linha do tempo.
+        
+        Args:
+            channel_ids: Canais a incluir (padrão: todos)
+            
+        Returns:
+            Dicionário {channel_id -> (timestamps, mínimos, máximos)}
+        """
+        ids = channel_ids if channel_ids is not None else list(self.channels)
+        arrays = {}
+        previous = None
+        for channel_id in ids:
+            channel = self.channels[channel_id]
+            if channel.timestamps:
+                arrays[channel_id] = channel.as_arrays(like=previous)
+                previous = channel
+        return arrays
+    
+    def time_indexes(self, channel_ids: Optional[List] = None) -> Dict:
+        """
+        Índices de tempo implícitos dos canais com amostras (ver Channel.time_index).
+        Canais com a mesma linha do tempo compartilham o mesmo TimeIndex.
+        
+        Args:
+            channel_ids: Canais a incluir (padrão: todos)
+            
+        Returns:
+            Dicionário {channel_id -> TimeIndex}
+        """
+        self.channel_arrays(channel_ids)
+        indexes = {}
+        previous = None
+        for channel_id in (channel_ids if channel_ids is not None else list(self.channels)):
+            channel = self.channels[channel_id]
+            if channel.timestamps:
+                indexes[channel_id] = channel.time_index(like=previous)
+                previous = channel
+        return indexes
+    
+    def to_matrix(self, channel_ids: Optional[List] = None) -> Tuple:
+        """
+        Alinha os canais com amostras em uma matriz (amostras x canais) sobre a união
+        ordenada dos timestamps. Posições sem amostra do canal ficam com NaN.
+        
+        Args:
+            channel_ids: Canais a incluir (padrão: todos com amostras)
+            
+        Returns:
+            Tupla (timestamps datetime64[us], IDs dos canais, mínimos T x C, máximos T x C)
+        """
+        import numpy as np
+        
+        channel_arrays = self.channel_arrays(channel_ids)
+        ids, arrays = list(channel_arrays), list(channel_arrays.values())
+        if not arrays:
+            return np.empty(0, dtype='datetime64[us]'), [], np.empty((0, 0)), np.empty((0, 0))
+        
+        # Caso comum: todos os canais compartilham a mesma linha do tempo, já ordenada
+        first = arrays[0][0]
+        if all(timestamps is first for timestamps, _, _ in arrays) and np.all(first[1:] > first[:-1]):
+            return first, ids, np.column_stack([a[1] for a in arrays]), np.column_stack([a[2] for a in arrays])
+        
+        times = np.unique(np.concatenate([timestamps for timestamps, _, _ in arrays]))
+        mins = np.full((len(times), len(ids)), np.nan)
+        maxs = np.full((len(times), len(ids)), np.nan)
+        for column, (timestamps, channel_mins, channel_maxs) in enumerate(arrays):
+            positions = np.searchsorted(times, timestamps)
+            mins[positions, column] = channel_mins
+            maxs[positions, column] = channel_maxs
+        return times, ids, mins, maxs
+    
+    @property
+    def data_version(self) -> Tuple:
+        """
+        Versão dos dados: muda a cada alteração feita pelo processador (amostras, merge e
+        canais derivados, mesmo que um canal seja trocado por outro de mesmo tamanho) e
+        também quando amostras são adicionadas diretamente aos canais.
+        """
+        return self._mutations, tuple((channel_id, len(channel.timestamps))
+                                      for channel_id, channel in self.channels.items())
+    
+    def correlation(self, channel_ids: Optional[List] = None, interval=None, start=None, end=None,
+                    series: str = "mid", max_lag=None) -> 'CorrelationResult':
+        """
+        Correlação de Pearson e atraso térmico (correlação cruzada por FFT) entre todos os
+        pares de canais, em uma passada vetorizada sobre a matriz alinhada (ver
+        models.correlation). O resultado fica em cache até que os dados mudem.
+        
+        Args:
+            channel_ids: Canais a incluir (padrão: todos com amostras)
+            interval: Reamostragem por média antes da análise (ex: "1 min"), ou None
+            start: Início da janela de tempo, ou None
+            end: Fim da janela de tempo, ou None
+            series: Série analisada: 'min', 'max' ou 'mid' (ponto médio)
+            max_lag: Maior atraso procurado (ex: "30 min"; padrão: um quarto da janela)
+            
+        Returns:
+            Um CorrelationResult
+        """
+        from .correlation import analyze
+        
+        key = ("correlation", tuple(channel_ids) if channel_ids is not None else None, interval,
+               start, end, series, max_lag)
+        return self._cached_analysis(key, lambda: analyze(self, channel_ids, interval=interval, start=start,
+                                                          end=end, series=series, max_lag=max_lag))
+    
+    def _cached_analysis(self, key: Tuple, compute):
+        """
+        Resultado de uma análise em cache por parâmetros, recalculado quando os dados mudam
+        (ver data_version). Resultados de versões anteriores são descartados.
+        
+        Args:
+            key: Nome da análise e seus parâmetros
+            compute: Função sem argumentos que calcula o resultado
+            
+        Returns:
+            O resultado da análise
+        """
+        version = self.data_version
+        cached = self._analysis_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = compute()
+        self._analysis_cache = {params: entry for params, entry in self._analysis_cache.items()
+                                if entry[0] == version}
+        self._analysis_cache[key] = (version, result)
+        return result
+    
+    def health_events(self, **options) -> 'pandas.DataFrame':
+        """
+        Detecta flatlines, leituras travadas, diferenças Min-Max anormais e picos de taxa
+        de variação em todos os canais (ver models.health.detect_health_events). O
+        resultado fica em cache até que os dados mudem.
+        
+        Args:
+            **options: Parâmetros de detect_health_events (janelas e fatores)
+            
+        Returns:
+            DataFrame compacto com um evento por linha
+        """
+        from .health import detect_health_events
+        
+        key = ("health", tuple(sorted(options.items())))
+        return self._cached_analysis(key, lambda: detect_health_events(*self.to_matrix(), **options))
+    
+    def alarm_events(self, rules: List['AlarmRule']) -> 'pandas.DataFrame':
+        """
+        Avalia regras de limite (com histerese e duração mínima) sobre todos os dados
+        (ver models.alarms; para avaliar apenas amostras novas, use AlarmEngine.update).
+        
+        Args:
+            rules: Regras de alarme (AlarmRule)
+        
+        Returns:
+            DataFrame com um evento por linha (início, fim, duração e pico)
+        """
+        from .alarms import evaluate_alarms
+        
+        return evaluate_alarms(self, rules)
+    
+    @property
+    def sampling_interval(self) -> Optional['numpy.timedelta64']:
+        """Intervalo de amostragem declarado no cabeçalho, ou None se ausente ou ilegível"""
+        return self._declared_interval(self.metadata.get("Sampling Interval"))
+    
+    @staticmethod
+    def _declared_interval(value) -> Optional['numpy.timedelta64']:
+        """Converte um "Sampling Interval" do cabeçalho, ou None se ausente ou ilegível"""
+        from .resample import parse_interval
+        
+        if not value:
+            return None
+        try:
+            return parse_interval(value)
+        except ValueError:
+            return None
+    
+    def check_sampling(self, interval=None, gap_factor: float = 1.5) -> Optional['SamplingReport']:
+        """
+        Verifica lacunas, duplicatas e jitter da linha do tempo do conjunto de dados: o
+        relatório do registrador com mais amostras (ver check_sampling_by_recorder).
+        
+        Args:
+            interval: Intervalo esperado (padrão: o do cabeçalho; se ausente, inferido)
+            gap_factor: Uma diferença maior ou igual a gap_factor * intervalo é uma lacuna
+            
+        Returns:
+            Um SamplingReport, ou None se não houver canais com amostras
+        """
+        reports = self.check_sampling_by_recorder(interval=interval, gap_factor=gap_factor)
+        if not reports:
+            return None
+        return max(reports.values(), key=lambda report: report.samples)
+    
+    def check_sampling_by_recorder(self, interval=None, gap_factor: float = 1.5) -> Dict[str, 'SamplingReport']:
+        """
+        Verifica a regularidade da amostragem de cada registrador: a linha do tempo do seu
+        canal com mais amostras, em relação ao "Sampling Interval" do próprio cabeçalho
+        (registradores com intervalos diferentes não são comparados com o mesmo intervalo).
+        Canais sem registrador conhecido (ex: importados de JSON) são verificados juntos,
+        com o intervalo dos metadados, sob a chave ''.
+        
+        Args:
+            interval: Intervalo esperado para todos (padrão: o de cada cabeçalho; se ausente, inferido)
+            gap_factor: Uma diferença maior ou igual a gap_factor * intervalo é uma lacuna
+            
+        Returns:
+            Dicionário {número de série -> SamplingReport} dos registradores com amostras
+        """
+        from .gaps import check_sampling
+        
+        groups = [(serial, info.get("Sampling Interval"), info["channels"]) for serial, info in self.recorders.items()]
+        known = {channel_id for _, _, channel_ids in groups for channel_id in channel_ids}
+        others = [channel_id for channel_id in self.channels
+                  if channel_id not in known and channel_id not in self.math_channels]
+        if others:
+            groups.append(("", self.metadata.get("Sampling Interval"), others))
+        
+        reports = {}
+        for serial, declared_value, channel_ids in groups:
+            channels = [self.channels[channel_id] for channel_id in channel_ids
+                        if channel_id in self.channels and self.channels[channel_id].timestamps]
+            if not channels:
+                continue
+            base_channel = max(channels, key=lambda channel: len(channel.timestamps))
+            declared = self._declared_interval(declared_value) if interval is None else None
+            report = check_sampling(base_channel.as_arrays()[0], interval=interval if interval is not None else declared,
+                                    gap_factor=gap_factor)
+            if declared is not None:
+                report.interval_source = "header"
+            reports[serial] = report
+        return reports
+    
+    def resample(self, interval, agg: Tuple[str, ...] = ("min", "max", "mean", "count"),
+                 channel_ids: Optional[List] = None, origin=None) -> 'pandas.DataFrame':
+        """
+        Reamostra todos os canais em buckets de tempo (ex: 10 s -> 1 min -> 1 h) com
+        reduções vetorizadas, alinhando os canais em um eixo de tempo comum.
+        Colunas: Timestamp (início do bucket), Ch{id}_Min_{unidade} (mínimo dos mínimos),
+        Ch{id}_Max_{unidade} (máximo dos máximos), Ch{id}_MeanMin_/_MeanMax_{unidade}
+        e Ch{id}_Count, conforme as agregações pedidas.
+        
+        Args:
+            interval: Largura do bucket ("1 min", "1 h", segundos ou timedelta)
+            agg: Agregações (ver models.resample.AGGREGATIONS)
+            channel_ids: Canais a incluir (padrão: todos com amostras)
+            origin: Início do bucket 0 (padrão: múltiplos do intervalo)
+            
+        Returns:
+            DataFrame com um bucket por linha
+        """
+        import numpy as np
+        import pandas as pd
+        from .resample import resample_series, align_buckets
+        
+        series = {channel_id: resample_series(*arrays, interval, agg=agg, origin=origin)
+                  for channel_id, arrays in self.channel_arrays(channel_ids).items()}
+        
+        axis, positions = align_buckets(series)
+        columns = {"Timestamp": axis}
+        names = {"min": "Min", "max": "Max", "mean_min": "MeanMin", "mean_max": "MeanMax",
+                 "first_min": "FirstMin", "first_max": "FirstMax",
+                 "last_min": "LastMin", "last_max": "LastMax"}
+        for channel_id, result in series.items():
+            unit = self.channels[channel_id].unit
+            for key, values in result.items():
+                if key == "time":
+                    continue
+                if key == "count":
+                    column = np.zeros(len(axis), dtype=np.int64)
+                    name = f"Ch{channel_id}_Count"
+                else:
+                    column = np.full(len(axis), np.nan)
+                    name = f"Ch{channel_id}_{names[key]}_{unit}"
+                column[positions[channel_id]] = values
+                columns[name] = column
+        
+        return pd.DataFrame(columns)
+    
+    def downsample(self, interval, origin=None) -> 'GTDProcessor':
+        """
+        Cria um novo processador com os canais reamostrados preservando o envelope:
+        cada bucket vira uma amostra com o mínimo dos mínimos e o máximo dos máximos.
+        Todas as exportações funcionam normalmente sobre o resultado.
+        
+        Args:
+            interval: Largura do bucket ("1 min", "1 h", segundos ou timedelta)
+            origin: Início do bucket 0 (padrão: múltiplos do intervalo)
+            
+        Returns:
+            Um novo GTDProcessor com os dados reamostrados
+        """
+        from .resample import resample_series
+        
+        result = GTDProcessor(engine=self.engine)
+        result.metadata = dict(self.metadata)
+        result.recorders = dict(self.recorders)
+        result.trigger_time = self.trigger_time
+        for channel_id, channel in self.channels.items():
+            downsampled = Channel(channel_id, channel.unit)
+            if channel.timestamps:
+                buckets = resample_series(*channel.as_arrays(), interval, agg=("min", "max"), origin=origin)
+                downsampled.extend_samples(buckets["time"].tolist(), buckets["min"].tolist(),
+                                           buckets["max"].tolist())
+            downsampled.over_range_count = channel.over_range_count
+            result.channels[channel_id] = downsampled
+        return result
+    
+    def align(self, interval=None, channel_ids: Optional[List] = None, method: str = "asof",
+              tolerance=None, start=None, end=None) -> 'pandas.DataFrame':
+        """
+        Alinha os canais (inclusive de registradores com intervalos diferentes, ex: 10 s
+        e 2 min) em um eixo de tempo comum, com junção as-of (última amostra até cada
+        instante) ou interpolação linear, de forma vetorizada (ver models.recorders).
+        Colunas: Timestamp e Ch{id}_Min_{unidade} / Ch{id}_Max_{unidade}.
+        
+        Args:
+            interval: Passo do eixo (padrão: o do registrador mais lento)
+            channel_ids: Canais a incluir (padrão: todos com amostras)
+            method: 'asof' ou 'linear'
+            tolerance: Distância máxima até a amostra usada (padrão: 1.5 x o passo de cada canal)
+            start: Início do eixo (padrão: primeiro timestamp)
+            end: Fim do eixo (padrão: último timestamp)
+            
+        Returns:
+            DataFrame com um instante do eixo por linha
+        """
+        import pandas as pd
+        from .recorders import align_series, common_grid
+        
+        arrays = self.channel_arrays(channel_ids)
+        grid = common_grid(arrays, interval=interval, start=start, end=end)
+        columns = {"Timestamp": grid}
+        for channel_id, (timestamps, mins, maxs) in arrays.items():
+            unit = self.channels[channel_id].unit
+            aligned_mins, aligned_maxs = align_series(timestamps, mins, maxs, grid, method=method,
+                                                      tolerance=tolerance)
+            columns[f"Ch{channel_id}_Min_{unit}"] = aligned_mins
+            columns[f"Ch{channel_id}_Max_{unit}"] = aligned_maxs
+        return pd.DataFrame(columns)
+    
+    def envelope(self, channel_ids: Optional[List] = None, max_points: int = 2000,
+                 interval=None) -> Dict:
+        """
+        Prepara a visualização em faixa (envelope Min/Max) de cada canal: um único
+        polígono por canal, decimado preservando o mínimo dos mínimos e o máximo dos
+        máximos de cada bucket (ver models.envelope).
+        
+        Args:
+            channel_ids: Canais a incluir (padrão: todos com amostras)
+            max_points: Quantidade máxima de pontos por faixa
+            interval: Largura fixa dos buckets (opcional, ex: "10 min")
+            
+        Returns:
+            Dicionário {channel_id -> (x, y, pontos)} com os vértices de cada faixa
+        """
+        from .envelope import envelope_trace_data
+        
+        sampling_interval = self.sampling_interval
+        return {channel_id: envelope_trace_data(*arrays, max_points=max_points, interval=interval,
+                                                sampling_interval=sampling_interval)
+                for channel_id, arrays in self.channel_arrays(channel_ids).items()}
+    
+    def to_dataframe(self) -> Optional['pandas.DataFrame']:
+        """
+        Monta o DataFrame usado na visualização: a coluna Timestamp do canal com
+        mais amostras e as colunas Min/Max de todos os canais com o mesmo número de amostras.
+        
+        Returns:
+            DataFrame com os dados, ou None se não houver canais com amostras
+        """
+        if not self.channels:
+            return None
+        
+        # Obtém o canal com mais amostras para usar como base dos timestamps
+        max_samples = 0
+        base_channel = None
+        for channel in self.channels.values():
+            if len(channel.timestamps) > max_samples:
+                max_samples = len(channel.timestamps)
+                base_channel = channel
+        
+        if base_channel is None:
+            return None
+        
+        import pandas as pd
+        
+        df_data = {'Timestamp': base_channel.timestamps}
+        
+        # Adiciona os dados de todos os canais com o mesmo número de amostras
+        for channel_id, channel in self.channels.items():
+            if len(channel.timestamps) == max_samples:
+                df_data[f"Ch{channel_id}_Min_{channel.unit}"] = channel.samples_min
+                df_data[f"Ch{channel_id}_Max_{channel.unit}"] = channel.samples_max
+        
+        return pd.DataFrame(df_data)
+
+    def to_json_dict(self) -> Dict:
+        """
+        Monta o dicionário exportado em JSON: metadados, regularidade da amostragem
+        (lacunas, duplicatas e jitter) e os canais.
+        
+        Returns:
+            Dicionário serializável em JSON
+        """
         # Cria um dicionário com metadados e canais
         data_to_export = {
             "metadata": self.metadata,
             "channels": {}
         }
         
+        # Registra o instante do Trigger Point (origem dos ensaios)
+        if self.trigger_time is not None:
+            data_to_export["trigger_time"] = self.trigger_time.isoformat()
+        
+        # Registra a regularidade da amostragem
+        sampling = self.check_sampling_by_recorder()
+        if sampling:
+            data_to_export["sampling"] = max(sampling.values(), key=lambda report: report.samples).to_dict()
+            if len(sampling) > 1:
+                data_to_export["sampling_by_recorder"] = {serial: report.to_dict()
+                                                          for serial, report in sampling.items()}
+        
+        # Registra as expressões dos canais derivados
+        if self.math_channels:
+            data_to_export["math_channels"] = {str(channel_id): math_channel.to_dict()
+                                               for channel_id, math_channel in self.math_channels.items()}
+        
         # Adiciona cada canal ao dicionário
         for channel_id, channel in self.channels.items():
             # Converte o canal para dicionário JSON usando o método to_json
             data_to_export["channels"][str(channel_id)] = channel.to_json()
         
+        return data_to_export
+    
+    def export_to_json(self, output_filepath: str) -> None:
+        """
+        Exporta os dados processados para um arquivo JSON.
+        
+        Args:
+            output_filepath: Caminho para o arquivo JSON de saída
+        """
+        # Se não tiver extensão .json, adiciona
+        if not output_filepath.lower().endswith('.json'):
+            output_filepath += '.json'
+        
         # Salva o dicionário como JSON
-        with open(output_filepath, 'w', encoding='utf-8') as f:
-            json.dump(data_to_export, f, indent=4)
+        with self.metrics.stage("export_json", source=output_filepath) as stage:
+            data_to_export = self.to_json_dict()
+            with open(output_filepath, 'w', encoding='utf-8') as f:
+                json.dump(data_to_export, f, indent=4)
+            stage.rows = sum(len(channel.timestamps) for channel in self.channels.values())
+        stage.bytes = os.path.getsize(output_filepath)
         
         print(f"Arquivo JSON gerado com sucesso: {output_filepath}")
     
+    def export_to_csv(self, output_filepath: str, timestamp_format: str = "%Y-%m-%d %H:%M:%S",
+                      delimiter: str = ",", decimal: str = ".", workers: Optional[int] = None,
+                      partition=None, encoding: str = "utf-8") -> None:
+        """
+        Exporta os dados processados para um arquivo CSV, com as mesmas colunas
+        do DataFrame de visualização. As linhas são formatadas em blocos vetorizados
+        (ver models.csv_export), opcionalmente em processos paralelos.
+        
+        Args:
+            output_filepath: Caminho para o arquivo CSV de saída
+            timestamp_format: Formato dos timestamps (strftime)
+            delimiter: Separador de colunas (ex: ';' para o Excel em português)
+            decimal: Separador decimal (ex: ',')
+            workers: Processos de formatação (None formata no processo atual)
+            partition: Se informado (ex: "1 d"), grava um arquivo por intervalo de tempo
+            encoding: 'utf-8' ou 'utf-8-sig' (com BOM, reconhecido pelo Excel)
+        """
+        from .csv_export import write_csv
+        
+        # Se não tiver extensão .csv, adiciona
+        if not output_filepath.lower().endswith('.csv'):
+            output_filepath += '.csv'
+        
+        with self.metrics.stage("export_csv", source=output_filepath) as stage:
+            paths = write_csv(self, output_filepath, timestamp_format=timestamp_format, delimiter=delimiter,
+                              decimal=decimal, workers=workers, partition=partition, encoding=encoding)
+            if not paths:
+                print("Aviso: Nenhum canal com dados foi encontrado.")
+                return
+            stage.rows = max(len(channel.timestamps) for channel in self.channels.values())
+        stage.bytes = sum(os.path.getsize(path) for path in paths)
+        
+        for path in paths:
+            print(f"Arquivo CSV gerado com sucesso: {path}")
+    
+    def export_to_columnar(self, output_filepath: str, encoding: str = 'fixed') -> None:
+        """
+        Exporta os dados processados para um arquivo colunar compactado (.npz do numpy),
+        com um array de timestamps, mínimos e máximos por canal. É muito menor e mais
+        rápido de carregar que o JSON, e preserva o tipo dos IDs de canal.
+        
+        Os valores são gravados na representação compacta de models.encoding (ex: int16
+        escalado para leituras com uma casa decimal), escolhida por série e sempre
+        exata; séries que não passam na verificação de precisão ficam em float64. Os
+        timestamps são gravados como índices de tempo implícitos (models.time_index),
+        um por linha do tempo, compartilhados pelos canais que a usam.
+        
+        Args:
+            output_filepath: Caminho para o arquivo .npz de saída
+            encoding: Codificação dos valores: 'fixed', 'float32' ou 'float64'
+        """
+        from .encoding import encode_values
+        
+        # Se não tiver extensão .npz, adiciona
+        if not output_filepath.lower().endswith('.npz'):
+            output_filepath += '.npz'
+        
+        import numpy as np
+        
+        with self.metrics.stage("export_columnar", source=output_filepath) as stage:
+            arrays = {}
+            channels_info = []
+            time_indexes = self.time_indexes()
+            stored = {}  # {id(TimeIndex) -> posição no arquivo}
+            for index, (channel_id, channel) in enumerate(self.channels.items()):
+                _, mins, maxs = channel.as_arrays()
+                encoded_min = encode_values(mins, encoding)
+                encoded_max = encode_values(maxs, encoding)
+                time_index = time_indexes.get(channel_id)
+                if time_index is not None and id(time_index) not in stored:
+                    position = stored[id(time_index)] = len(stored)
+                    arrays[f"ti_{position}_starts"] = time_index.starts
+                    arrays[f"ti_{position}_steps"] = time_index.steps
+                    arrays[f"ti_{position}_counts"] = time_index.counts
+                arrays[f"min_{index}"] = encoded_min.data
+                arrays[f"max_{index}"] = encoded_max.data
+                channels_info.append({"channel_id": channel_id, "unit": channel.unit,
+                                      "over_range_count": channel.over_range_count,
+                                      "time_index": stored.get(id(time_index)),
+                                      "min_encoding": encoded_min.params(),
+                                      "max_encoding": encoded_max.params()})
+                stage.rows += len(channel.timestamps)
+            
+            manifest = {"format": "gtd-columnar", "version": 3,
+                        "metadata": self.metadata, "channels": channels_info,
+                        "trigger_time": self.trigger_time.isoformat() if self.trigger_time else None}
+            arrays["manifest"] = np.array(json.dumps(manifest))
+            np.savez_compressed(output_filepath, **arrays)
+        stage.bytes = os.path.getsize(output_filepath)
+        
+        print(f"Arquivo colunar gerado com sucesso: {output_filepath}")
+    
+    @staticmethod
+    def import_from_columnar(filepath: str) -> 'GTDProcessor':
+        """
+        Cria um novo processador GTD a partir de um arquivo gerado por export_to_columnar.
+        
+        Args:
+            filepath: Caminho para o arquivo .npz
+            
+        Returns:
+            Um novo objeto GTDProcessor com os dados carregados
+        """
+        import numpy as np
+        from .encoding import decode_values
+        from .time_index import TimeIndex
+        
+        # Arquivos da versão 1 gravavam os valores sempre em float64
+        plain = {"dtype": "float64", "decimals": None}
+        
+        processor = GTDProcessor()
+        with np.load(filepath, allow_pickle=False) as data:
+            manifest = json.loads(str(data["manifest"]))
+            processor.metadata = manifest.get("metadata", {})
+            if manifest.get("trigger_time"):
+                processor.trigger_time = datetime.fromisoformat(manifest["trigger_time"])
+            timelines = {}  # Timestamps de cada índice de tempo, expandidos uma única vez
+            for index, info in enumerate(manifest["channels"]):
+                position = info.get("time_index")
+                if f"ts_{index}" in data:
+                    timestamps = data[f"ts_{index}"].tolist()  # Versões 1 e 2
+                elif position is None:
+                    timestamps = []
+                else:
+                    if position not in timelines:
+                        timelines[position] = TimeIndex(data[f"ti_{position}_starts"], data[f"ti_{position}_steps"],
+                                                        data[f"ti_{position}_counts"]).to_list()
+                    timestamps = timelines[position]
+                channel = Channel(info["channel_id"], info["unit"])
+                channel.extend_samples(timestamps,
+                                       decode_values(data[f"min_{index}"], info.get("min_encoding", plain)).tolist(),
+                                       decode_values(data[f"max_{index}"], info.get("max_encoding", plain)).tolist())
+                channel.over_range_count = info.get("over_range_count", 0)
+                processor.channels[info["channel_id"]] = channel
+        
+        return processor
+    
+    def export_to_archive(self, output_filepath: str, chunk="1 d", codec: str = 'zlib') -> None:
+        """
+        Exporta os dados para o arquivo de arquivamento de longo prazo (models.archive):
+        chunks de tempo de duração fixa, codificados e comprimidos em paralelo, com um
+        índice que permite ler apenas os chunks de uma janela de tempo.
+        
+        Args:
+            output_filepath: Caminho para o arquivo .gtda de saída
+            chunk: Duração de cada chunk (ex: "1 d", "6 h")
+            codec: Compressor: 'zlib' ou 'lzma'
+        """
+        from .archive import write_archive
+        
+        # Se não tiver extensão .gtda, adiciona
+        if not output_filepath.lower().endswith('.gtda'):
+            output_filepath += '.gtda'
+        
+        with self.metrics.stage("export_archive", source=output_filepath) as stage:
+            write_archive(self, output_filepath, chunk=chunk, codec=codec)
+            stage.rows = sum(len(channel.timestamps) for channel in self.channels.values())
+        stage.bytes = os.path.getsize(output_filepath)
+        
+        print(f"Arquivo de arquivamento gerado com sucesso: {output_filepath}")
+    
+    @staticmethod
+    def import_from_archive(filepath: str, start=None, end=None,
+                            channel_ids: Optional[List] = None) -> 'GTDProcessor':
+        """
+        Cria um novo processador GTD a partir de um arquivo gerado por export_to_archive,
+        descomprimindo apenas os chunks que cruzam a janela de tempo pedida.
+        
+        Args:
+            filepath: Caminho para o arquivo .gtda
+            start: Início da janela (inclusive), ou None
+            end: Fim da janela (inclusive), ou None
+            channel_ids: Canais a carregar (padrão: todos)
+            
+        Returns:
+            Um novo objeto GTDProcessor com os dados da janela
+        """
+        from .archive import ArchiveReader
+        
+        return ArchiveReader(filepath).read(channel_ids, start=start, end=end)
+    
+    def export_to_parquet(self, output_filepath: str) -> None:
+        """
+        Exporta os dados para Parquet (requer pyarrow), com um row group por dia e o
+        cabeçalho do GTD e as informações dos canais nos metadados do schema.
+        
+        Args:
+            output_filepath: Caminho para o arquivo .parquet de saída
+        """
+        from .arrow_io import write_parquet
+        
+        # Se não tiver extensão .parquet, adiciona
+        if not output_filepath.lower().endswith('.parquet'):
+            output_filepath += '.parquet'
+        
+        with self.metrics.stage("export_parquet", source=output_filepath) as stage:
+            stage.rows = write_parquet(self, output_filepath)
+        stage.bytes = os.path.getsize(output_filepath)
+        
+        print(f"Arquivo Parquet gerado com sucesso: {output_filepath}")
+    
+    def export_to_feather(self, output_filepath: str) -> None:
+        """
+        Exporta os dados para Feather (requer pyarrow), com um record batch por dia e o
+        cabeçalho do GTD e as informações dos canais nos metadados do schema.
+        
+        Args:
+            output_filepath: Caminho para o arquivo .feather de saída
+        """
+        from .arrow_io import write_feather
+        
+        # Se não tiver extensão .feather, adiciona
+        if not output_filepath.lower().endswith('.feather'):
+            output_filepath += '.feather'
+        
+        with self.metrics.stage("export_feather", source=output_filepath) as stage:
+            stage.rows = write_feather(self, output_filepath)
+        stage.bytes = os.path.getsize(output_filepath)
+        
+        print(f"Arquivo Feather gerado com sucesso: {output_filepath}")
+    
+    @staticmethod
+    def import_from_parquet(filepath: str, channel_ids: Optional[List] = None,
+                            start=None, end=None) -> 'GTDProcessor':
+        """
+        Cria um novo processador GTD a partir de um arquivo gerado por export_to_parquet,
+        lendo apenas as colunas dos canais pedidos e os row groups da janela de tempo.
+        
+        Args:
+            filepath: Caminho para o arquivo .parquet
+            channel_ids: Canais a carregar (padrão: todos)
+            start: Início da janela (inclusive), ou None
+            end: Fim da janela (inclusive), ou None
+            
+        Returns:
+            Um novo objeto GTDProcessor com os dados carregados
+        """
+        from .arrow_io import read_parquet
+        
+        return read_parquet(filepath, channel_ids=channel_ids, start=start, end=end)
+    
+    @staticmethod
+    def import_from_feather(filepath: str, channel_ids: Optional[List] = None,
+                            start=None, end=None) -> 'GTDProcessor':
+        """
+        Cria um novo processador GTD a partir de um arquivo gerado por export_to_feather,
+        montando apenas as colunas dos canais pedidos e os record batches da janela de tempo.
+        
+        Args:
+            filepath: Caminho para o arquivo .feather
+            channel_ids: Canais a carregar (padrão: todos)
+            start: Início da janela (inclusive), ou None
+            end: Fim da janela (inclusive), ou None
+            
+        Returns:
+            Um novo objeto GTDProcessor com os dados carregados
+        """
+        from .arrow_io import read_feather
+        
+        return read_feather(filepath, channel_ids=channel_ids, start=start, end=end)
+    
     @staticmethod
     def import_from_json(json_filepath: str) -> 'GTDProcessor':
         """
@@ -413,6 +1602,8 @@ class GTDProcessor:
         
         # Carrega os metadados
         processor.metadata = data.get("metadata", {})
+        if data.get("trigger_time"):
+            processor.trigger_time = datetime.fromisoformat(data["trigger_time"])
         
         # Carrega os canais
         channels_data = data.get("channels", {})
@@ -420,68 +1611,138 @@ class GTDProcessor:
             # Converte os dados JSON em um objeto Channel
             processor.channels[channel_id] = Channel.from_json(channel_data)
         
+        # Restaura as definições dos canais derivados, recalculando-os
+        for channel_id, definition in data.get("math_channels", {}).items():
+            processor.channels.pop(channel_id, None)
+            processor.add_math_channel(channel_id, definition["expression"], unit=definition.get("unit"))
+        
         return processor
 
-def process_gtd_directory(directory: str, output_filepath: str) -> None:
+# Formatos de saída suportados: nome -> (extensão, método de exportação)
+OUTPUT_FORMATS = {
+    'xlsx': ('.xlsx', 'export_to_excel'),
+    'json': ('.json', 'export_to_json'),
+    'columnar': ('.npz', 'export_to_columnar'),
+    'csv': ('.csv', 'export_to_csv'),
+    'archive': ('.gtda', 'export_to_archive'),
+    'parquet': ('.parquet', 'export_to_parquet'),  # Requer pyarrow
+    'feather': ('.feather', 'export_to_feather'),  # Requer pyarrow
+}
+
+
+def find_gtd_files(directory: str, recursive: bool = False) -> List[str]:
     """
-    Processa todos os arquivos GTD em um diretório.
+    Procura os arquivos GTD de um diretório.
     
     Args:
-        directory: Caminho para o diretório contendo arquivos GTD
-        output_filepath: Caminho para o arquivo de saída (base para Excel e JSON)
+        directory: Caminho para o diretório
+        recursive: Se True, inclui os subdiretórios
+        
+    Returns:
+        Lista ordenada com os caminhos dos arquivos .GTD encontrados
     """
-    processor = GTDProcessor()
-    
-    # Encontra todos os arquivos .GTD no diretório
     gtd_files = []
-    for file in os.listdir(directory):
-        if file.lower().endswith('.gtd'):
-            gtd_files.append(os.path.join(directory, file))
+    if recursive:
+        for root, _, files in os.walk(directory):
+            for file in files:
+                if file.lower().endswith('.gtd'):
+                    gtd_files.append(os.path.join(root, file))
+    else:
+        for file in os.listdir(directory):
+            if file.lower().endswith('.gtd'):
+                gtd_files.append(os.path.join(directory, file))
     
     # Ordena os arquivos pelo nome para processá-los em ordem
     gtd_files.sort()
-    
-    # Processa os arquivos
-    if gtd_files:
-        processor.process_multiple_files(gtd_files)
-        
-        # Define caminhos para os arquivos de saída
-        excel_filepath = output_filepath
-        if not excel_filepath.lower().endswith('.xlsx'):
-            excel_filepath += '.xlsx'
-            
-        json_filepath = os.path.splitext(output_filepath)[0] + '.json'
-        
-        # Exporta para Excel e JSON
-        processor.export_to_excel(excel_filepath)
-        processor.export_to_json(json_filepath)
-        
-        print(f"Processados {len(gtd_files)} arquivos GTD.")
-    else:
-        print(f"Nenhum arquivo GTD encontrado no diretório: {directory}")
+    return gtd_files
 
 
-if __name__ == "__main__":
-    # Exemplo de uso para processar um único arquivo
-    # processor = GTDProcessor()
-    # processor.process_file("caminho/para/arquivo.GTD")
-    # processor.export_to_excel("saida.xlsx")
+def convert_gtd_files(filepaths: List[str], output_base: str,
+                      formats: Tuple[str, ...] = ('xlsx', 'json'),
+                      engine: str = 'reference', resample: Optional[str] = None,
+                      csv_options: Optional[Dict] = None) -> Dict:
+    """
+    Processa um conjunto de arquivos GTD em um único conjunto de dados e o exporta
+    nos formatos pedidos.
     
-    # Diretório base do projeto
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    Args:
+        filepaths: Arquivos GTD, na ordem em que devem ser combinados
+        output_base: Caminho de saída sem extensão (a extensão de cada formato é adicionada)
+        formats: Formatos de saída (chaves de OUTPUT_FORMATS)
+        engine: Engine de parsing ('reference' ou 'fast')
+        resample: Se informado (ex: "1 min"), exporta os dados reamostrados por
+            GTDProcessor.downsample em vez dos dados brutos
+        csv_options: Opções da exportação CSV (argumentos de GTDProcessor.export_to_csv,
+            ex: {"delimiter": ";", "decimal": ","})
+        
+    Returns:
+        Dicionário com arquivos gerados, linhas, bytes lidos e métricas por estágio
+    """
+    unknown = [fmt for fmt in formats if fmt not in OUTPUT_FORMATS]
+    if unknown:
+        raise ValueError(f"Formatos desconhecidos: {unknown}. Use {list(OUTPUT_FORMATS)}")
     
-    # Diretório de entrada com os arquivos GTD
-    input_dir = os.path.join(base_dir, "Info_the_project_GHFM", "Ensaios", "GHFM_250206_070758")
+    processor = GTDProcessor(engine=engine)
+    processor.process_multiple_files(filepaths)
+    exporter = processor.downsample(resample) if resample else processor
+    
+    outputs = []
+    for fmt in formats:
+        extension, method = OUTPUT_FORMATS[fmt]
+        output_filepath = output_base + extension
+        options = (csv_options or {}) if fmt == 'csv' else {}
+        getattr(exporter, method)(output_filepath, **options)
+        if os.path.exists(output_filepath):
+            outputs.append(output_filepath)
+    
+    return {
+        "inputs": list(filepaths),
+        "outputs": outputs,
+        "rows": sum(len(channel.timestamps) for channel in processor.channels.values()),
+        "bytes": sum(os.path.getsize(path) for path in filepaths),
+        "bad_rows": processor.metrics.bad_rows,
+        "stages": processor.metrics.summary(),
+    }
+
+
+def process_gtd_directory(directory: str, output_filepath: str, recursive: bool = False,
+                          formats: Tuple[str, ...] = ('xlsx', 'json'),
+                          engine: str = 'reference') -> Optional[Dict]:
+    """
+    Processa todos os arquivos GTD em um diretório.
     
-    # Diretório para salvar os arquivos processados
-    output_dir = os.path.join(base_dir, "temp_data")
+    Args:
+        directory: Caminho para o diretório contendo arquivos GTD
+        output_filepath: Caminho para o arquivo de saída (base para Excel e JSON)
+        recursive: Se True, inclui os arquivos dos subdiretórios
+        formats: Formatos de saída (chaves de OUTPUT_FORMATS)
+        engine: Engine de parsing ('reference' ou 'fast')
+        
+    Returns:
+        O resumo de convert_gtd_files, ou None se nenhum arquivo GTD for encontrado
+    """
+    # Encontra todos os arquivos .GTD no diretório
+    gtd_files = find_gtd_files(directory, recursive=recursive)
     
-    # Cria o diretório de saída se não existir
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # Processa os arquivos
+    if not gtd_files:
+        print(f"Nenhum arquivo GTD encontrado no diretório: {directory}")
+        return None
     
-    # Define o caminho completo para o arquivo Excel de saída
-    output_file = os.path.join(output_dir, "GTD_Processed_Data.xlsx")
+    # Remove a extensão do caminho de saída; cada formato adiciona a sua
+    output_base = output_filepath
+    for extension, _ in OUTPUT_FORMATS.values():
+        if output_base.lower().endswith(extension):
+            output_base = output_base[:-len(extension)]
+            break
     
-    # Processa os arquivos GTD do diretório de entrada
-    process_gtd_directory(input_dir, output_file)
\ No newline at end of file
+    summary = convert_gtd_files(gtd_files, output_base, formats=formats, engine=engine)
+    print(f"Processados {len(gtd_files)} arquivos GTD.")
+    return summary
+
+
+if __name__ == "__main__":
+    # A conversão em lote por linha de comando fica em models/cli.py
+    # Exemplo: python -m models.cli Ensaios/ -o temp_data --recursive --format xlsx json
+    from models.cli import main
+    main()
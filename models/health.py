@@ -0,0 +1,121 @@
+import warnings
+from typing import List
+
+import numpy as np
+
+from .sequences import find_runs, run_peak
+
+# Tipos de evento detectados por detect_health_events
+EVENT_TYPES = ("flatline", "stuck", "spread", "spike")
+
+
+def _robust_threshold(values: np.ndarray, factor: float, axis=None) -> np.ndarray:
+    """
+    Limite robusto mediana + factor * MAD (escalado para desvio padrão). Onde o limite
+    é zero (séries quase sempre constantes), usa factor * média.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # Colunas inteiramente NaN
+        median = np.nanmedian(values, axis=axis)
+        center = median if axis is None else np.expand_dims(median, axis)
+        mad = 1.4826 * np.nanmedian(np.abs(values - center), axis=axis)
+        limit = median + factor * mad
+        fallback = factor * np.nanmean(values, axis=axis)
+    return np.where(limit > 0, limit, fallback)
+
+
+def detect_health_events(times: np.ndarray, channel_ids: List, mins: np.ndarray, maxs: np.ndarray,
+                         flat_window: int = 30, flat_tolerance: float = 0.0,
+                         stuck_samples: int = 10, spread_factor: float = 10.0,
+                         spike_factor: float = 6.0) -> 'pandas.DataFrame':
+    """
+    Detecta falhas típicas de sensores em todos os canais de uma vez, com operações
+    vetorizadas sobre a matriz de canais (amostras x canais), sem laços por canal:
+
+        flatline: a faixa do envelope (maior Max - menor Min) em uma janela móvel de
+            flat_window amostras não passa de flat_tolerance
+        stuck: o par Min/Max se repete idêntico, com Min == Max, por stuck_samples amostras
+            ou mais (leitura congelada, sem o ruído normal dentro do intervalo)
+        spread: a diferença Max - Min passa de spread_factor vezes a diferença típica de
+            todos os canais (ex: termopar oscilando entre 84 e 118 no intervalo)
+        spike: a taxa de variação |d(Min+Max)/2 / dt| passa do limite robusto do canal
+            (mediana + spike_factor * MAD)
+
+    Amostras em over-range (NaN) interrompem os eventos.
+
+    Args:
+        times: Timestamps datetime64 das linhas da matriz (ordenados)
+        channel_ids: ID do canal de cada coluna
+        mins: Matriz de mínimos (T x C)
+        maxs: Matriz de máximos (T x C)
+        flat_window: Janela móvel (amostras) da detecção de flatline
+        flat_tolerance: Faixa máxima na janela para considerar o sinal parado
+        stuck_samples: Repetições mínimas para considerar a leitura travada
+        spread_factor: Múltiplo da diferença Max - Min típica considerado anormal
+        spike_factor: Múltiplo da MAD da taxa de variação considerado pico
+
+    Returns:
+        DataFrame de eventos com Canal, Evento, Início, Fim, Amostras e Valor (faixa para
+        flatline, leitura para stuck, maior diferença para spread e maior taxa por segundo
+        para spike), ordenado por início
+    """
+    import pandas as pd
+
+    times = np.asarray(times, dtype='datetime64[us]')
+    mins = np.asarray(mins, dtype=np.float64)
+    maxs = np.asarray(maxs, dtype=np.float64)
+    n_rows = len(times)
+    found = []  # (evento, colunas, inícios, fins, valores)
+
+    # Flatline: janelas móveis cuja faixa do envelope não passa da tolerância
+    if n_rows >= flat_window:
+        window_max = np.lib.stride_tricks.sliding_window_view(maxs, flat_window, axis=0).max(axis=-1)
+        window_min = np.lib.stride_tricks.sliding_window_view(mins, flat_window, axis=0).min(axis=-1)
+        window_range = window_max - window_min
+        with np.errstate(invalid='ignore'):
+            cols, starts, ends = find_runs(window_range <= flat_tolerance)
+        peaks = run_peak(window_range, cols, starts, ends)
+        # Uma sequência de janelas [a, b) cobre as amostras [a, b + janela - 1)
+        found.append(("flatline", cols, starts, ends + flat_window - 1, peaks))
+
+    # Stuck: par Min/Max idêntico ao anterior, sem variação dentro do intervalo
+    if n_rows > 1:
+        repeated = np.zeros(mins.shape, dtype=bool)
+        repeated[1:] = (mins[1:] == mins[:-1]) & (maxs[1:] == maxs[:-1]) & (mins[1:] == maxs[1:])
+        # A primeira amostra da sequência também faz parte do evento
+        repeated[:-1] |= repeated[1:]
+        cols, starts, ends = find_runs(repeated, stuck_samples)
+        found.append(("stuck", cols, starts, ends, maxs[starts, cols]))
+
+    # Spread: diferença Max - Min muito acima da típica de todos os canais
+    spread = maxs - mins
+    threshold = _robust_threshold(spread, spread_factor)
+    with np.errstate(invalid='ignore'):
+        cols, starts, ends = find_runs(spread > threshold)
+    found.append(("spread", cols, starts, ends, run_peak(spread, cols, starts, ends)))
+
+    # Spike: taxa de variação acima do limite robusto de cada canal
+    if n_rows > 1:
+        dt = np.diff(times).astype(np.int64) / 1e6
+        dt[dt <= 0] = np.nan
+        rate = np.abs(np.diff((mins + maxs) / 2, axis=0)) / dt[:, None]
+        limits = _robust_threshold(rate, spike_factor, axis=0)
+        with np.errstate(invalid='ignore'):
+            cols, starts, ends = find_runs(rate > limits)
+        # A variação i ocorre entre as amostras i e i + 1
+        found.append(("spike", cols, starts + 1, ends + 1, run_peak(rate, cols, starts, ends)))
+
+    events = []
+    for event, cols, starts, ends, values in found:
+        for col, start, end, value in zip(cols.tolist(), starts.tolist(), ends.tolist(), values.tolist()):
+            events.append({
+                'Canal': channel_ids[col],
+                'Evento': event,
+                'Início': times[start].item(),
+                'Fim': times[end - 1].item(),
+                'Amostras': end - start,
+                'Valor': value,
+            })
+
+    table = pd.DataFrame(events, columns=['Canal', 'Evento', 'Início', 'Fim', 'Amostras', 'Valor'])
+    return table.sort_values(['Início', 'Evento'], kind='stable').reset_index(drop=True)
@@ -0,0 +1,204 @@
+import ast
+import operator
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from .Channel import Channel
+
+
+def _stack(*values) -> np.ndarray:
+    """Empilha operandos (arrays ou escalares) em uma matriz para reduções entre canais"""
+    return np.stack(np.broadcast_arrays(*values))
+
+
+# Operadores e funções permitidos nas expressões
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+FUNCTIONS = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "mean": lambda *values: _stack(*values).mean(axis=0),
+    "sum": lambda *values: _stack(*values).sum(axis=0),
+    "min": lambda *values: _stack(*values).min(axis=0),
+    "max": lambda *values: _stack(*values).max(axis=0),
+}
+
+# Uma função compilada recebe ({"min": {id -> array}, "max": {id -> array}}, série) e retorna um array
+Compiled = Callable[[Dict, str], Union[np.ndarray, float]]
+
+
+def resolve_channel(name: str, channel_ids: List) -> Union[int, str]:
+    """
+    Resolve uma referência "Ch<id>" (o mesmo prefixo dos nomes de coluna, ex: Ch1,
+    Ch1_mancal_D1) para o ID de um canal existente.
+
+    Args:
+        name: Nome usado na expressão
+        channel_ids: IDs dos canais disponíveis
+
+    Returns:
+        O ID do canal
+    """
+    if name[:2].lower() == "ch":
+        for channel_id in channel_ids:
+            if str(channel_id) == name[2:]:
+                return channel_id
+    raise ValueError(f"Canal desconhecido na expressão: {name} (use Ch<id>, ex: Ch1)")
+
+
+def _channel_name(node) -> Optional[str]:
+    """Nome de uma referência a canal: identificador (Ch1) ou texto entre aspas ('Ch5_mancal-D1')"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def compile_expression(expression: str, channel_ids: List) -> tuple:
+    """
+    Analisa uma expressão de canal matemático uma única vez e a compila em uma função
+    que opera sobre arrays numpy inteiros. Apenas aritmética, números, referências a
+    canais e as funções de FUNCTIONS são aceitos; qualquer outra construção é rejeitada.
+
+    Referências: Ch1 usa a mesma série (Min ou Max) que está sendo calculada; Ch1.min e
+    Ch1.max fixam a série. Exemplos: "Ch1 - Ch10", "mean(Ch1, Ch2, Ch3)", "Ch4.max - Ch4.min".
+    IDs que não são identificadores válidos (ex: a tag de "5_mancal-D1" mantém o '-') são
+    referenciados entre aspas: "'Ch5_mancal-D1' - Ch1" ou "'Ch5_mancal-D1'.max".
+
+    Args:
+        expression: Expressão a compilar
+        channel_ids: IDs dos canais que podem ser referenciados
+
+    Returns:
+        Tupla (função compilada, lista de IDs dos canais referenciados)
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Expressão inválida: {expression!r} ({e.msg})")
+    except (RecursionError, MemoryError):
+        raise ValueError(f"Expressão aninhada demais: {expression[:40]!r}...")
+
+    dependencies = []
+
+    def reference(name: str) -> Union[int, str]:
+        channel_id = resolve_channel(name, channel_ids)
+        if channel_id not in dependencies:
+            dependencies.append(channel_id)
+        return channel_id
+
+    def build(node) -> Compiled:
+        if isinstance(node, ast.Expression):
+            return build(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            try:
+                # Escalar numpy: a aritmética só com constantes também segue np.errstate (inf/nan)
+                value = np.float64(float(node.value))
+            except OverflowError:
+                raise ValueError(f"Constante fora do intervalo de ponto flutuante: {str(node.value)[:20]}...")
+            return lambda data, kind: value
+        if _channel_name(node) is not None:
+            channel_id = reference(_channel_name(node))
+            return lambda data, kind: data[kind][channel_id]
+        if isinstance(node, ast.Attribute) and _channel_name(node.value) is not None and node.attr in ("min", "max"):
+            channel_id, fixed = reference(_channel_name(node.value)), node.attr
+            return lambda data, kind: data[fixed][channel_id]
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            op, left, right = _BINARY_OPERATORS[type(node.op)], build(node.left), build(node.right)
+            return lambda data, kind: op(left(data, kind), right(data, kind))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            op, operand = _UNARY_OPERATORS[type(node.op)], build(node.operand)
+            return lambda data, kind: op(operand(data, kind))
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS \
+                and node.args and not node.keywords:
+            function, arguments = FUNCTIONS[node.func.id], [build(arg) for arg in node.args]
+            return lambda data, kind: function(*[argument(data, kind) for argument in arguments])
+        raise ValueError(f"Construção não permitida na expressão: {ast.dump(node)[:60]}")
+
+    try:
+        compiled = build(tree)
+    except (RecursionError, MemoryError):
+        raise ValueError(f"Expressão aninhada demais: {expression[:40]!r}...")
+    if not dependencies:
+        raise ValueError(f"A expressão não referencia nenhum canal: {expression!r}")
+    return compiled, dependencies
+
+
+class MathChannel:
+    """
+    Canal derivado definido por uma expressão sobre outros canais. A expressão é
+    compilada uma vez; o resultado é calculado de forma vetorizada sobre os dados
+    alinhados (GTDProcessor.to_matrix) e fica em cache até que os canais de entrada
+    recebam novas amostras.
+    """
+    def __init__(self, channel_id: str, expression: str, channel_ids: List, unit: Optional[str] = None):
+        """
+        Compila o canal derivado
+
+        Args:
+            channel_id: ID do canal derivado
+            expression: Expressão (ver compile_expression)
+            channel_ids: IDs dos canais disponíveis para referência
+            unit: Unidade do resultado (padrão: a do primeiro canal referenciado)
+        """
+        if channel_id in channel_ids:
+            raise ValueError(f"Já existe um canal com o ID {channel_id!r}")
+        self.channel_id = channel_id
+        self.expression = expression
+        self.unit = unit
+        self._compiled, self.dependencies = compile_expression(expression, channel_ids)
+        self._cache_key = None
+        self._channel = None
+
+    def evaluate(self, processor) -> Channel:
+        """
+        Calcula o canal derivado (ou retorna o resultado em cache, se as entradas não mudaram).
+        As séries Min e Max do resultado são a expressão aplicada às séries Min e Max das
+        entradas, ordenadas para que Min <= Max.
+
+        Args:
+            processor: GTDProcessor com os canais de entrada
+
+        Returns:
+            O Channel com os valores calculados
+        """
+        key = tuple((channel_id, len(processor.channels[channel_id].timestamps))
+                    for channel_id in self.dependencies)
+        if key == self._cache_key and self._channel is not None:
+            return self._channel
+
+        times, ids, mins, maxs = processor.to_matrix(self.dependencies)
+        data = {
+            "min": {channel_id: mins[:, index] for index, channel_id in enumerate(ids)},
+            "max": {channel_id: maxs[:, index] for index, channel_id in enumerate(ids)},
+        }
+        unit = self.unit or (processor.channels[self.dependencies[0]].unit if self.dependencies else "")
+        channel = Channel(self.channel_id, unit)
+        if len(ids) == len(self.dependencies) and len(times):
+            with np.errstate(all='ignore'):
+                from_min = np.broadcast_to(self._compiled(data, "min"), times.shape).astype(np.float64)
+                from_max = np.broadcast_to(self._compiled(data, "max"), times.shape).astype(np.float64)
+            channel.extend_samples(times.tolist(), np.minimum(from_min, from_max).tolist(),
+                                   np.maximum(from_min, from_max).tolist())
+
+        self._cache_key, self._channel = key, channel
+        return channel
+
+    def to_dict(self) -> Dict:
+        """Definição serializável do canal derivado"""
+        return {"expression": self.expression, "unit": self.unit}
@@ -0,0 +1,190 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Iterator
+
+# O tracemalloc é global ao processo: estágios medidos em threads concorrentes (ex: exportações
+# de um snapshot) compartilham o rastreamento, que só é parado quando o último estágio termina
+_TRACING_LOCK = threading.Lock()
+_tracing = {"stages": 0, "started": False}  # Estágios em andamento e se o rastreamento foi iniciado aqui
+
+
+class StageMetrics:
+    """
+    Métricas de um estágio do pipeline de processamento (leitura, decodificação,
+    cabeçalho, mapa de canais, parsing de dados, merge ou exportação).
+    """
+    def __init__(self, name: str, source: Optional[str] = None):
+        """
+        Inicializa o registro de um estágio.
+
+        Args:
+            name: Nome do estágio (ex: "read", "data_parse", "export_excel")
+            source: Arquivo de origem ou destino associado ao estágio
+        """
+        self.name = name
+        self.source = source
+        self.wall_time = 0.0  # Segundos
+        self.rows = 0  # Linhas processadas no estágio
+        self.bytes = 0  # Bytes processados no estágio
+        self.peak_memory = None  # Pico de alocação em bytes (None se não monitorado)
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        """Taxa de linhas por segundo, ou None se não houver tempo medido"""
+        if self.wall_time <= 0 or not self.rows:
+            return None
+        return self.rows / self.wall_time
+
+    @property
+    def bytes_per_second(self) -> Optional[float]:
+        """Taxa de bytes por segundo, ou None se não houver tempo medido"""
+        if self.wall_time <= 0 or not self.bytes:
+            return None
+        return self.bytes / self.wall_time
+
+    def to_dict(self) -> Dict:
+        """
+        Converte o registro em dicionário para exibição ou exportação.
+
+        Returns:
+            Dicionário com nome, origem, tempo, linhas, bytes, taxas e pico de memória
+        """
+        return {
+            "stage": self.name,
+            "source": self.source,
+            "wall_time_s": self.wall_time,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "rows_per_s": self.rows_per_second,
+            "bytes_per_s": self.bytes_per_second,
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+    def __str__(self) -> str:
+        """Representação em string do estágio"""
+        return f"{self.name}: {self.wall_time * 1000:.2f} ms, {self.rows} linhas, {self.bytes} bytes"
+
+
+class ProcessingMetrics:
+    """
+    Coleta as métricas de todos os estágios executados por um GTDProcessor.
+    Também contabiliza linhas e valores malformados encontrados no parsing.
+    """
+    def __init__(self, track_memory: bool = False):
+        """
+        Inicializa o coletor de métricas.
+
+        Args:
+            track_memory: Se True, mede o pico de alocação de cada estágio com
+                tracemalloc (tem custo de desempenho considerável)
+        """
+        self.track_memory = track_memory
+        self.stages: List[StageMetrics] = []
+        self.bad_rows = 0  # Linhas de dados com timestamp inválido
+        self.bad_values = 0  # Valores não numéricos em colunas de canal
+        self.files = 0  # Arquivos processados
+
+    @contextmanager
+    def stage(self, name: str, source: Optional[str] = None,
+              rows: int = 0, nbytes: int = 0) -> Iterator[StageMetrics]:
+        """
+        Mede o tempo (e opcionalmente o pico de memória) de um bloco de código.
+        O registro retornado pode ter `rows` e `bytes` atualizados dentro do bloco.
+        Pode ser chamado de várias threads ao mesmo tempo (ex: exportações concorrentes).
+
+        Args:
+            name: Nome do estágio
+            source: Arquivo de origem ou destino associado
+            rows: Número inicial de linhas do estágio
+            nbytes: Número inicial de bytes do estágio
+
+        Yields:
+            O objeto StageMetrics do estágio em andamento
+        """
+        record = StageMetrics(name, source)
+        record.rows = rows
+        record.bytes = nbytes
+
+        baseline = 0
+        if self.track_memory:
+            with _TRACING_LOCK:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _tracing["started"] = True
+                if _tracing["stages"] == 0:  # Com estágios concorrentes o pico é o do conjunto
+                    tracemalloc.reset_peak()
+                _tracing["stages"] += 1
+                baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_time = time.perf_counter() - start
+            with _TRACING_LOCK:
+                if self.track_memory:
+                    record.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+                    _tracing["stages"] -= 1
+                    if _tracing["stages"] == 0 and _tracing["started"]:
+                        tracemalloc.stop()
+                        _tracing["started"] = False
+                self.stages.append(record)
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Agrega as métricas por nome de estágio (somando todos os arquivos).
+
+        Returns:
+            Dicionário {estágio -> {wall_time_s, rows, bytes, rows_per_s, bytes_per_s, peak_memory_bytes, calls}}
+        """
+        totals = {}
+        for record in self.stages:
+            entry = totals.setdefault(record.name, {
+                "calls": 0, "wall_time_s": 0.0, "rows": 0, "bytes": 0, "peak_memory_bytes": None
+            })
+            entry["calls"] += 1
+            entry["wall_time_s"] += record.wall_time
+            entry["rows"] += record.rows
+            entry["bytes"] += record.bytes
+            if record.peak_memory is not None:
+                entry["peak_memory_bytes"] = max(entry["peak_memory_bytes"] or 0, record.peak_memory)
+
+        for entry in totals.values():
+            elapsed = entry["wall_time_s"]
+            entry["rows_per_s"] = entry["rows"] / elapsed if elapsed > 0 and entry["rows"] else None
+            entry["bytes_per_s"] = entry["bytes"] / elapsed if elapsed > 0 and entry["bytes"] else None
+        return totals
+
+    def to_records(self) -> List[Dict]:
+        """
+        Retorna todos os estágios registrados como lista de dicionários.
+
+        Returns:
+            Lista de dicionários (um por execução de estágio)
+        """
+        return [record.to_dict() for record in self.stages]
+
+    def total_time(self) -> float:
+        """Soma do tempo de todos os estágios registrados, em segundos"""
+        return sum(record.wall_time for record in self.stages)
+
+    def merge(self, other: 'ProcessingMetrics') -> None:
+        """
+        Incorpora os estágios e contadores de outro coletor (ex: de um worker).
+
+        Args:
+            other: Métricas a incorporar
+        """
+        self.stages.extend(other.stages)
+        self.bad_rows += other.bad_rows
+        self.bad_values += other.bad_values
+        self.files += other.files
+
+    def reset(self) -> None:
+        """Descarta todas as métricas coletadas"""
+        self.stages = []
+        self.bad_rows = 0
+        self.bad_values = 0
+        self.files = 0
@@ -0,0 +1,146 @@
+import re
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .resample import parse_interval
+
+# Métodos de alinhamento aceitos por align_series
+ALIGN_METHODS = ("asof", "linear")
+
+# Sem tolerância informada, uma amostra vale até 1.5 x o passo do próprio canal (como em gaps)
+TOLERANCE_FACTOR = 1.5
+
+
+def recorder_id(metadata: Dict) -> str:
+    """Identificador do registrador no cabeçalho (número de série), ou '' se ausente"""
+    return str(metadata.get("Serial No.", "")).strip()
+
+
+def utc_offset(metadata: Dict) -> Optional[timedelta]:
+    """
+    Diferença entre o relógio do registrador e o UTC, a partir do cabeçalho:
+    "Time Zone 540" é o fuso em minutos a leste de Greenwich (+09:00) e "DST On"
+    soma uma hora de horário de verão.
+
+    Args:
+        metadata: Cabeçalho do arquivo (Time Zone e DST)
+
+    Returns:
+        O deslocamento (horário local - UTC), ou None se o fuso estiver ausente ou ilegível
+    """
+    value = str(metadata.get("Time Zone", "")).strip()
+    match = re.fullmatch(r"([+-]?)(\d{1,2}):(\d{2})", value)
+    if match:
+        minutes = int(match.group(2)) * 60 + int(match.group(3))
+        minutes = -minutes if match.group(1) == "-" else minutes
+    elif re.fullmatch(r"[+-]?\d+", value):
+        minutes = int(value)
+    else:
+        return None
+    offset = timedelta(minutes=minutes)
+    if str(metadata.get("DST", "")).strip().lower() == "on":
+        offset += timedelta(hours=1)
+    return offset
+
+
+def series_step(timestamps: np.ndarray) -> Optional[np.timedelta64]:
+    """Passo típico (mediana das diferenças positivas) de uma série de timestamps, ou None"""
+    diffs = np.diff(np.sort(timestamps.astype('datetime64[us]'))).astype(np.int64)
+    positive = diffs[diffs > 0]
+    return np.timedelta64(int(np.median(positive)), 'us') if len(positive) else None
+
+
+def common_grid(arrays: Dict, interval=None, start=None, end=None) -> np.ndarray:
+    """
+    Eixo de tempo comum para alinhar canais de registradores diferentes, em múltiplos
+    do intervalo (alinhados à época Unix) entre o primeiro e o último timestamp.
+
+    Args:
+        arrays: {channel_id -> (timestamps, mínimos, máximos)} (ver GTDProcessor.channel_arrays)
+        interval: Passo do eixo (padrão: o maior passo entre os canais, ou seja, o do
+            registrador mais lento)
+        start: Início do eixo (padrão: primeiro timestamp)
+        end: Fim do eixo (padrão: último timestamp)
+
+    Returns:
+        Timestamps datetime64[us] do eixo
+    """
+    timelines = [timestamps for timestamps, _, _ in arrays.values() if len(timestamps)]
+    if not timelines:
+        return np.empty(0, dtype='datetime64[us]')
+    if interval is None:
+        steps = [step for step in map(series_step, timelines) if step is not None]
+        if not steps:
+            raise ValueError("Não foi possível inferir o intervalo do eixo comum; informe o intervalo")
+        step = max(steps)
+    else:
+        step = parse_interval(interval)
+
+    first = np.datetime64(start, 'us') if start is not None else min(t.min() for t in timelines)
+    last = np.datetime64(end, 'us') if end is not None else max(t.max() for t in timelines)
+    ticks = step.astype(np.int64)
+    low = -(-first.astype('datetime64[us]').astype(np.int64) // ticks)
+    high = last.astype('datetime64[us]').astype(np.int64) // ticks
+    return (np.arange(low, high + 1, dtype=np.int64) * ticks).astype('datetime64[us]')
+
+
+def align_series(timestamps: np.ndarray, mins: np.ndarray, maxs: np.ndarray, grid: np.ndarray,
+                 method: str = "asof", tolerance=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Alinha uma série Min/Max a um eixo de tempo, de forma vetorizada (np.searchsorted):
+
+        asof: cada instante do eixo recebe a última amostra até ele (inclusive)
+        linear: interpolação linear entre as amostras vizinhas
+
+    Instantes fora da série, ou cuja amostra (asof) ou par de vizinhas (linear) está
+    mais distante que a tolerância, ficam NaN, assim como lacunas de registro não são
+    preenchidas. Over-range (NaN) se propaga.
+
+    Args:
+        timestamps: Timestamps datetime64 das amostras
+        mins: Valores mínimos
+        maxs: Valores máximos
+        grid: Eixo de tempo (datetime64, crescente)
+        method: 'asof' ou 'linear'
+        tolerance: Distância máxima (ver resample.parse_interval); padrão 1.5 x o passo da série
+
+    Returns:
+        Tupla (mínimos, máximos) com um valor por instante do eixo
+    """
+    if method not in ALIGN_METHODS:
+        raise ValueError(f"Método de alinhamento desconhecido: {method}. Use um de {ALIGN_METHODS}")
+    times = timestamps.astype('datetime64[us]').astype(np.int64)
+    mins, maxs = np.asarray(mins, dtype=np.float64), np.asarray(maxs, dtype=np.float64)
+    if np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind='stable')
+        times, mins, maxs = times[order], mins[order], maxs[order]
+    points = grid.astype('datetime64[us]').astype(np.int64)
+    if not len(times):
+        return np.full(len(points), np.nan), np.full(len(points), np.nan)
+
+    if tolerance is not None:
+        limit = parse_interval(tolerance).astype(np.int64)
+    else:
+        step = series_step(times.astype('datetime64[us]'))
+        limit = int(TOLERANCE_FACTOR * step.astype(np.int64)) if step is not None else 0
+
+    # Última amostra até cada instante (repetições de timestamp: vale a última)
+    left = np.searchsorted(times, points, 'right') - 1
+    before = np.clip(left, 0, len(times) - 1)
+    elapsed = points - times[before]
+    if method == "asof":
+        valid = (left >= 0) & (elapsed <= limit)
+        return np.where(valid, mins[before], np.nan), np.where(valid, maxs[before], np.nan)
+
+    after = np.clip(left + 1, 0, len(times) - 1)
+    span = times[after] - times[before]
+    exact = (left >= 0) & (elapsed == 0)
+    valid = exact | ((left >= 0) & (left + 1 < len(times)) & (span <= limit))
+    weight = np.divide(elapsed, span, out=np.zeros(len(points)), where=span > 0)
+    results = []
+    for values in (mins, maxs):
+        interpolated = values[before] + weight * (values[after] - values[before])
+        results.append(np.where(valid, np.where(exact, values[before], interpolated), np.nan))
+    return results[0], results[1]
@@ -0,0 +1,157 @@
+import re
+from datetime import timedelta
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Agregações suportadas por resample_series
+AGGREGATIONS = ("min", "max", "mean", "count", "first", "last")
+
+# Unidades aceitas em intervalos textuais ("10 s", "1min", "2 h", "1d")
+_UNITS = {
+    "ms": 1e-3, "s": 1, "sec": 1, "seg": 1, "min": 60, "m": 60,
+    "h": 3600, "hr": 3600, "hora": 3600, "d": 86400, "dia": 86400,
+}
+
+
+def parse_interval(interval: Union[str, int, float, timedelta, np.timedelta64]) -> np.timedelta64:
+    """
+    Converte um intervalo em timedelta64[us].
+
+    Args:
+        interval: "10 s", "1min", "2 h", segundos (número), timedelta ou timedelta64
+
+    Returns:
+        O intervalo como numpy.timedelta64 em microssegundos
+    """
+    if isinstance(interval, np.timedelta64):
+        step = interval.astype('timedelta64[us]')
+    elif isinstance(interval, timedelta):
+        step = np.timedelta64(interval, 'us')
+    elif isinstance(interval, (int, float)):
+        step = np.timedelta64(int(round(interval * 1e6)), 'us')
+    else:
+        match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([a-zA-Z]+)\s*", str(interval))
+        if not match or match.group(2).lower() not in _UNITS:
+            raise ValueError(f"Intervalo inválido: {interval!r} (use por exemplo '10 s', '1 min', '1 h')")
+        seconds = float(match.group(1)) * _UNITS[match.group(2).lower()]
+        step = np.timedelta64(int(round(seconds * 1e6)), 'us')
+
+    if step <= np.timedelta64(0, 'us'):
+        raise ValueError(f"O intervalo deve ser positivo: {interval!r}")
+    return step
+
+
+def bucket_ids(timestamps: np.ndarray, step: np.timedelta64,
+               origin: Optional[np.datetime64] = None) -> np.ndarray:
+    """
+    Calcula o índice do intervalo (bucket) de cada timestamp.
+
+    Args:
+        timestamps: Timestamps datetime64
+        step: Largura do bucket
+        origin: Início do bucket 0 (padrão: época Unix, alinhando em múltiplos do intervalo)
+
+    Returns:
+        Array int64 com o índice do bucket de cada timestamp
+    """
+    ticks = timestamps.astype('datetime64[us]').astype(np.int64)
+    base = 0 if origin is None else np.datetime64(origin, 'us').astype(np.int64)
+    return (ticks - base) // step.astype(np.int64)
+
+
+def resample_series(timestamps: np.ndarray, mins: np.ndarray, maxs: np.ndarray,
+                    interval, agg: Sequence[str] = ("min", "max", "mean", "count"),
+                    origin: Optional[np.datetime64] = None) -> Dict[str, np.ndarray]:
+    """
+    Reamostra uma série Min/Max em buckets de tempo usando reduções sobre arrays
+    ordenados (np.fmin.reduceat / np.fmax.reduceat / np.add.reduceat). Apenas
+    buckets com amostras são retornados; NaN (over-range) é ignorado nas agregações.
+
+    Agregações:
+        min: menor valor da série Min no bucket (mínimo dos mínimos)
+        max: maior valor da série Max no bucket (máximo dos máximos)
+        mean: médias das séries Min e Max no bucket (chaves mean_min e mean_max)
+        count: quantidade de amostras no bucket
+        first / last: primeira e última amostra Min/Max do bucket
+
+    Args:
+        timestamps: Timestamps datetime64 das amostras
+        mins: Valores mínimos
+        maxs: Valores máximos
+        interval: Largura do bucket (ver parse_interval)
+        agg: Agregações a calcular
+        origin: Início do bucket 0 (padrão: múltiplos do intervalo desde a época Unix)
+
+    Returns:
+        Dicionário com "time" (início de cada bucket) e um array por agregação
+    """
+    unknown = [name for name in agg if name not in AGGREGATIONS]
+    if unknown:
+        raise ValueError(f"Agregações desconhecidas: {unknown}. Use {AGGREGATIONS}")
+
+    step = parse_interval(interval)
+    timestamps = np.asarray(timestamps).astype('datetime64[us]')
+    mins = np.asarray(mins, dtype=np.float64)
+    maxs = np.asarray(maxs, dtype=np.float64)
+
+    result = {"time": np.empty(0, dtype='datetime64[us]')}
+    if len(timestamps) == 0:
+        for name in agg:
+            if name == "mean":
+                result["mean_min"] = result["mean_max"] = np.empty(0)
+            elif name in ("first", "last"):
+                result[f"{name}_min"] = result[f"{name}_max"] = np.empty(0)
+            else:
+                result[name] = np.empty(0, dtype=np.int64 if name == "count" else np.float64)
+        return result
+
+    # Ordena pelo tempo apenas se necessário (arquivos combinados fora de ordem)
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, mins, maxs = timestamps[order], mins[order], maxs[order]
+
+    buckets = bucket_ids(timestamps, step, origin)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    base = 0 if origin is None else np.datetime64(origin, 'us').astype(np.int64)
+    result["time"] = (buckets[starts] * step.astype(np.int64) + base).astype('datetime64[us]')
+
+    for name in agg:
+        if name == "min":
+            result["min"] = np.fmin.reduceat(mins, starts)
+        elif name == "max":
+            result["max"] = np.fmax.reduceat(maxs, starts)
+        elif name == "count":
+            result["count"] = np.diff(np.append(starts, len(timestamps)))
+        elif name == "mean":
+            for key, values in (("mean_min", mins), ("mean_max", maxs)):
+                valid = ~np.isnan(values)
+                totals = np.add.reduceat(np.where(valid, values, 0.0), starts)
+                counts = np.add.reduceat(valid.astype(np.int64), starts)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    result[key] = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+        elif name == "first":
+            result["first_min"], result["first_max"] = mins[starts], maxs[starts]
+        elif name == "last":
+            ends = np.append(starts[1:], len(timestamps)) - 1
+            result["last_min"], result["last_max"] = mins[ends], maxs[ends]
+
+    return result
+
+
+def align_buckets(series: Dict[str, Dict[str, np.ndarray]]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Alinha os buckets de várias séries reamostradas em um eixo de tempo comum.
+
+    Args:
+        series: {nome -> resultado de resample_series}
+
+    Returns:
+        Tupla (eixo de tempo comum, {nome -> posições de cada bucket no eixo comum})
+    """
+    times = [result["time"] for result in series.values() if len(result["time"])]
+    if not times:
+        return np.empty(0, dtype='datetime64[us]'), {name: np.empty(0, dtype=np.int64) for name in series}
+    axis = np.unique(np.concatenate(times))
+    positions = {name: np.searchsorted(axis, result["time"]) for name, result in series.items()}
+    return axis, positions
@@ -0,0 +1,272 @@
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .recorders import align_series, series_step
+from .resample import parse_interval
+
+# Origens do tempo decorrido de cada ensaio
+ORIGINS = ("start", "trigger")
+
+# Estatísticas entre ensaios calculadas por RunComparison.statistics
+STATISTICS = ("mean", "min", "max", "std", "count")
+
+# Exportações que podem ser carregadas como ensaio: extensão -> método de importação do GTDProcessor
+_IMPORTERS = {
+    ".json": "import_from_json",
+    ".npz": "import_from_columnar",
+    ".gtda": "import_from_archive",
+    ".parquet": "import_from_parquet",
+    ".feather": "import_from_feather",
+}
+
+
+def load_runs(paths: Sequence[str], engine: str = 'fast') -> Dict[str, 'GTDProcessor']:
+    """
+    Carrega vários ensaios para comparação (ex: as pastas Ensaios/GHFM_*): cada pasta
+    (arquivos GTD combinados, como em process_gtd_directory), arquivo GTD ou exportação
+    (.json, .npz, .gtda, .parquet, .feather) vira um ensaio, nomeado pelo caminho.
+
+    Args:
+        paths: Pastas ou arquivos dos ensaios, na ordem de comparação
+        engine: Engine de parsing dos arquivos GTD
+
+    Returns:
+        Dicionário {nome do ensaio -> GTDProcessor}
+    """
+    from .gtd_processor import GTDProcessor, find_gtd_files
+
+    runs = {}
+    for path in paths:
+        name = os.path.basename(os.path.normpath(path))
+        extension = os.path.splitext(path)[1].lower()
+        if os.path.isdir(path):
+            filepaths = find_gtd_files(path)
+            if not filepaths:
+                raise ValueError(f"Nenhum arquivo GTD encontrado no ensaio: {path}")
+            processor = GTDProcessor(engine=engine)
+            processor.process_multiple_files(filepaths)
+        elif extension in _IMPORTERS:
+            processor = getattr(GTDProcessor, _IMPORTERS[extension])(path)
+        else:
+            processor = GTDProcessor(engine=engine)
+            processor.process_file(path)
+        runs[name] = processor
+    return runs
+
+
+def run_origin(processor, origin: str = "start") -> Optional[np.datetime64]:
+    """
+    Instante zero de um ensaio: o primeiro timestamp ou o Trigger Point do cabeçalho
+    (ver GTDProcessor.trigger_time).
+
+    Args:
+        processor: GTDProcessor do ensaio
+        origin: 'start' ou 'trigger'
+
+    Returns:
+        O instante (datetime64[us]), ou None se o ensaio não tiver amostras
+    """
+    if origin not in ORIGINS:
+        raise ValueError(f"Origem desconhecida: {origin}. Use uma de {ORIGINS}")
+    if origin == "trigger":
+        if processor.trigger_time is None:
+            raise ValueError("O ensaio não tem Trigger Point no cabeçalho; use a origem 'start'")
+        return np.datetime64(processor.trigger_time, 'us')
+    firsts = [channel.stats.first_time for channel in processor.channels.values() if channel.timestamps]
+    return np.datetime64(min(firsts), 'us') if firsts else None
+
+
+class RunComparison:
+    """
+    Comparação de ensaios repetidos: cada ensaio é reindexado pelo tempo decorrido desde
+    a sua origem (início ou Trigger Point) e interpolado, de forma vetorizada, em um eixo
+    de tempo decorrido comum. Para cada canal, os ensaios formam uma matriz ensaios x
+    instantes, calculada sob demanda e guardada em cache, sobre a qual são obtidos o
+    envelope (média, mínimo, máximo, desvio padrão) e as diferenças entre ensaios.
+    """
+    def __init__(self, runs: Dict[str, 'GTDProcessor'], origin: str = "start", interval=None,
+                 channel_ids: Optional[List] = None, method: str = "linear", tolerance=None):
+        """
+        Prepara a comparação
+
+        Args:
+            runs: Ensaios a comparar: {nome -> GTDProcessor}, na ordem de exibição
+            origin: Instante zero de cada ensaio: 'start' ou 'trigger'
+            interval: Passo do eixo de tempo decorrido (padrão: o maior passo entre os ensaios)
+            channel_ids: Canais comparados (padrão: os presentes em todos os ensaios)
+            method: Interpolação no eixo comum: 'linear' ou 'asof' (ver recorders.align_series)
+            tolerance: Distância máxima até as amostras usadas (padrão: 1.5 x o passo do canal)
+        """
+        if len(runs) < 1:
+            raise ValueError("Informe ao menos um ensaio para comparar")
+        self.runs = dict(runs)
+        self.origin = origin
+        self.method = method
+        self.tolerance = tolerance
+        self.origins = {name: run_origin(processor, origin) for name, processor in self.runs.items()}
+        empty = [name for name, start in self.origins.items() if start is None]
+        if empty:
+            raise ValueError(f"Ensaios sem amostras: {empty}")
+
+        if channel_ids is None:
+            first = next(iter(self.runs.values()))
+            channel_ids = [channel_id for channel_id, channel in first.channels.items()
+                           if channel.timestamps and all(channel_id in processor.channels
+                                                         for processor in self.runs.values())]
+        self.channel_ids = list(channel_ids)
+
+        # Eixo comum: da primeira amostra (negativa antes do Trigger Point) até a maior duração
+        leads, durations, steps = [], [], []
+        for name, processor in self.runs.items():
+            for timestamps, _, _ in processor.channel_arrays(self.channel_ids).values():
+                leads.append(timestamps.min() - self.origins[name])
+                durations.append(timestamps.max() - self.origins[name])
+                step = series_step(timestamps)
+                if step is not None:
+                    steps.append(step)
+        if interval is not None:
+            self.step = parse_interval(interval)
+        elif steps:
+            self.step = max(steps)
+        elif not durations:
+            self.step = np.timedelta64(1, 's')  # Sem canais em comum: eixo vazio
+        else:
+            raise ValueError("Não foi possível inferir o passo do eixo comum; informe o intervalo")
+        ticks = self.step.astype(np.int64)
+        first = min(0, min(leads).astype('timedelta64[us]').astype(np.int64)) if leads else 0
+        last = max(durations).astype('timedelta64[us]').astype(np.int64) if durations else 0
+        self.elapsed = (np.arange(first // ticks, last // ticks + 1 if durations else 0, dtype=np.int64)
+                        * ticks).astype('timedelta64[us]')
+        self._cache: Dict = {}
+
+    @property
+    def names(self) -> List[str]:
+        """Nomes dos ensaios, na ordem da comparação"""
+        return list(self.runs)
+
+    @property
+    def elapsed_s(self) -> np.ndarray:
+        """Eixo comum em segundos decorridos"""
+        return self.elapsed / np.timedelta64(1, 's')
+
+    def values(self, channel_id, kind: str = "max") -> np.ndarray:
+        """
+        Matriz ensaios x instantes de um canal no eixo comum (NaN onde o ensaio não tem
+        dados), calculada uma vez por canal.
+
+        Args:
+            channel_id: ID do canal
+            kind: Série comparada: 'min' ou 'max'
+
+        Returns:
+            Matriz float64 (ensaios x instantes)
+        """
+        if kind not in ("min", "max"):
+            raise ValueError(f"Série desconhecida: {kind}. Use 'min' ou 'max'")
+        if channel_id not in self._cache:
+            mins = np.full((len(self.runs), len(self.elapsed)), np.nan)
+            maxs = np.full((len(self.runs), len(self.elapsed)), np.nan)
+            for row, (name, processor) in enumerate(self.runs.items()):
+                arrays = processor.channel_arrays([channel_id]) if channel_id in processor.channels else {}
+                if channel_id in arrays:
+                    mins[row], maxs[row] = align_series(*arrays[channel_id], self.origins[name] + self.elapsed,
+                                                        method=self.method, tolerance=self.tolerance)
+            self._cache[channel_id] = {"min": mins, "max": maxs}
+        return self._cache[channel_id][kind]
+
+    def statistics(self, channel_id, kind: str = "max") -> Dict[str, np.ndarray]:
+        """
+        Envelope entre ensaios em cada instante do eixo comum (NaN é ignorado).
+
+        Args:
+            channel_id: ID do canal
+            kind: Série comparada: 'min' ou 'max'
+
+        Returns:
+            Dicionário {estatística -> array} com mean, min, max, std e count (ensaios com dados)
+        """
+        matrix = self.values(channel_id, kind)
+        count = np.count_nonzero(~np.isnan(matrix), axis=0)
+        has_data = count > 0
+        result = {stat: np.full(matrix.shape[1], np.nan) for stat in STATISTICS if stat != "count"}
+        if has_data.any():
+            columns = matrix[:, has_data]
+            result["mean"][has_data] = np.nanmean(columns, axis=0)
+            result["min"][has_data] = np.nanmin(columns, axis=0)
+            result["max"][has_data] = np.nanmax(columns, axis=0)
+            result["std"][has_data] = np.nanstd(columns, axis=0)
+        result["count"] = count
+        return result
+
+    def difference(self, channel_id, run: str, reference: str, kind: str = "max") -> np.ndarray:
+        """
+        Diferença ponto a ponto entre dois ensaios no eixo comum (run - reference).
+
+        Args:
+            channel_id: ID do canal
+            run: Nome do ensaio
+            reference: Nome do ensaio de referência
+            kind: Série comparada: 'min' ou 'max'
+
+        Returns:
+            Array com a diferença em cada instante (NaN onde algum dos dois não tem dados)
+        """
+        names = self.names
+        for name in (run, reference):
+            if name not in names:
+                raise ValueError(f"Ensaio desconhecido: {name}")
+        matrix = self.values(channel_id, kind)
+        return matrix[names.index(run)] - matrix[names.index(reference)]
+
+    def deviations(self, channel_id, reference: Optional[str] = None, kind: str = "max") -> 'pandas.DataFrame':
+        """
+        Resumo da diferença de cada ensaio em relação à referência (padrão: a média
+        entre os ensaios): maior diferença absoluta, diferença média e RMS.
+
+        Args:
+            channel_id: ID do canal
+            reference: Ensaio de referência, ou None para a média dos ensaios
+            kind: Série comparada: 'min' ou 'max'
+
+        Returns:
+            DataFrame com uma linha por ensaio
+        """
+        import pandas as pd
+
+        matrix = self.values(channel_id, kind)
+        baseline = (self.statistics(channel_id, kind)["mean"] if reference is None
+                    else matrix[self.names.index(reference)])
+        rows = []
+        for name, series in zip(self.names, matrix):
+            diff = series - baseline
+            valid = diff[~np.isnan(diff)]
+            rows.append({
+                "Ensaio": name,
+                "Pontos": len(valid),
+                "Diferença máxima": float(np.abs(valid).max()) if len(valid) else np.nan,
+                "Diferença média": float(valid.mean()) if len(valid) else np.nan,
+                "RMS": float(np.sqrt(np.mean(valid ** 2))) if len(valid) else np.nan,
+            })
+        return pd.DataFrame(rows)
+
+    def to_dataframe(self, channel_id, kind: str = "max") -> 'pandas.DataFrame':
+        """
+        Tabela do canal no eixo comum: tempo decorrido, uma coluna por ensaio e o envelope.
+
+        Args:
+            channel_id: ID do canal
+            kind: Série comparada: 'min' ou 'max'
+
+        Returns:
+            DataFrame com um instante do eixo por linha
+        """
+        import pandas as pd
+
+        columns = {"Elapsed_s": self.elapsed_s}
+        for name, series in zip(self.names, self.values(channel_id, kind)):
+            columns[name] = series
+        for stat, values in self.statistics(channel_id, kind).items():
+            columns[f"Envelope_{stat.capitalize()}"] = values
+        return pd.DataFrame(columns)
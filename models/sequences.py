@@ -0,0 +1,35 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def find_runs(mask: np.ndarray, min_length: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encontra as sequências de True de uma matriz booleana (amostras x canais), coluna a coluna.
+
+    Args:
+        mask: Matriz booleana (T x C)
+        min_length: Comprimento mínimo das sequências retornadas
+
+    Returns:
+        Tupla (coluna, início, fim exclusivo) de cada sequência, ordenadas por coluna e início
+    """
+    padded = np.zeros((mask.shape[0] + 2, mask.shape[1]), dtype=np.int8)
+    padded[1:-1] = mask
+    edges = np.diff(padded, axis=0).T  # (C x T+1), ordem de np.nonzero: coluna, depois linha
+    cols, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    keep = (ends - starts) >= min_length
+    return cols[keep], starts[keep], ends[keep]
+
+
+def run_peak(values: np.ndarray, cols: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Maior valor (ignorando NaN) de cada sequência, com uma única redução np.fmax.reduceat"""
+    if len(cols) == 0:
+        return np.empty(0)
+    n_rows = values.shape[0]
+    flat = np.append(values.T.ravel(), np.nan)  # Elemento extra para fins no limite do array
+    bounds = np.empty(2 * len(cols), dtype=np.int64)
+    bounds[0::2] = cols * n_rows + starts
+    bounds[1::2] = cols * n_rows + ends
+    return np.fmax.reduceat(flat, bounds)[0::2]
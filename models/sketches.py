@@ -0,0 +1,408 @@
+import math
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Erro relativo máximo dos quantis do QuantileSketch (1%: 25.0 °C -> entre 24.75 e 25.25 °C)
+RELATIVE_ACCURACY = 0.01
+
+# Limite de buckets por sinal do sketch; acima dele os buckets de menor magnitude são unidos
+MAX_SKETCH_BINS = 2048
+
+# Valores com magnitude abaixo deste limite são contados como zero pelo sketch
+MIN_MAGNITUDE = 1e-9
+
+# Quantidade fixa de barras do StreamingHistogram
+HISTOGRAM_BINS = 128
+
+# Largura inicial (potência de 2) quando o primeiro bloco tem um único valor distinto
+MIN_WIDTH_EXPONENT = -10
+
+# Percentis padrão das consultas e do eixo Y robusto
+PERCENTILES = (1, 50, 99)
+
+
+class _Store:
+    """Contagens densas de buckets consecutivos de um sinal do sketch, a partir de offset"""
+    def __init__(self):
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, low: int, counts: np.ndarray, max_bins: int) -> None:
+        """Soma as contagens dos buckets low, low+1, ... e une os de menor índice acima do limite"""
+        if not len(counts):
+            return
+        if not len(self.counts):
+            self.offset, self.counts = low, counts.astype(np.int64)
+        else:
+            first = min(self.offset, low)
+            last = max(self.offset + len(self.counts), low + len(counts))
+            merged = np.zeros(last - first, dtype=np.int64)
+            merged[self.offset - first:self.offset - first + len(self.counts)] += self.counts
+            merged[low - first:low - first + len(counts)] += counts
+            self.offset, self.counts = first, merged
+        excess = len(self.counts) - max_bins
+        if excess > 0:
+            self.counts[excess] += self.counts[:excess].sum()
+            self.counts = self.counts[excess:]
+            self.offset += excess
+
+    def copy(self) -> '_Store':
+        """Cópia independente das contagens"""
+        store = _Store()
+        store.offset, store.counts = self.offset, self.counts.copy()
+        return store
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis com erro relativo garantido (algoritmo DDSketch): cada valor cai
+    em um bucket logarítmico de razão gamma = (1 + a) / (1 - a), de modo que o quantil
+    devolvido fica a no máximo a (RELATIVE_ACCURACY) do valor exato. A memória é
+    limitada (MAX_SKETCH_BINS buckets por sinal) e dois sketches com a mesma precisão
+    são combinados exatamente com merge(), somando as contagens dos buckets; assim é
+    possível manter um sketch por arquivo ou bloco e juntá-los. NaN e infinitos são
+    ignorados.
+    """
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY, max_bins: int = MAX_SKETCH_BINS):
+        """
+        Inicializa o sketch vazio
+
+        Args:
+            relative_accuracy: Erro relativo máximo dos quantis (entre 0 e 1)
+            max_bins: Limite de buckets por sinal (memória constante)
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Precisão relativa inválida: {relative_accuracy} (use um valor entre 0 e 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = _Store()
+        self.negative = _Store()  # Buckets das magnitudes dos valores negativos
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _add(self, store: _Store, magnitudes: np.ndarray) -> None:
+        """Conta magnitudes positivas nos buckets logarítmicos de um dos sinais"""
+        if not len(magnitudes):
+            return
+        indices = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+        low = int(indices.min())
+        store.add(low, np.bincount(indices - low), self.max_bins)
+
+    def update_batch(self, values) -> None:
+        """
+        Adiciona um bloco de valores de uma vez (vetorizado com numpy).
+
+        Args:
+            values: Lista ou array de valores (NaN e infinitos são ignorados)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        self._add(self.positive, values[values >= MIN_MAGNITUDE])
+        self._add(self.negative, -values[values <= -MIN_MAGNITUDE])
+        self.zero_count += int(np.count_nonzero(np.abs(values) < MIN_MAGNITUDE))
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """
+        Combina outro sketch com este (as contagens dos buckets são somadas).
+
+        Args:
+            other: Sketch a combinar, com a mesma precisão relativa
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Só é possível combinar sketches com a mesma precisão relativa")
+        if other.count == 0:
+            return
+        self.positive.add(other.positive.offset, other.positive.counts, self.max_bins)
+        self.negative.add(other.negative.offset, other.negative.counts, self.max_bins)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> 'QuantileSketch':
+        """Cópia independente do sketch"""
+        sketch = QuantileSketch(self.relative_accuracy, self.max_bins)
+        sketch.positive, sketch.negative = self.positive.copy(), self.negative.copy()
+        sketch.zero_count, sketch.count = self.zero_count, self.count
+        sketch.min, sketch.max = self.min, self.max
+        return sketch
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """
+        Quantis aproximados (erro relativo <= relative_accuracy, limitados ao mínimo e
+        ao máximo exatos).
+
+        Args:
+            qs: Quantis entre 0 e 1 (ex: [0.01, 0.5, 0.99])
+
+        Returns:
+            Array com um valor por quantil (NaN se o sketch estiver vazio)
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Os quantis devem estar entre 0 e 1")
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        # Valor representativo de cada bucket, em ordem crescente: negativos, zero, positivos
+        representative = 2.0 / (self.gamma + 1)
+        negative = np.arange(self.negative.offset, self.negative.offset + len(self.negative.counts))
+        positive = np.arange(self.positive.offset, self.positive.offset + len(self.positive.counts))
+        values = np.concatenate((-representative * self.gamma ** negative[::-1].astype(np.float64), [0.0],
+                                 representative * self.gamma ** positive.astype(np.float64)))
+        counts = np.concatenate((self.negative.counts[::-1], [self.zero_count], self.positive.counts))
+        ranks = np.cumsum(counts)
+        positions = np.searchsorted(ranks, qs * (self.count - 1), side='right')
+        return np.clip(values[np.minimum(positions, len(values) - 1)], self.min, self.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantil aproximado q (entre 0 e 1), ou None se o sketch estiver vazio"""
+        return float(self.quantiles([q])[0]) if self.count else None
+
+
+def _coarsen(start: int, counts: np.ndarray) -> Tuple[int, np.ndarray]:
+    """Dobra a largura das barras: as barras 2k e 2k + 1 viram a barra k"""
+    new_start = start // 2
+    positions = (start + np.arange(len(counts))) // 2 - new_start
+    return new_start, np.bincount(positions, weights=counts, minlength=len(counts)).astype(np.int64)
+
+
+def _rebase(start: int, counts: np.ndarray, new_start: int) -> np.ndarray:
+    """Reposiciona as contagens para começarem na barra new_start (barras com valores devem caber)"""
+    positions = start - new_start + np.arange(len(counts))
+    inside = (positions >= 0) & (positions < len(counts))
+    shifted = np.zeros(len(counts), dtype=np.int64)
+    shifted[positions[inside]] = counts[inside]
+    return shifted
+
+
+class StreamingHistogram:
+    """
+    Histograma de barras fixas, atualizado por blocos em memória constante. As barras
+    têm largura potência de 2 e são alinhadas a múltiplos dela (a barra k cobre
+    [k * largura, (k + 1) * largura)); quando um valor cai fora das barras, a largura
+    dobra e as barras vizinhas são somadas. Como as larguras são potências de 2 e
+    alinhadas, dois histogramas são combinados exatamente com merge(), mesmo que
+    tenham sido construídos com dados de faixas diferentes. NaN e infinitos são
+    ignorados.
+    """
+    def __init__(self, bins: int = HISTOGRAM_BINS):
+        """
+        Inicializa o histograma vazio
+
+        Args:
+            bins: Quantidade fixa de barras (ao menos 2)
+        """
+        if bins < 2:
+            raise ValueError(f"Quantidade de barras inválida: {bins} (use ao menos 2)")
+        self.bins = bins
+        self.exponent: Optional[int] = None  # Largura das barras = 2 ** exponent
+        self.start = 0  # Índice da primeira barra
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    @property
+    def width(self) -> Optional[float]:
+        """Largura das barras, ou None se o histograma estiver vazio"""
+        return None if self.exponent is None else 2.0 ** self.exponent
+
+    @property
+    def count(self) -> int:
+        """Quantidade de valores contados"""
+        return int(self.counts.sum())
+
+    def _include(self, low: int, high: int) -> Tuple[int, int]:
+        """
+        Dobra a largura até que as barras low..high caibam junto com as barras já
+        usadas e reposiciona a primeira barra se necessário.
+
+        Returns:
+            Tupla (low, high) na largura final
+        """
+        used = np.flatnonzero(self.counts)
+        while len(used):
+            first, last = min(self.start + int(used[0]), low), max(self.start + int(used[-1]), high)
+            if last - first < self.bins:
+                break
+            self.start, self.counts = _coarsen(self.start, self.counts)
+            self.exponent += 1
+            low, high = low // 2, high // 2
+            used = np.flatnonzero(self.counts)
+        if not len(used):
+            while high - low >= self.bins:
+                self.exponent += 1
+                low, high = low // 2, high // 2
+            self.start = low
+        elif first < self.start or last >= self.start + self.bins:
+            self.counts = _rebase(self.start, self.counts, first)
+            self.start = first
+        return low, high
+
+    def update_batch(self, values) -> None:
+        """
+        Adiciona um bloco de valores de uma vez (vetorizado com numpy).
+
+        Args:
+            values: Lista ou array de valores (NaN e infinitos são ignorados)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        lowest, highest = float(values.min()), float(values.max())
+        if self.exponent is None:
+            span = (highest - lowest) / self.bins
+            self.exponent = math.ceil(math.log2(span)) if span > 0 else MIN_WIDTH_EXPONENT
+        width = 2.0 ** self.exponent
+        self._include(math.floor(lowest / width), math.floor(highest / width))
+        indices = np.floor(values / 2.0 ** self.exponent).astype(np.int64) - self.start
+        self.counts += np.bincount(indices, minlength=self.bins)[:self.bins]
+
+    def merge(self, other: 'StreamingHistogram') -> None:
+        """
+        Combina outro histograma com este (as barras são somadas).
+
+        Args:
+            other: Histograma a combinar, com a mesma quantidade de barras
+        """
+        if other.bins != self.bins:
+            raise ValueError("Só é possível combinar histogramas com a mesma quantidade de barras")
+        if other.exponent is None or not other.count:
+            return
+        if self.exponent is None or not self.count:
+            self.exponent, self.start, self.counts = other.exponent, other.start, other.counts.copy()
+            return
+        start, counts, exponent = other.start, other.counts, other.exponent
+        while self.exponent < exponent:
+            self.start, self.counts = _coarsen(self.start, self.counts)
+            self.exponent += 1
+        while exponent < self.exponent:
+            start, counts = _coarsen(start, counts)
+            exponent += 1
+        used = np.flatnonzero(counts)
+        self._include(start + int(used[0]), start + int(used[-1]))
+        for _ in range(self.exponent - exponent):
+            start, counts = _coarsen(start, counts)
+        offset = start - self.start
+        used = np.flatnonzero(counts)
+        np.add.at(self.counts, used + offset, counts[used])
+
+    def copy(self) -> 'StreamingHistogram':
+        """Cópia independente do histograma"""
+        histogram = StreamingHistogram(self.bins)
+        histogram.exponent, histogram.start, histogram.counts = self.exponent, self.start, self.counts.copy()
+        return histogram
+
+    def edges(self) -> np.ndarray:
+        """Limites das barras (bins + 1 valores), ou array vazio se o histograma estiver vazio"""
+        if self.exponent is None:
+            return np.empty(0)
+        return (self.start + np.arange(self.bins + 1)) * 2.0 ** self.exponent
+
+    def nonempty(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Barras entre a primeira e a última com valores, para exibição.
+
+        Returns:
+            Tupla (limites, contagens) com len(limites) == len(contagens) + 1
+        """
+        used = np.flatnonzero(self.counts)
+        if not len(used):
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        first, last = int(used[0]), int(used[-1])
+        return self.edges()[first:last + 2], self.counts[first:last + 1]
+
+
+class ValueDistribution:
+    """
+    Distribuição dos valores de uma série mantida durante a ingestão: um QuantileSketch
+    para consultas de percentis e um StreamingHistogram para visualização, ambos
+    combináveis entre arquivos e blocos em memória constante.
+    """
+    def __init__(self):
+        """Inicializa a distribuição vazia"""
+        self.sketch = QuantileSketch()
+        self.histogram = StreamingHistogram()
+
+    @property
+    def count(self) -> int:
+        """Quantidade de valores válidos"""
+        return self.sketch.count
+
+    def update_batch(self, values) -> None:
+        """
+        Adiciona um bloco de valores ao sketch e ao histograma.
+
+        Args:
+            values: Lista ou array de valores (NaN e infinitos são ignorados)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.sketch.update_batch(values)
+        self.histogram.update_batch(values)
+
+    def merge(self, other: 'ValueDistribution') -> None:
+        """
+        Combina a distribuição de outro bloco ou arquivo da mesma série.
+
+        Args:
+            other: Distribuição a combinar
+        """
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+
+    def copy(self) -> 'ValueDistribution':
+        """Cópia independente da distribuição"""
+        distribution = ValueDistribution()
+        distribution.sketch, distribution.histogram = self.sketch.copy(), self.histogram.copy()
+        return distribution
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentil p (entre 0 e 100), ou None se não houver valores"""
+        return self.sketch.quantile(p / 100)
+
+    def percentiles(self, ps: Iterable[float] = PERCENTILES) -> Dict[str, Optional[float]]:
+        """
+        Vários percentis de uma vez.
+
+        Args:
+            ps: Percentis entre 0 e 100 (padrão: 1, 50 e 99)
+
+        Returns:
+            Dicionário {"p1": valor, "p50": valor, ...} (None se não houver valores)
+        """
+        ps = list(ps)
+        values = self.sketch.quantiles(np.asarray(ps, dtype=np.float64) / 100)
+        return {f"p{p:g}": (None if np.isnan(value) else float(value)) for p, value in zip(ps, values)}
+
+
+def robust_range(distributions: Iterable[ValueDistribution], low: float = PERCENTILES[0],
+                 high: float = PERCENTILES[-1], margin: float = 0.05) -> Optional[Tuple[float, float]]:
+    """
+    Faixa do eixo Y que cobre os percentis low..high de todas as séries, ignorando
+    picos isolados que achatariam o gráfico, com uma margem proporcional.
+
+    Args:
+        distributions: Distribuições das séries exibidas
+        low: Percentil inferior (0 a 100)
+        high: Percentil superior (0 a 100)
+        margin: Margem acrescentada a cada lado, como fração da faixa
+
+    Returns:
+        Tupla (mínimo, máximo) do eixo, ou None se nenhuma série tiver valores
+    """
+    bounds = [distribution.sketch.quantiles([low / 100, high / 100])
+              for distribution in distributions if distribution.count]
+    if not bounds:
+        return None
+    bottom = min(float(values[0]) for values in bounds)
+    top = max(float(values[1]) for values in bounds)
+    pad = (top - bottom) * margin if top > bottom else max(abs(top) * margin, 1.0)
+    return bottom - pad, top + pad
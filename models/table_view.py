@@ -0,0 +1,165 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Nome da coluna de timestamps nas páginas geradas
+TIME_COLUMN = 'Timestamp'
+
+
+class TableView:
+    """
+    Visualização paginada de um conjunto de dados colunar. Em vez de montar (e enviar
+    ao navegador) a tabela inteira, cada página é recortada dos arrays no servidor.
+
+    A janela de tempo é resolvida por aritmética sobre o índice de tempo implícito, e a
+    ordenação por coluna usa índices (argsort) calculados uma vez por coluna e sentido.
+    A última seleção (janela + ordenação) também fica em cache, então navegar entre as
+    páginas custa apenas o recorte da página.
+    """
+    def __init__(self, times: np.ndarray, columns: Dict[str, np.ndarray], time_index=None):
+        """
+        Inicializa a visualização
+
+        Args:
+            times: Timestamps datetime64 ordenados (uma linha por timestamp)
+            columns: Colunas de dados {nome -> array com o mesmo comprimento de times}
+            time_index: TimeIndex dos timestamps (padrão: calculado a partir de times),
+                usado para resolver a janela de tempo por aritmética
+        """
+        from .time_index import TimeIndex
+
+        self.times = np.asarray(times, dtype='datetime64[us]')
+        self.columns = columns
+        self.time_index = time_index if time_index is not None else TimeIndex.from_array(self.times)
+        self._sort_indexes = {}  # {(coluna, crescente) -> argsort}
+        self._selection_key = None
+        self._selection = None
+
+    @classmethod
+    def from_processor(cls, processor) -> 'TableView':
+        """
+        Cria a visualização a partir dos canais de um GTDProcessor (ver to_matrix),
+        com as colunas Ch{id}_Min_{unidade} e Ch{id}_Max_{unidade}.
+
+        Args:
+            processor: Processador com os dados carregados
+
+        Returns:
+            Um novo TableView
+        """
+        times, channel_ids, mins, maxs = processor.to_matrix()
+        columns = {}
+        for index, channel_id in enumerate(channel_ids):
+            unit = processor.channels[channel_id].unit
+            columns[f"Ch{channel_id}_Min_{unit}"] = mins[:, index]
+            columns[f"Ch{channel_id}_Max_{unit}"] = maxs[:, index]
+        return cls(times, columns)
+
+    @property
+    def rows(self) -> int:
+        """Quantidade total de linhas"""
+        return len(self.times)
+
+    @property
+    def column_names(self) -> List[str]:
+        """Nomes de todas as colunas, começando pelos timestamps"""
+        return [TIME_COLUMN] + list(self.columns)
+
+    @property
+    def time_range(self) -> Optional[Tuple]:
+        """Primeiro e último timestamp (datetime), ou None se não houver linhas"""
+        if not self.rows:
+            return None
+        return self.times[0].item(), self.times[-1].item()
+
+    def sort_index(self, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Índice de ordenação de uma coluna (NaN sempre no fim), calculado uma única vez.
+
+        Args:
+            column: Nome da coluna
+            ascending: Sentido da ordenação
+
+        Returns:
+            Array com as linhas na ordem pedida
+        """
+        key = (column, ascending)
+        if key not in self._sort_indexes:
+            if column == TIME_COLUMN:
+                index = np.arange(self.rows)
+                self._sort_indexes[key] = index if ascending else index[::-1]
+            else:
+                values = self.columns[column]
+                self._sort_indexes[key] = np.argsort(values if ascending else -values, kind='stable')
+        return self._sort_indexes[key]
+
+    def _window(self, start=None, end=None) -> Tuple[int, int]:
+        """Faixa de linhas [início, fim) da janela de tempo, calculada pelo índice de tempo"""
+        return self.time_index.window(start, end)
+
+    def select(self, start=None, end=None, sort_by: Optional[str] = None, ascending: bool = True) -> np.ndarray:
+        """
+        Linhas da janela de tempo na ordem pedida.
+
+        Args:
+            start: Início da janela (inclusive), ou None
+            end: Fim da janela (inclusive), ou None
+            sort_by: Coluna de ordenação (padrão: timestamps)
+            ascending: Sentido da ordenação
+
+        Returns:
+            Array com os índices das linhas selecionadas
+        """
+        key = (start, end, sort_by or TIME_COLUMN, ascending)
+        if key != self._selection_key:
+            low, high = self._window(start, end)
+            order = self.sort_index(sort_by or TIME_COLUMN, ascending)
+            if (sort_by or TIME_COLUMN) == TIME_COLUMN:
+                rows = order[low:high] if ascending else order[self.rows - high:self.rows - low]
+            elif low == 0 and high == self.rows:
+                rows = order
+            else:
+                rows = order[(order >= low) & (order < high)]
+            self._selection_key, self._selection = key, rows
+        return self._selection
+
+    def page(self, page: int = 0, page_size: int = 100, columns: Optional[List[str]] = None,
+             start=None, end=None, sort_by: Optional[str] = None,
+             ascending: bool = True) -> 'pandas.DataFrame':
+        """
+        Recorta uma página da visualização.
+
+        Args:
+            page: Número da página (a partir de 0)
+            page_size: Linhas por página
+            columns: Colunas a incluir (padrão: todas); os timestamps são sempre incluídos
+            start: Início da janela de tempo (inclusive), ou None
+            end: Fim da janela de tempo (inclusive), ou None
+            sort_by: Coluna de ordenação (padrão: timestamps)
+            ascending: Sentido da ordenação
+
+        Returns:
+            DataFrame com no máximo page_size linhas
+        """
+        import pandas as pd
+
+        rows = self.select(start, end, sort_by, ascending)[page * page_size:(page + 1) * page_size]
+        names = [name for name in (columns or self.columns) if name in self.columns]
+        data = {TIME_COLUMN: self.times[rows]}
+        data.update((name, self.columns[name][rows]) for name in names)
+        return pd.DataFrame(data)
+
+    def page_count(self, page_size: int = 100, start=None, end=None) -> int:
+        """
+        Quantidade de páginas da janela de tempo.
+
+        Args:
+            page_size: Linhas por página
+            start: Início da janela de tempo, ou None
+            end: Fim da janela de tempo, ou None
+
+        Returns:
+            Número de páginas (pelo menos 1)
+        """
+        low, high = self._window(start, end)
+        return max(1, -(-(high - low) // page_size))
@@ -0,0 +1,181 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class TimeIndex:
+    """
+    Índice de tempo implícito: a série de timestamps é guardada como sequências
+    uniformes (início, passo, quantidade) em vez de um timestamp por amostra. Uma
+    gravação regular ocupa uma única sequência; cada lacuna ou linha irregular abre
+    uma nova (linhas isoladas viram sequências de uma amostra).
+
+    Em séries crescentes, localizar um instante e recortar uma janela de tempo são
+    contas sobre as sequências, sem busca nas amostras.
+    """
+    def __init__(self, starts: np.ndarray, steps: np.ndarray, counts: np.ndarray):
+        """
+        Inicializa o índice
+
+        Args:
+            starts: Primeiro timestamp de cada sequência (datetime64[us])
+            steps: Passo de cada sequência (timedelta64[us])
+            counts: Quantidade de amostras de cada sequência
+        """
+        self.starts = np.asarray(starts, dtype='datetime64[us]')
+        self.steps = np.asarray(steps, dtype='timedelta64[us]')
+        self.counts = np.asarray(counts, dtype=np.int64)
+        # Posição da primeira amostra de cada sequência
+        self.offsets = np.cumsum(self.counts) - self.counts
+        ends = self.starts + self.steps * np.maximum(self.counts - 1, 0)
+        self.increasing = bool(np.all(self.steps[self.counts > 1] > np.timedelta64(0, 'us'))
+                               and np.all(self.starts[1:] > ends[:-1]))
+
+    @classmethod
+    def from_array(cls, timestamps) -> 'TimeIndex':
+        """
+        Monta o índice a partir dos timestamps, agrupando as diferenças iguais de forma
+        vetorizada (o laço final percorre apenas as sequências, não as amostras).
+
+        Args:
+            timestamps: Timestamps (datetime64 ou lista de datetime)
+
+        Returns:
+            Um novo TimeIndex
+        """
+        times = np.asarray(timestamps, dtype='datetime64[us]')
+        if len(times) < 2:
+            return cls(times[:1], np.zeros(len(times[:1]), dtype='timedelta64[us]'), np.ones(len(times[:1])))
+
+        # Grupos de diferenças consecutivas iguais: o grupo [a, b) cobre as amostras a..b
+        diffs = np.diff(times)
+        bounds = np.flatnonzero(np.concatenate(([True], diffs[1:] != diffs[:-1], [True])))
+        starts, steps, counts = [], [], []
+        position = 0  # Próxima amostra ainda não atribuída
+        last = len(bounds) - 2
+        for group, (first, end) in enumerate(zip(bounds[:-1].tolist(), bounds[1:].tolist())):
+            # Se só resta a última amostra do grupo, ela abre a próxima sequência
+            if position == end and group < last:
+                continue
+            starts.append(times[position])
+            steps.append(diffs[first])
+            counts.append(end - position + 1)
+            position = end + 1
+        return cls(np.array(starts), np.array(steps), np.array(counts))
+
+    @classmethod
+    def uniform(cls, start, step, count: int) -> 'TimeIndex':
+        """Índice de uma única sequência regular"""
+        return cls(np.array([start], dtype='datetime64[us]'), np.array([step], dtype='timedelta64[us]'),
+                   np.array([count]))
+
+    def __len__(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def runs(self) -> int:
+        """Quantidade de sequências uniformes"""
+        return len(self.counts)
+
+    @property
+    def is_uniform(self) -> bool:
+        """True se a série inteira é uma única sequência regular"""
+        return self.runs <= 1
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelo índice em bytes"""
+        return self.starts.nbytes + self.steps.nbytes + self.counts.nbytes + self.offsets.nbytes
+
+    def __getitem__(self, position: int) -> np.datetime64:
+        """Timestamp de uma posição, calculado a partir da sequência que a contém"""
+        size = len(self)
+        if position < 0:
+            position += size
+        if not 0 <= position < size:
+            raise IndexError("Posição fora do índice de tempo")
+        run = int(np.searchsorted(self.offsets, position, 'right')) - 1
+        return self.starts[run] + self.steps[run] * (position - self.offsets[run])
+
+    def to_array(self) -> np.ndarray:
+        """
+        Expande o índice para um timestamp por amostra.
+
+        Returns:
+            Array datetime64[us]
+        """
+        if not self.runs:
+            return np.empty(0, dtype='datetime64[us]')
+        within = np.arange(len(self)) - np.repeat(self.offsets, self.counts)
+        return np.repeat(self.starts, self.counts) + np.repeat(self.steps, self.counts) * within
+
+    def to_list(self) -> List[datetime]:
+        """Timestamps como lista de datetime"""
+        return self.to_array().tolist()
+
+    def position(self, timestamp, side: str = 'left') -> int:
+        """
+        Posição de inserção de um instante, como np.searchsorted, calculada por
+        aritmética sobre as sequências (exige timestamps crescentes).
+
+        Args:
+            timestamp: Instante procurado
+            side: 'left' (primeira posição >= instante) ou 'right' (primeira posição > instante)
+
+        Returns:
+            Posição entre 0 e len(self)
+        """
+        timestamp = np.datetime64(timestamp, 'us')
+        if not self.increasing:
+            return int(np.searchsorted(self.to_array(), timestamp, side))
+        run = int(np.searchsorted(self.starts, timestamp, 'right')) - 1
+        if run < 0:
+            return 0
+        elapsed = (timestamp - self.starts[run]).astype(np.int64)
+        step = self.steps[run].astype(np.int64)
+        if step > 0:
+            # Amostras da sequência até o instante (inclusive em 'right')
+            inside = elapsed // step + 1 if side == 'right' else -(-elapsed // step)
+        else:
+            inside = 1 if side == 'right' or elapsed > 0 else 0
+        return int(self.offsets[run] + min(inside, self.counts[run]))
+
+    def window(self, start=None, end=None) -> Tuple[int, int]:
+        """
+        Faixa de posições [início, fim) com timestamps entre start e end (inclusive).
+
+        Args:
+            start: Início da janela, ou None
+            end: Fim da janela, ou None
+
+        Returns:
+            Tupla (início, fim exclusivo)
+        """
+        low = 0 if start is None else self.position(start, 'left')
+        high = len(self) if end is None else self.position(end, 'right')
+        return low, max(low, high)
+
+    def to_dict(self) -> Dict:
+        """Representação serializável (sequências com início ISO e passo em microssegundos)"""
+        return {
+            "starts": [value.isoformat() for value in self.starts.tolist()],
+            "steps_us": self.steps.astype(np.int64).tolist(),
+            "counts": self.counts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TimeIndex':
+        """Recria o índice a partir de to_dict()"""
+        return cls(np.array(data["starts"], dtype='datetime64[us]'),
+                   np.array(data["steps_us"], dtype=np.int64).astype('timedelta64[us]'),
+                   np.array(data["counts"]))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TimeIndex):
+            return NotImplemented
+        return (np.array_equal(self.starts, other.starts) and np.array_equal(self.steps, other.steps)
+                and np.array_equal(self.counts, other.counts))
+
+    def __str__(self) -> str:
+        return f"TimeIndex({len(self)} amostras em {self.runs} sequências)"
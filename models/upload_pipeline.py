@@ -0,0 +1,219 @@
+import time
+from concurrent.futures import (Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED,
+                                wait)
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .gtd_processor import GTDProcessor
+
+# Estados de um arquivo no pipeline
+QUEUED, PARSING, PARSED, MERGED, FAILED = "queued", "parsing", "parsed", "merged", "error"
+
+
+def _parse_upload(raw: bytes, name: str, engine: str, track_memory: bool,
+                  options: Dict) -> Tuple[GTDProcessor, float]:
+    """
+    Processa um arquivo isolado em um processador próprio (executado em um worker).
+
+    Returns:
+        Tupla (processador com os dados do arquivo, tempo de processamento em segundos)
+    """
+    start = time.perf_counter()
+    processor = GTDProcessor(track_memory=track_memory, engine=engine, **options)
+    processor.process_bytes(raw, name)
+    return processor, time.perf_counter() - start
+
+
+class FileStatus:
+    """
+    Situação de um arquivo no pipeline de upload, atualizada à medida que ele é
+    processado e incorporado ao resultado.
+    """
+    def __init__(self, index: int, name: str, size: int):
+        self.index = index  # Posição do arquivo na ordem de envio
+        self.name = name
+        self.size = size  # Bytes
+        self.state = QUEUED
+        self.rows = 0  # Linhas de dados lidas
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+        self.elapsed: Optional[float] = None  # Tempo de processamento, quando concluído
+
+    @property
+    def running_time(self) -> float:
+        """Tempo de processamento em segundos (até agora, se ainda estiver em andamento)"""
+        if self.elapsed is not None:
+            return self.elapsed
+        return time.perf_counter() - self.started if self.started is not None else 0.0
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        """Linhas de dados por segundo, quando o arquivo já foi processado"""
+        return self.rows / self.elapsed if self.elapsed and self.rows else None
+
+    @property
+    def done(self) -> bool:
+        """True quando o arquivo foi incorporado ou falhou"""
+        return self.state in (MERGED, FAILED)
+
+    def to_dict(self) -> Dict:
+        """Situação do arquivo como dicionário, para exibição"""
+        return {
+            "file": self.name,
+            "state": self.state,
+            "size_bytes": self.size,
+            "rows": self.rows,
+            "elapsed_s": self.running_time,
+            "rows_per_s": self.rows_per_second,
+            "error": self.error,
+        }
+
+
+class UploadPipeline:
+    """
+    Processa vários arquivos GTD em paralelo e combina os resultados em ordem.
+
+    Cada arquivo é lido em um worker, em um GTDProcessor próprio; os resultados são
+    incorporados ao processador final (GTDProcessor.merge) na ordem de envio, assim
+    que todos os anteriores estiverem prontos, de modo que o resultado é o mesmo do
+    processamento sequencial. Um arquivo inválido ou lento não bloqueia o
+    processamento dos demais: arquivos com erro são registrados e ignorados.
+
+    Por padrão os workers são processos, já que o parsing é limitado pelo GIL; se o
+    pool de processos não puder ser criado, são usadas threads.
+    """
+    def __init__(self, files: Sequence[Tuple[str, bytes]], engine: str = 'reference',
+                 track_memory: bool = False, max_workers: Optional[int] = None,
+                 use_processes: bool = True, recorder_namespace: bool = False, utc: bool = False):
+        """
+        Inicializa o pipeline
+
+        Args:
+            files: Arquivos a processar, como pares (nome, conteúdo em bytes), na ordem de combinação
+            engine: Engine de parsing (ver GTDProcessor.ENGINES)
+            track_memory: Se True, as métricas registram o pico de memória de cada estágio
+            max_workers: Workers do pool (padrão: o do executor, limitado à quantidade de arquivos)
+            use_processes: Se False, usa threads em vez de processos
+            recorder_namespace: Se True, prefixa os canais com o número de série do registrador
+            utc: Se True, converte os timestamps para UTC (ver GTDProcessor)
+        """
+        self.processor = GTDProcessor(track_memory=track_memory, engine=engine,
+                                      recorder_namespace=recorder_namespace, utc=utc)
+        self.files = [FileStatus(index, name, len(raw)) for index, (name, raw) in enumerate(files)]
+        self._contents = [raw for _, raw in files]
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self._futures: Dict[Future, FileStatus] = {}
+        self._results: Dict[int, GTDProcessor] = {}
+        self._next = 0  # Próximo arquivo a incorporar
+        self._executor = None
+
+    def _create_executor(self):
+        """Cria o pool de workers (processos, ou threads se processos não estiverem disponíveis)"""
+        workers = min(self.max_workers or len(self.files), len(self.files)) or 1
+        if self.use_processes:
+            try:
+                return ProcessPoolExecutor(max_workers=workers)
+            except (OSError, NotImplementedError, ImportError):
+                pass
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gtd-upload")
+
+    def start(self) -> 'UploadPipeline':
+        """
+        Submete todos os arquivos ao pool.
+
+        Returns:
+            O próprio pipeline
+        """
+        self._executor = self._create_executor()
+        engine, track_memory = self.processor.engine, self.processor.metrics.track_memory
+        options = {"recorder_namespace": self.processor.recorder_namespace, "utc": self.processor.utc}
+        for status, raw in zip(self.files, self._contents):
+            future = self._executor.submit(_parse_upload, raw, status.name, engine, track_memory, options)
+            self._futures[future] = status
+        self._contents = []  # O pool mantém o conteúdo enquanto precisar dele
+        return self
+
+    def _collect(self, future: Future) -> FileStatus:
+        """Registra o resultado (ou o erro) de um arquivo concluído pelo worker"""
+        status = self._futures[future]
+        try:
+            processor, status.elapsed = future.result()
+        except Exception as e:
+            status.state, status.error = FAILED, str(e)
+            if status.started is not None:
+                status.elapsed = time.perf_counter() - status.started
+            return status
+        status.rows = sum(stage.rows for stage in processor.metrics.stages if stage.name == "data_parse")
+        status.state = PARSED
+        self._results[status.index] = processor
+        return status
+
+    def _merge_ready(self) -> List[FileStatus]:
+        """Incorpora, em ordem, os arquivos prontos cujos anteriores já foram concluídos"""
+        merged = []
+        while self._next < len(self.files) and self.files[self._next].state in (PARSED, FAILED):
+            status = self.files[self._next]
+            if status.state == PARSED:
+                self.processor.merge(self._results.pop(status.index))
+                status.state = MERGED
+                merged.append(status)
+            self._next += 1
+        return merged
+
+    def updates(self, poll_interval: Optional[float] = None) -> Iterator[Optional[FileStatus]]:
+        """
+        Produz cada arquivo sempre que o estado dele muda (processando, processado,
+        incorporado ou erro). Com poll_interval, também produz None periodicamente
+        enquanto espera, para que a interface atualize os tempos.
+
+        Args:
+            poll_interval: Intervalo máximo de espera entre atualizações (segundos)
+
+        Yields:
+            O FileStatus atualizado, ou None a cada poll_interval sem mudanças
+        """
+        if self._executor is None:
+            self.start()
+        pending = set(self._futures)
+        try:
+            while pending:
+                for future in pending:
+                    status = self._futures[future]
+                    if status.state == QUEUED and future.running():
+                        status.state, status.started = PARSING, time.perf_counter()
+                        yield status
+                done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                if not done:
+                    yield None
+                # Conclusões em ordem de envio, para que a incorporação não dependa do acaso
+                for future in sorted(done, key=lambda item: self._futures[item].index):
+                    yield self._collect(future)
+                for status in self._merge_ready():
+                    yield status
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self) -> GTDProcessor:
+        """
+        Processa todos os arquivos e espera o término.
+
+        Returns:
+            O processador com os arquivos válidos combinados
+        """
+        for _ in self.updates():
+            pass
+        return self.processor
+
+    @property
+    def progress(self) -> float:
+        """Fração dos arquivos concluídos (incorporados ou com erro), de 0 a 1"""
+        return sum(status.done for status in self.files) / max(1, len(self.files))
+
+    @property
+    def failed(self) -> List[FileStatus]:
+        """Arquivos que não puderam ser processados"""
+        return [status for status in self.files if status.state == FAILED]
+
+    def statuses(self) -> List[Dict]:
+        """Situação de cada arquivo, para exibição"""
+        return [status.to_dict() for status in self.files]
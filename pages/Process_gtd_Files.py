@@ -2,25 +2,28 @@ import streamlit as st
 import os
 import sys
 import pandas as pd
-import tempfile
 import json
 import numpy as np
 from datetime import datetime
-from PIL import Image
 from pathlib import Path
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 # Adds the project root directory to PATH
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 # Imports the necessary classes
-from models.gtd_processor import GTDProcessor
 from models.Channel import Channel
+from models.gaps import break_at_gaps, gaps_table
+from models.table_view import TableView
+from models.math_channels import FUNCTIONS
+from models.export_jobs import ExportOrchestrator
+from models.upload_pipeline import UploadPipeline
+from models.arrow_io import ARROW_AVAILABLE
+from models.runs import RunComparison
+from models.alarms import AlarmEngine, AlarmRule
 
 # Import CSS loader
 from utils.css_loader import load_css
@@ -147,106 +150,112 @@ st.markdown("""
 # 
 
 # Function to process GTD files (using session state instead of file system)
-def process_gtd_files(uploaded_files):
-    """Process GTD files and store results in session state to avoid conflicts between users"""
+def process_gtd_files(uploaded_files, track_memory=False, recorder_namespace=False, utc=False):
+    """Process GTD files concurrently in background workers, showing the status of each
+    file and merging the results in upload order (files that fail are skipped)"""
     print("Processing GTD files...")
-    # Create a GTD processor
-    processor = GTDProcessor()
-    
     # If there are no files, return None
     if not uploaded_files:
         return None
-      # Process uploaded files directly from memory
-    for uploaded_file in uploaded_files:
-        temp_filepath = None
-        try:
-            # Create temporary file in memory with proper context management
-            with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.gtd') as temp_file:
-                temp_file.write(uploaded_file.getbuffer())
-                temp_filepath = temp_file.name
-            
-            # Process the temporary file
-            processor.process_file(temp_filepath)
-            st.success(f"File {uploaded_file.name} processed successfully.")
-            
-        except Exception as e:
-            st.error(f"Error processing file {uploaded_file.name}: {str(e)}")
-        finally:
-            # Clean up temporary file with error handling
-            if temp_filepath and os.path.exists(temp_filepath):
-                try:
-                    os.unlink(temp_filepath)
-                except PermissionError:
-                    # If file is still locked, try again after a brief delay
-                    import time
-                    time.sleep(0.1)
-                    try:
-                        os.unlink(temp_filepath)
-                    except:
-                        pass  # If still can't delete, continue
     
-    return processor
+    # Files are parsed straight from memory, each one in its own worker
+    pipeline = UploadPipeline([(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files],
+                              track_memory=track_memory, recorder_namespace=recorder_namespace, utc=utc)
+    progress = st.progress(0.0, text="Processing files...")
+    status_table = st.empty()
+    try:
+        for _ in pipeline.updates(poll_interval=0.25):
+            status_table.dataframe(
+                pd.DataFrame([{
+                    "File": status["file"],
+                    "Status": status["state"],
+                    "Rows": status["rows"],
+                    "Time (s)": round(status["elapsed_s"], 2),
+                    "Rows/s": round(status["rows_per_s"]) if status["rows_per_s"] else None,
+                } for status in pipeline.statuses()]),
+                hide_index=True, use_container_width=True
+            )
+            done = sum(status.done for status in pipeline.files)
+            progress.progress(pipeline.progress, text=f"Processing files... {done}/{len(pipeline.files)} done")
+    finally:
+        progress.empty()
+    
+    for status in pipeline.files:
+        if status.state == "merged":
+            st.success(f"File {status.name} processed successfully.")
+        else:
+            st.error(f"Error processing file {status.name}: {status.error}")
+    
+    return pipeline.processor
+
+# Download button settings per export format: label and MIME type
+EXPORT_DOWNLOADS = {
+    "xlsx": ("📊 Export - Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "json": ("📄 Export - JSON", "application/json"),
+    "csv": ("🧾 Export - CSV", "text/csv"),
+}
+# Parquet is offered only when the optional pyarrow dependency is installed
+if ARROW_AVAILABLE:
+    EXPORT_DOWNLOADS["parquet"] = ("🧱 Export - Parquet", "application/vnd.apache.parquet")
+
+# Function to render the download buttons of the generated exports
+def render_downloads(export_data, key_prefix="download"):
+    """Render one download button per generated export format"""
+    columns = st.columns(len(EXPORT_DOWNLOADS))
+    for column, (fmt, (label, mime)) in zip(columns, EXPORT_DOWNLOADS.items()):
+        if fmt in export_data:
+            data, file_name = export_data[fmt]
+            column.download_button(
+                label=label,
+                data=data,
+                file_name=file_name,
+                mime=mime,
+                use_container_width=True,
+                key=f"{key_prefix}_{fmt}"
+            )
 
 # Function to generate results in memory (no file system storage)
 def generate_results_in_memory(processor, base_filename):
-    """Generate Excel and JSON data in memory without saving to file system"""
+    """Generate all export formats concurrently in memory, showing the progress of each
+    format and offering each download as soon as its file is ready"""
     if not processor:
-        return None, None
+        return {}
     
     # Generate timestamp for filename
     timestamp = datetime.now().strftime("%Y%m%d_%Hh%Mm%Ss")
+    orchestrator = ExportOrchestrator(processor, list(EXPORT_DOWNLOADS), f"{base_filename}_{timestamp}")
     
+    columns = st.columns(len(EXPORT_DOWNLOADS))
+    slots = {fmt: column.empty() for fmt, column in zip(EXPORT_DOWNLOADS, columns)}
+    progress = st.progress(0.0, text="Generating exports...")
+    results = {}
     try:
-        # Create Excel in memory using BytesIO
-        from io import BytesIO
-        
-        excel_filename = f"{base_filename}_{timestamp}.xlsx"
-        
-        # Create temporary file with proper context management
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.xlsx') as temp_excel:
-            temp_path = temp_excel.name
-        
-        try:
-            # Export to temporary file
-            processor.export_to_excel(temp_path)
-            
-            # Read Excel data to memory
-            with open(temp_path, 'rb') as f:
-                excel_data = f.read()
-                
-        finally:
-            # Ensure cleanup even if error occurs
-            if os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except PermissionError:
-                    # If file is still locked, try again after a brief delay
-                    import time
-                    time.sleep(0.1)
-                    try:
-                        os.unlink(temp_path)
-                    except:
-                        pass  # If still can't delete, continue
-        
-        # Create JSON in memory
-        json_filename = f"{base_filename}_{timestamp}.json"
-        json_data = {
-            "metadata": processor.metadata,
-            "channels": {}
-        }
-        
-        # Add each channel to the JSON
-        for channel_id, channel in processor.channels.items():
-            json_data["channels"][str(channel_id)] = channel.to_json()
-        
-        json_string = json.dumps(json_data, indent=4)
-        json_bytes = json_string.encode('utf-8')
-        
-        return (excel_data, excel_filename), (json_bytes, json_filename)
-        
+        for job in orchestrator.as_completed(poll_interval=0.25):
+            if job is not None:
+                if job.state == "done":
+                    results[job.fmt] = (job.data, job.filename)
+                    label, mime = EXPORT_DOWNLOADS[job.fmt]
+                    slots[job.fmt].download_button(
+                        label=f"{label} ({job.elapsed:.1f} s)",
+                        data=job.data,
+                        file_name=job.filename,
+                        mime=mime,
+                        use_container_width=True,
+                        key=f"progress_download_{job.fmt}"
+                    )
+                else:
+                    slots[job.fmt].error(f"{job.fmt.upper()} export failed: {job.error}")
+            # Show the state of the formats still being generated
+            for status in orchestrator.statuses():
+                if status["state"] in ("queued", "running"):
+                    slots[status["format"]].info(
+                        f"⏳ {status['format'].upper()}: {status['state']} ({status['elapsed_s']:.1f} s)")
+            progress.progress(orchestrator.progress,
+                              text=f"Generating exports... {len(results)}/{len(orchestrator.jobs)} ready")
     except Exception as e:
         st.error(f"Error generating results: {str(e)}")
-        return None, None
+    progress.empty()
+    return results
 
 # Function to create channel data for download (in memory)
 def generate_channel_data(processor):
@@ -277,33 +286,60 @@ def generate_channel_data(processor):
 # Function to load data from memory for visualization
 def load_data_for_visualization(processor):
     """Load processed data directly from processor object for visualization"""
-    if not processor or not processor.channels:
-        return None
-    
-    # Create DataFrame from processor data
-    df_data = {}
-    
-    # Get the channel with most samples to use as base for timestamps
-    max_samples = 0
-    base_channel = None
-    for channel in processor.channels.values():
-        if len(channel.timestamps) > max_samples:
-            max_samples = len(channel.timestamps)
-            base_channel = channel
-    
-    if base_channel is None:
+    if not processor:
         return None
     
-    # Add timestamp column
-    df_data['Timestamp'] = base_channel.timestamps
+    return processor.to_dataframe()
+
+# Function to get the paginated table view of the processed data
+def get_table_view(processor):
+    """Build the server-side table view once per processed dataset and keep it across reruns"""
+    key = (id(processor), processor.data_version)
+    cached = st.session_state.get("table_view")
+    if cached is None or cached[0] != key:
+        cached = (key, TableView.from_processor(processor))
+        st.session_state["table_view"] = cached
+    return cached[1]
+
+# Function to render a paginated data table
+def render_data_table(view, columns, key):
+    """Render one page of the table view; only that page is sent to the browser"""
+    if view.rows == 0:
+        st.info("No data to display")
+        return
     
-    # Add data from all channels
-    for channel_id, channel in processor.channels.items():
-        if len(channel.timestamps) == max_samples:  # Only use channels with same number of samples
-            df_data[f"Ch{channel_id}_Min_{channel.unit}"] = channel.samples_min
-            df_data[f"Ch{channel_id}_Max_{channel.unit}"] = channel.samples_max
+    start, end = view.time_range
+    if start < end:
+        start, end = st.slider(
+            "Time window",
+            min_value=start,
+            max_value=end,
+            value=(start, end),
+            format="YYYY-MM-DD HH:mm:ss",
+            key=f"{key}_window"
+        )
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_by = st.selectbox("Sort by", ["Timestamp"] + [col for col in columns if col != "Timestamp"],
+                               key=f"{key}_sort")
+    with col2:
+        ascending = st.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Ascending"
+    with col3:
+        page_size = st.selectbox("Rows per page", [50, 100, 500, 1000], index=1, key=f"{key}_page_size")
+    page_count = view.page_count(page_size, start=start, end=end)
+    # Keep the page number valid when the window or page size shrinks the table
+    if st.session_state.get(f"{key}_page", 1) > page_count:
+        st.session_state[f"{key}_page"] = page_count
+    with col4:
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1,
+                               key=f"{key}_page")
     
-    return pd.DataFrame(df_data)
+    page_df = view.page(page - 1, page_size, columns=columns, start=start, end=end,
+                        sort_by=sort_by, ascending=ascending)
+    total = len(view.select(start, end, sort_by, ascending))
+    first_row = (page - 1) * page_size
+    st.caption(f"Rows {first_row + 1 if total else 0}–{first_row + len(page_df)} of {total}")
+    st.dataframe(page_df, use_container_width=True, hide_index=True)
 
 # Sidebar for settings
 col1, col2 = st.columns([1, 3], vertical_alignment="top", border=True)
@@ -318,6 +354,16 @@ with col1:
     # Option to save channels to database
     save_to_database = st.checkbox("💾 **Save channels to database**", value=True)
     
+    # Option to show stage timings and peak memory of the processing pipeline
+    show_diagnostics = st.checkbox("🩺 **Show processing diagnostics**", value=False,
+                                   help="Records peak memory per stage, which slows processing down")
+    
+    # Multi-recorder datasets: namespaced channel IDs and timestamps in UTC from the file headers
+    recorder_namespace = st.checkbox("🏷️ **Prefix channels with recorder serial**", value=False,
+                                     help="Keeps channels from different recorders (Serial No.) apart")
+    use_utc = st.checkbox("🌐 **Convert timestamps to UTC**", value=False,
+                          help="Uses the Time Zone and DST of each file header")
+    
     st.markdown('</div>', unsafe_allow_html=True)
     
 
@@ -351,24 +397,18 @@ if st.button("Process Files", use_container_width=True):
         with st.spinner("Processing files..."):
             try:
                     # Process the files
-                    processor = process_gtd_files(uploaded_files)
+                    processor = process_gtd_files(uploaded_files, track_memory=show_diagnostics,
+                                                  recorder_namespace=recorder_namespace, utc=use_utc)
                     
                     # If processing was successful
                     if processor and processor.channels:
                         st.session_state["processor_files"] = processor
                         
-                        # Generate results in memory
-                        excel_result, json_result = generate_results_in_memory(processor, base_filename)
-                        if excel_result and json_result:
-                            st.session_state["excel_data"] = excel_result
-                            st.session_state["json_data"] = json_result
-                            st.markdown("""
-                            <div class="success-box">
-                                <p style="color: #155724; margin: 0;">
-                                    <strong>✅ Success:</strong> Files processed successfully!
-                                </p>
-                            </div>
-                            """, unsafe_allow_html=True)
+                        # Generate results in memory; downloads appear as each format finishes
+                        export_data = generate_results_in_memory(processor, base_filename)
+                        if export_data:
+                            st.session_state["export_data"] = export_data
+                            st.rerun()
                         else:
                             st.error("Error generating processed files.")
                     else:
@@ -381,31 +421,12 @@ if st.button("Process Files", use_container_width=True):
 if st.session_state.get("processor_files"):
     processor = st.session_state["processor_files"]
     # Get data from session state
-    excel_data = st.session_state.get("excel_data")
-    json_data = st.session_state.get("json_data")
+    export_data = st.session_state.get("export_data")
     # If results were generated successfully
-    if excel_data and json_data:
+    if export_data:
         st.success(f"Files processed successfully!")
         # Create download buttons
-        c1, c2, c3 = st.columns(3)
-        # Excel download
-        with c1:
-            st.download_button(
-                label="📊 Export - Excel",
-                data=excel_data[0],
-                file_name=excel_data[1],
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
-        # JSON download
-        with c2:
-            st.download_button(
-                label="📄 Export - JSON",
-                data=json_data[0],
-                file_name=json_data[1],
-                mime="application/json",
-                use_container_width=True
-            )
+        render_downloads(export_data)
         # # Channel data download (if option is checked)
         # if save_to_database:
         #     with c3:
@@ -423,23 +444,94 @@ if st.session_state.get("processor_files"):
         #                         <h4 class="ghfm-info-title">📋 Processed Channels</h4>
         #                     </div>
         #                 """, unsafe_allow_html=True)
+        # Derived math channels: expressions over channel IDs, evaluated vectorized
+        with st.expander(f"🧮 Math channels ({len(processor.math_channels)})", expanded=False):
+            with st.form("math_channel_form", clear_on_submit=True):
+                col1, col2, col3 = st.columns([1, 3, 1])
+                math_id = col1.text_input("Name", placeholder="delta_D1")
+                math_expression = col2.text_input("Expression", placeholder="Ch1 - Ch10  |  mean(Ch1, Ch2, Ch3)  |  Ch4.max - Ch4.min")
+                math_unit = col3.text_input("Unit", placeholder="same as first input")
+                add_math = st.form_submit_button("➕ Add math channel")
+            st.caption("Reference channels as Ch<id> (Ch1, Ch1_mancal_D1), quoted when the ID has other characters ('Ch5_mancal-D1'). Functions: " + ", ".join(sorted(FUNCTIONS)))
+            math_changed = False
+            if add_math:
+                if not math_id.strip() or not math_expression.strip():
+                    st.warning("Please provide both a name and an expression")
+                else:
+                    try:
+                        processor.add_math_channel(math_id.strip(), math_expression, unit=math_unit.strip() or None)
+                        math_changed = True
+                    except ValueError as e:
+                        st.error(str(e))
+            for math_channel_id, math_channel in list(processor.math_channels.items()):
+                col1, col2 = st.columns([5, 1])
+                col1.markdown(f"**Ch{math_channel_id}** = `{math_channel.expression}` ({processor.channels[math_channel_id].unit})")
+                if col2.button("Remove", key=f"remove_math_{math_channel_id}", use_container_width=True):
+                    processor.remove_math_channel(math_channel_id)
+                    math_changed = True
+            if math_changed:
+                # Derived channels are part of the exports, so regenerate them
+                export_data = generate_results_in_memory(processor, base_filename)
+                if export_data:
+                    st.session_state["export_data"] = export_data
+                st.rerun()
         if processor.channels:
             # Create a DataFrame to display channel information
             channel_info = []
             for channel_id, channel in processor.channels.items():
-                # Ensure channel ID is converted to string to avoid type issues
+                # Statistics are kept up to date at ingest time, so this table is O(1) per channel
+                stats = channel.stats
                 channel_info.append({
                     'Channel ID': str(channel.channel_id),  # Explicitly convert to string
                     'Unit': channel.unit,
-                    'Samples': len(channel.timestamps),
-                    'First Sample': channel.timestamps[0] if channel.timestamps else None,
-                    'Last Sample': channel.timestamps[-1] if channel.timestamps else None
+                    'Samples': stats.samples,
+                    'Over-range': stats.over_range_count,
+                    'Min': stats.minimum,
+                    'Max': stats.maximum,
+                    'Mean (Max)': stats.max_stats.to_dict()['mean'],
+                    'Std (Max)': stats.max_stats.std,
+                    'P1 (Min)': stats.min_distribution.percentile(1),
+                    'Median (Max)': stats.max_distribution.percentile(50),
+                    'P99 (Max)': stats.max_distribution.percentile(99),
+                    'First Sample': stats.first_time,
+                    'Last Sample': stats.last_time
                 })
             # Create DataFrame outside the loop to avoid recreating it on each iteration
             channel_df = pd.DataFrame(channel_info)
             st.dataframe(channel_df)
+            # Distributions are sketched at ingest time and merged across files, so no column is rescanned
+            with st.expander("📶 Value distributions", expanded=False):
+                distributions = processor.column_distributions()
+                dist_column = st.selectbox("Column", list(distributions), key="distribution_column")
+                distribution = distributions[dist_column]
+                percentiles = distribution.percentiles((1, 5, 50, 95, 99))
+                for metric_col, (name, value) in zip(st.columns(len(percentiles)), percentiles.items()):
+                    metric_col.metric(name.upper(), "—" if value is None else f"{value:.3f}")
+                edges, counts = distribution.histogram.nonempty()
+                if len(counts):
+                    fig_dist = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                                                hovertemplate="%{x}<br>Samples: %{y}<extra></extra>"))
+                    fig_dist.update_layout(height=350, xaxis_title=dist_column, yaxis_title="Samples", bargap=0)
+                    st.plotly_chart(fig_dist, use_container_width=True)
+                else:
+                    st.info(f"Column '{dist_column}' has no valid data")
         else:
             st.warning("No channels were found in the processed files.")
+        # Display processing diagnostics
+        if show_diagnostics:
+            with st.expander("🩺 Processing Diagnostics", expanded=False):
+                metrics = processor.metrics
+                m1, m2, m3 = st.columns(3)
+                m1.metric("Files", metrics.files)
+                m2.metric("Bad rows", metrics.bad_rows)
+                m3.metric("Bad values", metrics.bad_values)
+                summary = metrics.summary()
+                if summary:
+                    summary_df = pd.DataFrame.from_dict(summary, orient="index")
+                    summary_df.index.name = "Stage"
+                    st.dataframe(summary_df)
+                    st.caption(f"Total stage time: {metrics.total_time():.3f} s")
+                    st.dataframe(pd.DataFrame(metrics.to_records()))
           # Display metadata        if processor.metadata:
             st.markdown("""
                             <div class="ghfm-info-card slide-in">
@@ -452,6 +544,159 @@ if st.session_state.get("processor_files"):
                                 <h4 class="ghfm-info-title">📊 Data Visualization</h4>
                             </div>
                         """, unsafe_allow_html=True)
+        # Recorders with different intervals, aligned onto a common time grid
+        if len(processor.recorders) > 1:
+            with st.expander(f"🔗 Recorder alignment ({len(processor.recorders)} recorders)", expanded=False):
+                st.dataframe(pd.DataFrame([{
+                    "Serial No.": serial, "Model": info.get("Model"), "Interval": info.get("Sampling Interval"),
+                    "Time Zone (min)": info.get("Time Zone"), "DST": info.get("DST"),
+                    "Files": info["files"], "Channels": len(info["channels"]),
+                } for serial, info in processor.recorders.items()]), hide_index=True, use_container_width=True)
+                col1, col2 = st.columns(2)
+                align_interval = col1.text_input("Grid interval", value="",
+                                                 placeholder="slowest recorder (e.g. 10 s, 1 min)")
+                align_method = col2.selectbox("Join", ["asof", "linear"],
+                                              help="asof: last sample at or before each grid time; linear: interpolated")
+                try:
+                    aligned_df = processor.align(interval=align_interval.strip() or None, method=align_method)
+                    st.caption(f"{len(aligned_df)} grid rows")
+                    st.dataframe(aligned_df.head(500), use_container_width=True, hide_index=True)
+                    st.download_button("🧾 Download aligned CSV", aligned_df.to_csv(index=False),
+                                       file_name=f"{base_filename}_aligned.csv", mime="text/csv")
+                except ValueError as e:
+                    st.error(str(e))
+        # Correlation and thermal lag between all channel pairs (cached until the data changes)
+        if len(processor.channels) > 1:
+            with st.expander("🔗 Correlation & lag", expanded=False):
+                col1, col2, col3 = st.columns(3)
+                corr_interval = col1.text_input("Resample interval", value="",
+                                                placeholder="raw samples (e.g. 1 min)", key="corr_interval")
+                corr_series = col2.selectbox("Series", ["mid", "max", "min"], key="corr_series",
+                                             help="mid: midpoint of Min and Max")
+                corr_max_lag = col3.text_input("Max lag", value="", placeholder="quarter of the window (e.g. 30 min)",
+                                               key="corr_max_lag")
+                try:
+                    result = processor.correlation(interval=corr_interval.strip() or None, series=corr_series,
+                                                   max_lag=corr_max_lag.strip() or None)
+                    fig = px.imshow(result.correlation_frame(), zmin=-1, zmax=1, color_continuous_scale="RdBu_r",
+                                    text_auto=".2f", aspect="auto")
+                    fig.update_layout(height=max(400, 30 * len(result.channel_ids)), title="Pearson correlation")
+                    st.plotly_chart(fig, use_container_width=True)
+                    st.caption(f"{result.samples} aligned points · step {result.step / np.timedelta64(1, 's'):g} s")
+                    st.dataframe(result.pairs(), hide_index=True, use_container_width=True)
+                except ValueError as e:
+                    st.error(str(e))
+        # Repeated test runs: overlay saved runs by elapsed time from start or Trigger Point
+        saved_runs = st.session_state.setdefault("runs", {})
+        with st.expander(f"🏁 Run comparison ({len(saved_runs)} saved runs)", expanded=False):
+            col1, col2 = st.columns([3, 1], vertical_alignment="bottom")
+            run_name = col1.text_input("Run name", value=f"Run {len(saved_runs) + 1}")
+            if col2.button("📌 Save current data as run", use_container_width=True):
+                saved_runs[run_name.strip() or f"Run {len(saved_runs) + 1}"] = processor.snapshot()
+                st.rerun()
+            if saved_runs:
+                st.caption("Saved runs: " + ", ".join(saved_runs))
+            if len(saved_runs) >= 2:
+                col1, col2, col3, col4 = st.columns(4)
+                run_origin = col1.selectbox("Time zero", ["start", "trigger"],
+                                            help="First sample of each run, or its Trigger Point")
+                run_kind = col2.selectbox("Series", ["max", "min"])
+                reference_run = col3.selectbox("Reference", ["Mean of runs"] + list(saved_runs))
+                if col4.button("Clear runs", use_container_width=True):
+                    st.session_state["runs"] = {}
+                    st.rerun()
+                try:
+                    # The comparison caches the aligned run matrices per channel across reruns
+                    key = (tuple(saved_runs), run_origin)
+                    if st.session_state.get("run_comparison_key") != key:
+                        st.session_state["run_comparison"] = RunComparison(saved_runs, origin=run_origin)
+                        st.session_state["run_comparison_key"] = key
+                    comparison = st.session_state["run_comparison"]
+                    if not comparison.channel_ids:
+                        st.warning("The saved runs have no channels in common")
+                    else:
+                        run_channel = st.selectbox("Channel", comparison.channel_ids, format_func=lambda c: f"Ch{c}")
+                        elapsed = comparison.elapsed_s
+                        stats = comparison.statistics(run_channel, run_kind)
+                        fig = go.Figure()
+                        fig.add_trace(go.Scatter(x=np.concatenate([elapsed, elapsed[::-1]]),
+                                                 y=np.concatenate([stats["max"], stats["min"][::-1]]),
+                                                 fill="toself", line=dict(width=0), opacity=0.25,
+                                                 name="Min–Max across runs"))
+                        for name, series in zip(comparison.names, comparison.values(run_channel, run_kind)):
+                            fig.add_trace(go.Scattergl(x=elapsed, y=series, mode="lines", name=name, line=dict(width=1)))
+                        fig.add_trace(go.Scattergl(x=elapsed, y=stats["mean"], mode="lines", name="Mean",
+                                                   line=dict(width=2, dash="dash", color="black")))
+                        fig.update_layout(height=500, xaxis_title="Elapsed time (s)", hovermode="x unified")
+                        st.plotly_chart(fig, use_container_width=True)
+                        reference = None if reference_run == "Mean of runs" else reference_run
+                        st.dataframe(comparison.deviations(run_channel, reference=reference, kind=run_kind),
+                                     hide_index=True, use_container_width=True)
+                except ValueError as e:
+                    st.error(str(e))
+        # Sampling regularity of each recorder against its own header Sampling Interval
+        sampling_reports = processor.check_sampling_by_recorder()
+        if sampling_reports:
+            regular = all(sampling_report.regular for sampling_report in sampling_reports.values())
+            with st.expander("⏱️ Sampling regularity", expanded=not regular):
+                for serial, sampling_report in sampling_reports.items():
+                    if len(sampling_reports) > 1:
+                        st.markdown(f"**Recorder {serial or 'unknown'}**")
+                    col1, col2, col3, col4 = st.columns(4)
+                    col1.metric("Interval", f"{sampling_report.interval_s:g} s", help=f"Source: {sampling_report.interval_source}")
+                    col2.metric("Gaps", len(sampling_report.gaps))
+                    col3.metric("Duplicates", sampling_report.duplicates)
+                    col4.metric("Max jitter", f"{sampling_report.jitter_max_s:g} s")
+                    if sampling_report.out_of_order:
+                        st.warning(f"{sampling_report.out_of_order} timestamps are earlier than the previous sample")
+                    gaps_df = gaps_table(sampling_report)
+                    if gaps_df is not None:
+                        st.dataframe(gaps_df, use_container_width=True)
+        # Sensor health: flatlines, stuck readings, Min-Max spread and rate-of-change spikes
+        health_events = processor.health_events()
+        with st.expander(f"🩺 Sensor health ({len(health_events)} events)", expanded=False):
+            if health_events.empty:
+                st.success("No flatline, stuck, spread or spike events detected")
+            else:
+                counts = health_events.groupby('Evento').size()
+                columns = st.columns(len(counts))
+                for column, (event, count) in zip(columns, counts.items()):
+                    column.metric(event.capitalize(), int(count))
+                st.dataframe(health_events, use_container_width=True)
+        # Threshold alarms: limits with hysteresis and minimum duration, per channel or tag pattern
+        with st.expander("🚨 Alarm rules", expanded=False):
+            st.caption("Channels: IDs or patterns over the channel ID and tag, comma separated (e.g. 3, *mancal*)")
+            rules_df = st.data_editor(
+                pd.DataFrame([{"name": "Bearing above 120 °C", "channels": "*mancal*", "direction": "above",
+                               "limit": 120.0, "hysteresis": 2.0, "min_duration": "5 min", "series": None}]),
+                num_rows="dynamic", hide_index=True, use_container_width=True, key="alarm_rules",
+                column_config={
+                    "direction": st.column_config.SelectboxColumn("direction", options=["above", "below"]),
+                    "series": st.column_config.SelectboxColumn("series", options=["min", "max", "mid"],
+                                                               help="Empty: Max for above, Min for below"),
+                })
+            try:
+                records = [record for record in rules_df.to_dict("records")
+                           if record.get("name") and record.get("channels") and pd.notna(record.get("limit"))]
+                records = [{key: (None if isinstance(value, float) and np.isnan(value) else value)
+                            for key, value in record.items()} for record in records]
+                # The engine keeps its state across reruns and only evaluates samples appended since
+                key = (json.dumps(records, sort_keys=True, default=str), id(processor))
+                if st.session_state.get("alarm_engine_key") != key:
+                    st.session_state["alarm_engine"] = AlarmEngine([AlarmRule.from_dict(record) for record in records])
+                    st.session_state["alarm_engine_key"] = key
+                engine = st.session_state["alarm_engine"]
+                engine.update(processor)
+                alarm_events = engine.events()
+                if alarm_events.empty:
+                    st.success("No alarm events for the current rules")
+                else:
+                    col1, col2 = st.columns(2)
+                    col1.metric("Alarm events", len(alarm_events))
+                    col2.metric("Active now", int(alarm_events['Ativo'].sum()))
+                    st.dataframe(alarm_events, hide_index=True, use_container_width=True)
+            except (ValueError, KeyError) as e:
+                st.error(str(e))
         # Load data directly from processor
         df = load_data_for_visualization(processor)
         if df is not None and isinstance(df, pd.DataFrame):# Display the first rows of the DataFrame
@@ -465,7 +710,7 @@ if st.session_state.get("processor_files"):
                         default=df.columns.tolist()[0:11]
                     )
                     if selected_columns:
-                        st.dataframe(df[selected_columns])
+                        render_data_table(get_table_view(processor), selected_columns, key="selected_table")
                         # Enhanced Chart Visualization Section
                         st.markdown("""
                             <div class="ghfm-info-card slide-in">
@@ -476,28 +721,23 @@ if st.session_state.get("processor_files"):
                         plot_columns = selected_columns.copy()
                         if 'Timestamp' not in plot_columns and 'Timestamp' in df.columns:
                             plot_columns = ['Timestamp'] + plot_columns
-                        # Enhanced data filtering with scaling options
+                        # Over-range samples were already marked as NaN at parse time,
+                        # so the columns can be plotted without rescanning for outliers
                         filtered_plot_columns = []
                         scaling_info = {}
+                        column_channels = processor.column_channels()
+                        column_stats = processor.column_stats()
                         for col in plot_columns:
                             if col == 'Timestamp':
                                 filtered_plot_columns.append(col)
                                 continue
                             
-                            # Check column statistics
-                            col_data = df[col].dropna()
-                            if len(col_data) == 0:
+                            if col in column_stats and column_stats[col].count == 0:
                                 st.warning(f"Column '{col}' has no valid data, excluding from chart")
                                 continue
-                            col_max = col_data.max()
-                            col_min = col_data.min()
-                            col_range = col_max - col_min
-                            col_mean = col_data.mean()
-                            col_std = col_data.std()
-
-                            if col_max > 3000 or col_min < -200:
-                                st.info(f"Column '{col}' has extreme values and excluding it from chart for better visualization")
-                                continue
+                            channel = column_channels.get(col)
+                            if channel is not None and channel.over_range_count:
+                                st.info(f"Column '{col}' has {channel.over_range_count} over-range samples, shown as gaps in the chart")
                             filtered_plot_columns.append(col)
                         plot_columns = filtered_plot_columns
                         if 'Timestamp' in plot_columns and len(plot_columns) > 1:
@@ -512,44 +752,41 @@ if st.session_state.get("processor_files"):
                                 with col1:
                                     chart_type = st.segmented_control(
                                         "Chart Type",
-                                        ["Line Chart", "Scatter Plot"],
-                                        default="Line Chart"
+                                        ["Line Chart", "Scatter Plot", "Envelope Band"],
+                                        default="Line Chart",
+                                        help="Envelope Band draws each channel as one filled band between its Min and Max"
                                     )
                                 with col2:
-                                    # Data sampling options
-                                    df_len = len(df)
-                                    max_points = df_len
+                                    # Time-bucket resampling keeps the Min/Max envelope
+                                    resample_interval = st.selectbox(
+                                        "Resample interval",
+                                        ["Raw", "1 min", "10 min", "1 h", "1 d"],
+                                        index=0
+                                    )
+                                robust_axis = st.checkbox("Robust y-axis (P1–P99)", value=True,
+                                                          help="Scale the y-axis to the 1st–99th percentiles so isolated spikes do not flatten the chart")
                                 # Set default values for removed options
-                                resample_method = "Every Nth Point"
                                 chart_height = 600
                                 color_scheme = "Default"
                                 show_grid = True
                                 show_statistics = False
-                            # Apply data sampling if needed
-                            if max_points < len(plot_df):
-                                n_rows = len(plot_df)
-                                if resample_method == "Every Nth Point":
-                                    sample_every = max(1, n_rows // max_points)
-                                    plot_df_sampled = plot_df.iloc[::sample_every].copy()
-                                else:
-                                    sample_every = max(1, n_rows // max_points)
-                                    if resample_method == "Average":
-                                        plot_df_sampled = plot_df.groupby(plot_df.index // sample_every).mean().reset_index(drop=True)
-                                    elif resample_method == "Minimum":
-                                        plot_df_sampled = plot_df.groupby(plot_df.index // sample_every).min().reset_index(drop=True)
-                                    else:  # Maximum
-                                        plot_df_sampled = plot_df.groupby(plot_df.index // sample_every).max().reset_index(drop=True)
-                                    # Restore Timestamp column for grouped data
-                                    if 'Timestamp' in plot_df.columns:
-                                        timestamps_grouped = df['Timestamp'].groupby(df.index // sample_every)
-                                        if resample_method == "Average":
-                                            plot_df_sampled['Timestamp'] = timestamps_grouped.first().values
-                                        elif resample_method == "Minimum":
-                                            plot_df_sampled['Timestamp'] = timestamps_grouped.first().values
-                                        else:
-                                            plot_df_sampled['Timestamp'] = timestamps_grouped.last().values
+                            # Apply time-bucket resampling if requested
+                            if chart_type == "Envelope Band":
+                                # Bands are decimated per channel by processor.envelope()
+                                plot_df_sampled = plot_df
+                            elif resample_interval != "Raw":
+                                plot_channel_ids = {column_channels[col].channel_id for col in plot_columns
+                                                    if col in column_channels}
+                                resampled_df = processor.resample(resample_interval, agg=("min", "max"),
+                                                                  channel_ids=list(plot_channel_ids))
+                                plot_df_sampled = resampled_df[[col for col in plot_columns if col in resampled_df.columns]]
+                                st.caption(f"{len(plot_df)} samples resampled into {len(plot_df_sampled)} buckets of {resample_interval}")
                             else:
                                 plot_df_sampled = plot_df.copy()
+                            # Break the lines at sampling gaps instead of bridging recordings
+                            if chart_type != "Envelope Band":
+                                gap_interval = resample_interval if resample_interval != "Raw" else processor.sampling_interval
+                                plot_df_sampled = break_at_gaps(plot_df_sampled, interval=gap_interval)
                             # Create the interactive chart using Plotly
                             try:
                                 # Define color palette
@@ -564,37 +801,63 @@ if st.session_state.get("processor_files"):
                                 # Create the main chart
                                 fig = go.Figure()
                                 data_columns = [col for col in plot_columns if col != 'Timestamp']
-                                for i, col in enumerate(data_columns):
-                                    color = colors[i % len(colors)]
-                                      # Prepare hover text with scaling info
-                                    hover_text = f"<b>{col}</b><br>"
-                                    if col in scaling_info and scaling_info[col]['scale_factor'] != 1:
-                                        hover_text += f"Scaled Value: %{{y:.3f}} ({scaling_info[col]['scale_name']})<br>"
-                                        hover_text += f"Original Value: %{{customdata:.3f}}<br>"
-                                        customdata = plot_df_sampled[col] * scaling_info[col]['scale_factor']
-                                    else:
-                                        hover_text += f"Value: %{{y:.3f}}<br>"
-                                        customdata = None
-                                    hover_text += f"Time: %{{x}}<br>"
-                                    if chart_type == "Line Chart":
+                                if chart_type == "Envelope Band":
+                                    # One filled band per channel, decimated keeping bucket min-of-min / max-of-max
+                                    band_channels = []
+                                    for col in data_columns:
+                                        channel = column_channels.get(col)
+                                        if channel is not None and channel.channel_id not in band_channels:
+                                            band_channels.append(channel.channel_id)
+                                    bands = processor.envelope(
+                                        band_channels,
+                                        interval=None if resample_interval == "Raw" else resample_interval
+                                    )
+                                    for i, (channel_id, (band_x, band_y, band_points)) in enumerate(bands.items()):
+                                        color = colors[i % len(colors)]
                                         fig.add_trace(go.Scatter(
-                                            x=plot_df_sampled['Timestamp'],
-                                            y=plot_df_sampled[col],
+                                            x=band_x,
+                                            y=band_y,
                                             mode='lines',
-                                            name=col,
-                                            line=dict(color=color, width=2),
-                                            customdata=customdata,
-                                            hovertemplate=hover_text + "<extra></extra>"
+                                            fill='toself',
+                                            name=f"Ch{channel_id} ({processor.channels[channel_id].unit})",
+                                            line=dict(color=color, width=1),
+                                            opacity=0.5,
+                                            hovertemplate=f"<b>Ch{channel_id}</b><br>Value: %{{y:.3f}}<br>Time: %{{x}}<br><extra></extra>"
                                         ))
-                                    elif chart_type == "Scatter Plot":
-                                        fig.add_trace(go.Scatter(
-                                            x=plot_df_sampled['Timestamp'],
-                                            y=plot_df_sampled[col],
-                                            mode='markers',
-                                            name=col,
-                                            marker=dict(color=color, size=4, opacity=0.7),
-                                            customdata=customdata,
-                                            hovertemplate=hover_text + "<extra></extra>" ))
+                                    st.caption(f"{len(bands)} envelope bands, "
+                                               f"{sum(points for _, _, points in bands.values())} points in total")
+                                else:
+                                    for i, col in enumerate(data_columns):
+                                        color = colors[i % len(colors)]
+                                          # Prepare hover text with scaling info
+                                        hover_text = f"<b>{col}</b><br>"
+                                        if col in scaling_info and scaling_info[col]['scale_factor'] != 1:
+                                            hover_text += f"Scaled Value: %{{y:.3f}} ({scaling_info[col]['scale_name']})<br>"
+                                            hover_text += f"Original Value: %{{customdata:.3f}}<br>"
+                                            customdata = plot_df_sampled[col] * scaling_info[col]['scale_factor']
+                                        else:
+                                            hover_text += f"Value: %{{y:.3f}}<br>"
+                                            customdata = None
+                                        hover_text += f"Time: %{{x}}<br>"
+                                        if chart_type == "Line Chart":
+                                            fig.add_trace(go.Scatter(
+                                                x=plot_df_sampled['Timestamp'],
+                                                y=plot_df_sampled[col],
+                                                mode='lines',
+                                                name=col,
+                                                line=dict(color=color, width=2),
+                                                customdata=customdata,
+                                                hovertemplate=hover_text + "<extra></extra>"
+                                            ))
+                                        elif chart_type == "Scatter Plot":
+                                            fig.add_trace(go.Scatter(
+                                                x=plot_df_sampled['Timestamp'],
+                                                y=plot_df_sampled[col],
+                                                mode='markers',
+                                                name=col,
+                                                marker=dict(color=color, size=4, opacity=0.7),
+                                                customdata=customdata,
+                                                hovertemplate=hover_text + "<extra></extra>" ))
                                   # Update layout
                                 fig.update_layout(
                                     title="GTD Data Visualization",
@@ -603,6 +866,15 @@ if st.session_state.get("processor_files"):
                                     height=chart_height,
                                     showlegend=True
                                 )
+                                if robust_axis:
+                                    if chart_type == "Envelope Band":
+                                        range_columns = [column for column, channel in column_channels.items()
+                                                         if channel.channel_id in band_channels]
+                                    else:
+                                        range_columns = data_columns
+                                    y_range = processor.axis_range(range_columns)
+                                    if y_range is not None:
+                                        fig.update_yaxes(range=list(y_range))
                                 # Display the chart
                                 st.plotly_chart(fig, use_container_width=True)
                                 # Export options
@@ -629,7 +901,7 @@ if st.session_state.get("processor_files"):
                         else:
                             st.warning("Please ensure 'Timestamp' column is included and at least one data column is selected for visualization.")
                 else:
-                    st.dataframe(df)
+                    render_data_table(get_table_view(processor), df.columns.tolist(), key="full_table")
                     try:                        # Simplified Data Chart for All Columns
                         st.markdown("""
                             <div class="ghfm-info-card slide-in">
@@ -655,6 +927,8 @@ if st.session_state.get("processor_files"):
                                         # Simplified column selection
                                         num_cols_len = len(numeric_cols)
                                         max_cols_display = num_cols_len
+                                        all_robust_axis = st.checkbox("Robust y-axis (P1–P99)", value=True,
+                                                                      key="all_robust_axis")
                                 # Select columns to display
                                 display_cols = numeric_cols[:max_cols_display]
                                 # Create simple chart
@@ -689,6 +963,9 @@ if st.session_state.get("processor_files"):
                                         height=600,
                                         showlegend=True
                                     )
+                                    all_y_range = processor.axis_range(display_cols) if all_robust_axis else None
+                                    if all_y_range is not None:
+                                        fig_all.update_yaxes(range=list(all_y_range))
                                     st.plotly_chart(fig_all, use_container_width=True)
                                 except Exception as e:
                                     st.error(f"Error creating chart: {str(e)}")